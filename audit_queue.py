@@ -0,0 +1,66 @@
+# automation-auditor/audit_queue.py
+"""
+Durable audit queue shared by any number of worker processes or hosts.
+
+    python audit_queue.py enqueue submissions.csv
+    python audit_queue.py work [--processes 4] [--exit-when-empty]
+    python audit_queue.py status
+"""
+import argparse
+import multiprocessing
+
+from src.config import get_settings, init_tracing
+from src.job_queue import JobQueue
+from src.runner import load_manifest
+from src.worker import default_worker_id, run_worker
+
+def _work(queue_path: str, worker_id: str, exit_when_empty: bool) -> None:
+    completed = run_worker(queue_path, worker_id, exit_when_empty=exit_when_empty)
+    print(f"Worker {worker_id}: completed {completed} jobs")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enqueue audits and run queue workers.")
+    parser.add_argument("--queue", default=get_settings().queue_path, help="Path to the queue database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    enqueue = commands.add_parser("enqueue", help="Add manifest entries (identical inputs are deduplicated)")
+    enqueue.add_argument("manifest")
+    work = commands.add_parser("work", help="Lease and run jobs")
+    work.add_argument("--processes", type=int, default=1, help="Worker processes to start on this host")
+    work.add_argument("--worker-id", default=None, help="Worker id prefix (default host:pid)")
+    work.add_argument("--exit-when-empty", action="store_true", help="Stop once no job can be leased")
+    commands.add_parser("status", help="Job counts by status")
+    args = parser.parse_args(argv)
+
+    if args.command == "enqueue":
+        queue = JobQueue(args.queue, get_settings().queue_max_attempts)
+        created = duplicates = 0
+        for entry in load_manifest(args.manifest):
+            job_id, is_new = queue.enqueue(entry)
+            created += is_new
+            duplicates += not is_new
+        queue.close()
+        print(f"Enqueued {created} jobs ({duplicates} duplicates skipped) into {args.queue}")
+        return created
+
+    if args.command == "status":
+        queue = JobQueue(args.queue)
+        counts = queue.counts()
+        queue.close()
+        print(", ".join(f"{status}: {n}" for status, n in sorted(counts.items())) or "Queue is empty")
+        return counts
+
+    init_tracing()
+    prefix = args.worker_id or default_worker_id()
+    if args.processes <= 1:
+        return _work(args.queue, prefix, args.exit_when_empty)
+    workers = [
+        multiprocessing.Process(target=_work, args=(args.queue, f"{prefix}/{i}", args.exit_when_empty))
+        for i in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# automation-auditor/benchmarks/import_time.py
+"""
+Start-up cost of the package's entry points, each measured in a fresh interpreter.
+
+Reports the median wall time to import each target (minus a bare
+`python -c pass`) and, with --top, the slowest modules by cumulative time
+from `python -X importtime`.
+
+    python benchmarks/import_time.py --runs 5 --top 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    "config": "import src.config",
+    "detectives": "import src.nodes.detectives",
+    "forensics": "import src.forensics",
+    "graph": "import src.graph",
+}
+
+def _wall(code: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def slowest_imports(code: str, top: int) -> list:
+    """
+    (module, cumulative seconds) for the `top` slowest imports of `code`.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((module, int(cumulative) / 1e6))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports per target")
+    args = parser.parse_args()
+
+    interpreter = _wall("pass", args.runs)
+    report = {"interpreter_s": interpreter, "targets": {}}
+    for name, code in TARGETS.items():
+        entry = {"import_s": max(0.0, _wall(code, args.runs) - interpreter)}
+        if args.top:
+            entry["slowest"] = slowest_imports(code, args.top)
+        report["targets"][name] = entry
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
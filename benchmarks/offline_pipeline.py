@@ -0,0 +1,96 @@
+# automation-auditor/benchmarks/offline_pipeline.py
+"""
+Offline end-to-end benchmark of build_graph().
+
+Runs the full pipeline against a synthetic local git repository with the
+fake (or replay) LLM transport, once with zero model latency to isolate
+orchestration overhead and once with a simulated latency distribution.
+
+    python benchmarks/offline_pipeline.py --runs 5 --latency lognormal:1.5,0.4
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.graph import build_graph
+from src.llm.transport import FakeTransport, ReplayTransport, parse_latency, set_transport
+
+def make_repo(path: str, commits: int = 5) -> str:
+    os.makedirs(os.path.join(path, "src", "tools"), exist_ok=True)
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    for i in range(commits):
+        with open(os.path.join(path, "src", "tools", f"tool_{i}.py"), "w", encoding="utf-8") as f:
+            f.write("import subprocess, tempfile\n")
+        subprocess.run(["git", "add", "."], cwd=path, check=True)
+        subprocess.run(["git", "-c", "user.email=bench@example.com", "-c", "user.name=bench", "commit", "-qm", f"feat: step {i}"],
+                       cwd=path, check=True)
+    return path
+
+def run_audits(app, state: dict, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        asyncio.run(app.ainvoke(dict(state, evidences={}, opinions=[])))
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def summarize(timings: list) -> dict:
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "mean_s": statistics.mean(ordered),
+        "p50_s": ordered[len(ordered) // 2],
+        "max_s": ordered[-1],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", default="lognormal:1.5,0.4", help="Simulated model latency spec")
+    parser.add_argument("--replay", default=None, help="Cassette directory to replay instead of the fake model")
+    parser.add_argument("--rubric", default=os.path.join(ROOT, "rubric", "week2_rubric.json"))
+    args = parser.parse_args()
+
+    os.environ.setdefault("AUDITOR_LLM_RPM", "100000")
+    os.environ.setdefault("AUDITOR_LLM_TPM", "1000000000")
+
+    with open(args.rubric, "r", encoding="utf-8") as f:
+        rubric = json.load(f).get("dimensions", [])
+
+    with tempfile.TemporaryDirectory(prefix="auditor_bench_") as work:
+        repo = make_repo(os.path.join(work, "submission"))
+        os.chdir(work)
+        state = {
+            "repo_url": repo,
+            "pdf_path": os.path.join(work, "missing.pdf"),
+            "rubric_dimensions": rubric,
+            "evidences": {},
+            "opinions": [],
+            "final_report": None,
+        }
+        app = build_graph()
+
+        def transport(latency_spec: str):
+            if args.replay:
+                return ReplayTransport(args.replay, parse_latency(latency_spec))
+            return FakeTransport(parse_latency(latency_spec))
+
+        set_transport(transport("fixed:0"))
+        overhead = summarize(run_audits(app, state, args.runs))
+        set_transport(transport(args.latency))
+        end_to_end = summarize(run_audits(app, state, args.runs))
+        set_transport(None)
+
+    print(json.dumps({"orchestration_overhead": overhead, "with_model_latency": end_to_end, "latency_spec": args.latency}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# automation-auditor/benchmarks/service_overhead.py
+"""
+Per-audit overhead of cold CLI runs versus the warm audit service.
+
+Cold: every audit is a fresh `python` process that imports the stack,
+loads the rubric, compiles the graph and runs one audit (what
+run_graph.py does). Warm: one serve_audits.py process answers the same
+audits one after another over stdin. Both use the fake LLM transport with
+zero latency on a synthetic local repository, so the difference is process
+startup, imports and graph construction.
+
+    python benchmarks/service_overhead.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.offline_pipeline import make_repo
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.update({
+        "AUDITOR_LLM_TRANSPORT": "fake",
+        "AUDITOR_LLM_SIMULATED_LATENCY": "fixed:0",
+        "AUDITOR_LLM_RPM": "100000",
+        "AUDITOR_LLM_TPM": "1000000000",
+        # Measure the pipeline itself, not memo hits or checkpoint replays
+        "AUDITOR_DETECTIVE_MEMO_DIR": "",
+        "AUDITOR_CHECKPOINT_PATH": "",
+        "PYTHONPATH": ROOT,
+    })
+    return env
+
+def cold_once(repo: str) -> None:
+    """Body of one cold run, executed in a fresh interpreter."""
+    import asyncio
+    from src.graph import build_graph
+    from src.rubric import load_rubric
+    from src.runner import make_initial_state
+    app = build_graph()
+    state = make_initial_state(repo, "", load_rubric(os.path.join(ROOT, "rubric", "week2_rubric.json")).get("dimensions", []))
+    asyncio.run(app.ainvoke(state))
+
+def run_cold(repo: str, runs: int, work: str) -> list:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, __file__, "--cold-once", repo], cwd=work, env=_env(), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def run_warm(repo: str, runs: int, work: str):
+    started = time.perf_counter()
+    service = subprocess.Popen([sys.executable, os.path.join(ROOT, "serve_audits.py")], cwd=work, env=_env(), text=True,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    timings = []
+    first_result_s = None
+    rubric = os.path.join(ROOT, "rubric", "week2_rubric.json")
+    # Request 0 also waits for the service to start; it is reported separately
+    for i in range(runs + 1):
+        sent = time.perf_counter()
+        service.stdin.write(json.dumps({"id": str(i), "repo_url": repo, "rubric": rubric}) + "\n")
+        service.stdin.flush()
+        for line in service.stdout:
+            event = json.loads(line)
+            if event["event"] in ("result", "error"):
+                break
+        if event["event"] == "error":
+            raise RuntimeError(event["error"])
+        if first_result_s is None:
+            first_result_s = time.perf_counter() - started
+        else:
+            timings.append(time.perf_counter() - sent)
+    service.stdin.close()
+    service.wait()
+    return timings, first_result_s
+
+def summarize(timings: list) -> dict:
+    ordered = sorted(timings)
+    return {"runs": len(ordered), "mean_s": statistics.mean(ordered), "p50_s": ordered[len(ordered) // 2], "max_s": ordered[-1]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cold-once", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.cold_once:
+        return cold_once(args.cold_once)
+
+    with tempfile.TemporaryDirectory(prefix="auditor_bench_") as work:
+        repo = make_repo(os.path.join(work, "submission"))
+        cold = summarize(run_cold(repo, args.runs, work))
+        warm_timings, first_result_s = run_warm(repo, args.runs, work)
+        warm = summarize(warm_timings)
+
+    print(json.dumps({
+        "cold_cli": cold,
+        "warm_service": warm,
+        "service_start_to_first_result_s": first_result_s,
+        "overhead_saved_per_audit_s": cold["mean_s"] - warm["mean_s"],
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# automation-auditor/benchmarks/suite.py
+"""
+Benchmark suite for the forensic tools and detectives on synthetic inputs.
+
+Generates a repository, a PDF and a Markdown report at the chosen scale
+(see benchmarks/synthetic.py), then times every repo_tools and doc_tools
+function, PDF image extraction, the RepoInvestigator subgraph and the
+DocAnalyst node. Each case records its median and best wall time,
+throughput and peak traced memory in a results file. When the baseline has an entry for
+the scale, the run exits with status 1 if any case's best time or its peak
+memory grew past the tolerance.
+
+    python benchmarks/suite.py --scale small
+    python benchmarks/suite.py --scale small --update-baseline
+    python benchmarks/suite.py --scale medium --runs 3 --tolerance 0.3 --only extract_git_history,repo_forensics_graph
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import REAL_PATHS, make_synthetic_markdown, make_synthetic_pdf, make_synthetic_repo
+
+SCALES = {
+    "small": {"commits": 200, "files": 40, "file_kb": 4, "graph_nodes": 12, "pages": 10, "images": 3, "citation_density": 0.2},
+    "medium": {"commits": 2000, "files": 200, "file_kb": 8, "graph_nodes": 40, "pages": 60, "images": 12, "citation_density": 0.2},
+    "large": {"commits": 10000, "files": 1000, "file_kb": 16, "graph_nodes": 120, "pages": 250, "images": 40, "citation_density": 0.2},
+}
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+# Slowdowns smaller than this are scheduler noise on millisecond cases
+MIN_DELTA_S = 0.002
+# Same for memory: allocator and import-cache jitter
+MIN_DELTA_MB = 0.5
+
+class Case:
+    """One timed call; `units` of work per call give its throughput."""
+
+    def __init__(self, name: str, run: Callable[[], Any], units: float, unit: str,
+                 cleanup: Optional[Callable[[Any], None]] = None):
+        self.name, self.run, self.units, self.unit, self.cleanup = name, run, units, unit, cleanup
+
+    def once(self) -> float:
+        started = time.perf_counter()
+        result = self.run()
+        elapsed = time.perf_counter() - started
+        if self.cleanup:
+            self.cleanup(result)
+        return elapsed
+
+def _remove_clone(path: str) -> None:
+    # clone_repo creates <tmp>/auditor_sandbox_*/<name>
+    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+def build_cases(work: str, scale: Dict[str, Any]) -> List[Case]:
+    """
+    Generates the synthetic inputs under `work` and returns the cases.
+    """
+    from src.nodes.detectives import doc_analyst_node, repo_forensics_graph
+    from src.tools import doc_tools, repo_tools
+    from src.tools.vision_tools import extract_images_from_pdf
+
+    repo = make_synthetic_repo(os.path.join(work, "submission"), scale["commits"], scale["files"], scale["file_kb"], scale["graph_nodes"])
+    pdf = make_synthetic_pdf(os.path.join(work, "report.pdf"), scale["pages"], scale["images"], scale["citation_density"])
+    markdown = make_synthetic_markdown(os.path.join(work, "report.md"), scale["pages"], scale["citation_density"])
+    with open(markdown, "r", encoding="utf-8") as f:
+        text = f.read()
+    text_mb = len(text.encode("utf-8")) / 1e6
+    history = repo_tools.extract_git_history(repo)
+    chunks = doc_tools.chunk_text(text)
+    graph_py = os.path.join(repo, "src", "graph.py")
+    commits, nodes, pages = scale["commits"], scale["graph_nodes"], scale["pages"]
+
+    return [
+        Case("clone_repo", lambda: repo_tools.clone_repo(repo), commits, "commits", cleanup=_remove_clone),
+        Case("extract_git_history", lambda: repo_tools.extract_git_history(repo), commits, "commits"),
+        Case("head_commit", lambda: repo_tools.head_commit(repo), 1, "calls"),
+        Case("check_sidecar_files", lambda: repo_tools.check_sidecar_files(repo), 1, "calls"),
+        Case("analyze_code_structure", lambda: repo_tools.analyze_code_structure(repo), 1, "calls"),
+        Case("ast_analyze_source", lambda: repo_tools.ast_analyze_source(graph_py), nodes, "graph nodes"),
+        Case("classify_git_narrative", lambda: repo_tools.classify_git_narrative(history), commits, "commits"),
+        Case("analyze_graph_structure", lambda: repo_tools.analyze_graph_structure(graph_py), nodes, "graph nodes"),
+        Case("analyze_tool_security", lambda: repo_tools.analyze_tool_security(repo), 1, "calls"),
+        Case("analyze_structured_output", lambda: repo_tools.analyze_structured_output(repo), 1, "calls"),
+        Case("load_pdf_text", lambda: doc_tools.load_pdf_text(pdf), pages, "pages"),
+        Case("chunk_text", lambda: doc_tools.chunk_text(text), text_mb, "MB"),
+        Case("ingest_pdf", lambda: doc_tools.ingest_pdf(pdf), pages, "pages"),
+        Case("simple_keyword_search", lambda: doc_tools.simple_keyword_search(chunks, "Fan-In"), len(chunks), "chunks"),
+        Case("verify_citations", lambda: doc_tools.verify_citations(text, REAL_PATHS), text_mb, "MB"),
+        Case("analyze_concept_depth", lambda: doc_tools.analyze_concept_depth(text, "State Synchronization"), text_mb, "MB"),
+        Case("extract_images_from_pdf", lambda: extract_images_from_pdf(pdf), scale["images"], "images"),
+        Case("repo_forensics_graph", lambda: repo_forensics_graph().invoke(
+            {"repo_url": repo, "evidences": {}, "timings": [], "degraded_stages": []}), commits, "commits"),
+        Case("doc_analyst_node", lambda: doc_analyst_node({"pdf_path": pdf}), pages, "pages"),
+    ]
+
+def measure(case: Case, runs: int) -> Dict[str, Any]:
+    """
+    One warm-up call, `runs` timed calls, then one call under tracemalloc
+    for the peak (tracing slows Python code, so it is kept out of the timings).
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        case.once()
+        timings = [case.once() for _ in range(runs)]
+        tracemalloc.start()
+        try:
+            case.once()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    median = statistics.median(timings)
+    return {
+        "median_s": median,
+        "min_s": min(timings),
+        "runs": runs,
+        "throughput": case.units / median if median > 0 else 0.0,
+        "unit": f"{case.unit}/s",
+        "peak_mb": peak / 1e6,
+    }
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float, mem_tolerance: float) -> List[str]:
+    """
+    Regressions of `results` against `baseline`: cases that disappeared, or whose
+    best time or peak memory grew past the tolerance (a fraction, 0.5 = +50%).
+    """
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            regressions.append(f"{name}: missing from this run")
+            continue
+        # Best-of-runs is the least noisy estimate on a shared machine
+        slower = current["min_s"] - base["min_s"]
+        if current["min_s"] > base["min_s"] * (1 + tolerance) and slower > MIN_DELTA_S:
+            regressions.append(f"{name}: best {current['min_s'] * 1e3:.1f}ms vs baseline {base['min_s'] * 1e3:.1f}ms "
+                               f"(+{100 * slower / base['min_s']:.0f}%)")
+        grown = current["peak_mb"] - base["peak_mb"]
+        if current["peak_mb"] > base["peak_mb"] * (1 + mem_tolerance) and grown > MIN_DELTA_MB:
+            regressions.append(f"{name}: peak {current['peak_mb']:.1f}MB vs baseline {base['peak_mb']:.1f}MB")
+    return regressions
+
+def _git_sha() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (subprocess.CalledProcessError, OSError):
+        return ""
+
+def _load_json(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--runs", type=int, default=7, help="Timed calls per case")
+    parser.add_argument("--only", default="", help="Comma-separated case names")
+    parser.add_argument("--out", default=None, help="Results file (default reports/benchmarks/suite_<scale>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown of the best run as a fraction")
+    parser.add_argument("--mem-tolerance", type=float, default=0.25, help="Allowed peak memory growth as a fraction")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline for its scale")
+    args = parser.parse_args(argv)
+
+    # Measure the tools themselves: no profiling spans, memo or blob writes
+    os.environ.update({"AUDITOR_PROFILE_TRACE_PATH": "", "AUDITOR_DETECTIVE_MEMO_DIR": "", "AUDITOR_EVIDENCE_BLOB_DIR": ""})
+    scale = SCALES[args.scale]
+    only = {name for name in args.only.split(",") if name}
+
+    baselines = _load_json(args.baseline)
+    baseline = {} if args.update_baseline else baselines.get(args.scale, {}).get("results", {})
+    if only:
+        baseline = {name: base for name, base in baseline.items() if name in only}
+
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory(prefix="auditor_suite_") as work:
+        cases = [c for c in build_cases(work, scale) if not only or c.name in only]
+        for case in cases:
+            results[case.name] = measure(case, args.runs)
+            r = results[case.name]
+            print(f"{case.name:<26} {r['median_s'] * 1e3:>10.2f} ms  {r['throughput']:>12.1f} {r['unit']:<16} peak {r['peak_mb']:>7.2f} MB")
+        # A busy neighbour can slow one case for a whole measurement; confirm
+        # suspects with a second measurement before failing on them
+        suspects = {line.split(":", 1)[0] for line in compare(results, baseline, args.tolerance, args.mem_tolerance)}
+        for case in cases:
+            if case.name in suspects:
+                retry = measure(case, args.runs)
+                if retry["min_s"] < results[case.name]["min_s"]:
+                    results[case.name] = retry
+                print(f"{case.name:<26} re-measured: best {results[case.name]['min_s'] * 1e3:.2f} ms")
+
+    meta = {"scale": args.scale, "params": scale, "runs": args.runs, "git_sha": _git_sha(),
+            "python": platform.python_version(), "platform": platform.platform(), "timestamp": time.time()}
+    out = args.out or os.path.join(ROOT, "reports", "benchmarks", f"suite_{args.scale}.json")
+    _write_json(out, {"meta": meta, "results": results})
+    print(f"Results: {out}")
+
+    if args.update_baseline:
+        baselines[args.scale] = {"meta": meta, "results": dict(baselines.get(args.scale, {}).get("results", {}), **results)}
+        _write_json(args.baseline, baselines)
+        print(f"Baseline updated: {args.baseline} [{args.scale}]")
+        return 0
+    if not baseline:
+        print(f"No baseline for scale {args.scale!r}; run with --update-baseline to record one.")
+        return 0
+    regressions = compare(results, baseline, args.tolerance, args.mem_tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if regressions:
+        return 1
+    print(f"No regressions against baseline ({len(baseline)} cases, tolerance +{args.tolerance:.0%} time, +{args.mem_tolerance:.0%} memory)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
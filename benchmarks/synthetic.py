@@ -0,0 +1,300 @@
+# automation-auditor/benchmarks/synthetic.py
+"""
+Deterministic generators for benchmark inputs: git repositories shaped like
+a LangGraph submission, and PDF / Markdown reports.
+
+    python benchmarks/synthetic.py repo /tmp/submission --commits 500 --files 50 --file-kb 8 --graph-nodes 20
+    python benchmarks/synthetic.py pdf /tmp/report.pdf --pages 20 --images 4 --citation-density 0.3
+    python benchmarks/synthetic.py markdown /tmp/report.md --pages 20 --citation-density 0.3
+"""
+import argparse
+import os
+import random
+import subprocess
+import zlib
+from typing import Dict, List
+
+CONCEPTS = ["Dialectical Synthesis", "Metacognition", "Fan-In", "Fan-Out", "State Synchronization"]
+# Paths a synthetic repository contains, so citations to them verify
+REAL_PATHS = ["src/graph.py", "src/state.py", "src/nodes/detectives.py", "src/nodes/judges.py", "src/tools/repo_tools.py"]
+COMMIT_PREFIXES = ["feat", "fix", "refactor", "docs", "chore", "wip"]
+WORDS = ("agent state graph node edge judge evidence rubric detective parallel reducer checkpoint "
+         "synthesis orchestration forensic audit report pipeline latency budget tool").split()
+# Roughly what one Helvetica 10pt line holds on a Letter page
+LINE_CHARS = 95
+LINES_PER_PAGE = 60
+
+# --- Repositories ---------------------------------------------------------
+
+def graph_module(nodes: int) -> str:
+    """
+    A src/graph.py with `nodes` node functions, fanned out from "start" and
+    back in to an aggregator, so AST walks scale with graph complexity.
+    """
+    names = [f"node_{i}" for i in range(max(2, nodes))]
+    lines = [
+        "import operator",
+        "from typing import Annotated, Dict, List",
+        "from typing_extensions import TypedDict",
+        "from pydantic import BaseModel",
+        "from langgraph.graph import StateGraph, START, END",
+        "",
+        "class GraphState(TypedDict):",
+        "    evidences: Annotated[Dict[str, List[str]], operator.ior]",
+        "    opinions: Annotated[List[str], operator.add]",
+        "",
+        "class Verdict(BaseModel):",
+        "    score: int",
+        "",
+    ]
+    for name in names:
+        lines += [
+            f"def {name}(state: GraphState) -> GraphState:",
+            f"    if state.get('evidences', {{}}).get('{name}'):",
+            f"        return {{'opinions': ['{name} done']}}",
+            f"    return {{'evidences': {{'{name}': ['{name} evidence']}}}}",
+            "",
+        ]
+    lines += ["def build_graph():", "    builder = StateGraph(GraphState)", "    builder.add_node('start', lambda s: s)",
+              "    builder.add_node('aggregate', lambda s: s)"]
+    for name in names:
+        lines.append(f"    builder.add_node('{name}', {name})")
+    for name in names:
+        lines += [f"    builder.add_edge('start', '{name}')", f"    builder.add_edge('{name}', 'aggregate')"]
+    lines += ["    builder.add_edge(START, 'start')", "    builder.add_edge('aggregate', END)", "    return builder.compile()", ""]
+    return "\n".join(lines)
+
+def filler_module(index: int, size_kb: int, revision: int = 0) -> str:
+    """
+    Syntactically valid Python of roughly `size_kb` kilobytes.
+    """
+    lines = [f"# module {index}, revision {revision}", "import json", ""]
+    size = sum(len(line) + 1 for line in lines)
+    func = 0
+    while size < size_kb * 1024:
+        block = [
+            f"def helper_{index}_{func}(payload: dict) -> str:",
+            f"    \"\"\"Serializes payload variant {func} of module {index}.\"\"\"",
+            f"    data = {{k: v for k, v in payload.items() if k != 'skip_{func}'}}",
+            f"    return json.dumps(data, sort_keys=True) + '{revision}'",
+            "",
+        ]
+        lines += block
+        size += sum(len(line) + 1 for line in block)
+        func += 1
+    return "\n".join(lines)
+
+def repo_files(files: int, file_kb: int, graph_nodes: int) -> Dict[str, str]:
+    """
+    Initial tree of a synthetic submission: the files every RepoInvestigator
+    protocol looks at, plus `files` filler modules of about `file_kb` KB.
+    """
+    tree = {
+        "src/graph.py": graph_module(graph_nodes),
+        "src/state.py": "from typing_extensions import TypedDict\nfrom pydantic import BaseModel\n\n"
+                        "class AgentState(TypedDict):\n    repo_url: str\n\nclass Evidence(BaseModel):\n    found: bool\n",
+        "src/nodes/__init__.py": "",
+        "src/nodes/judges.py": "def judge(llm, prompt):\n    for attempt in range(3):\n        try:\n"
+                               "            return llm.with_structured_output(dict).invoke(prompt)\n"
+                               "        except ValueError:\n            continue  # retry\n",
+        "src/nodes/detectives.py": "from ..tools.repo_tools import run\n",
+        "src/tools/__init__.py": "",
+        "src/tools/repo_tools.py": "import subprocess\nimport tempfile\n\ndef run(args):\n"
+                                   "    with tempfile.TemporaryDirectory() as d:\n        return subprocess.run(args, cwd=d, check=True)\n",
+        ".orchestration/activeintents.yaml": "intents: []\n",
+        ".orchestration/agenttrace.jsonl": "{}\n",
+        "README.md": "# Synthetic submission\n",
+    }
+    for i in range(files):
+        tree[f"src/pkg/module_{i}.py"] = filler_module(i, file_kb)
+    return tree
+
+def _data(payload: bytes) -> bytes:
+    return b"data %d\n%s\n" % (len(payload), payload)
+
+def make_synthetic_repo(path: str, commits: int = 100, files: int = 20, file_kb: int = 4,
+                        graph_nodes: int = 8, seed: int = 0) -> str:
+    """
+    Creates a git repository at `path` with `commits` commits. The first
+    commit adds the whole tree; each later one rewrites one filler module
+    (or graph.py when there are none). History is written in one
+    `git fast-import` pass, so thousands of commits take seconds.
+    """
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    branch = subprocess.run(["git", "symbolic-ref", "HEAD"], cwd=path, check=True, capture_output=True, text=True).stdout.strip()
+
+    stream = []
+    timestamp = 1_700_000_000
+    for n in range(max(1, commits)):
+        if n == 0:
+            changes = repo_files(files, file_kb, graph_nodes)
+            message = "feat: initial project layout"
+        elif files:
+            index = rng.randrange(files)
+            changes = {f"src/pkg/module_{index}.py": filler_module(index, file_kb, revision=n)}
+            message = f"{rng.choice(COMMIT_PREFIXES)}: update module {index} ({' '.join(rng.sample(WORDS, 3))})"
+        else:
+            changes = {"src/graph.py": graph_module(graph_nodes) + f"\n# revision {n}\n"}
+            message = f"{rng.choice(COMMIT_PREFIXES)}: tweak graph"
+        stamp = f"Bench <bench@example.com> {timestamp + n * 60} +0000".encode()
+        stream.append(b"commit %s\nmark :%d\nauthor %s\ncommitter %s\n" % (branch.encode(), n + 1, stamp, stamp))
+        stream.append(_data(message.encode()))
+        if n:
+            stream.append(b"from :%d\n" % n)
+        for file_path, content in changes.items():
+            stream.append(b"M 100644 inline %s\n" % file_path.encode())
+            stream.append(_data(content.encode()))
+        stream.append(b"\n")
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=b"".join(stream), check=True)
+    subprocess.run(["git", "reset", "--hard", "-q"], cwd=path, check=True)
+    return path
+
+# --- Reports -------------------------------------------------------------
+
+def report_paragraphs(pages: int, citation_density: float = 0.2, seed: int = 0) -> List[str]:
+    """
+    Report prose filling about `pages` pages. A `citation_density` fraction
+    of sentences cites a file path; half of those paths exist in a synthetic
+    repository and half are hallucinated. Every concept the DocAnalyst looks
+    for appears, some explained at length, some merely name-dropped.
+    """
+    rng = random.Random(seed)
+    target_chars = pages * LINES_PER_PAGE * LINE_CHARS
+    paragraphs, total, n = [], 0, 0
+    while total < target_chars:
+        sentences = []
+        for _ in range(rng.randint(3, 6)):
+            words = rng.choices(WORDS, k=rng.randint(8, 16))
+            if n % 7 == 0:
+                words.insert(rng.randrange(len(words)), CONCEPTS[(n // 7) % len(CONCEPTS)])
+            if rng.random() < citation_density:
+                path = rng.choice(REAL_PATHS) if rng.random() < 0.5 else f"src/generated/missing_{n}.py"
+                words.append(f"in {path}")
+            sentence = " ".join(words)
+            sentences.append(sentence[0].upper() + sentence[1:] + ".")
+            n += 1
+        paragraphs.append(" ".join(sentences))
+        total += len(paragraphs[-1])
+    return paragraphs
+
+def _wrap(paragraphs: List[str], width: int = LINE_CHARS) -> List[str]:
+    lines = []
+    for paragraph in paragraphs:
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        lines += [line, ""]
+    return lines
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def _image(rng: random.Random, size: int = 96) -> bytes:
+    # A few flat colour bands: compresses like a diagram, not like noise
+    colours = [bytes(rng.randrange(256) for _ in range(3)) for _ in range(4)]
+    rows = [colours[(y * len(colours)) // size] * size for y in range(size)]
+    return b"".join(rows)
+
+def make_synthetic_pdf(path: str, pages: int = 10, images: int = 2, citation_density: float = 0.2,
+                       seed: int = 0, image_size: int = 96) -> str:
+    """
+    Writes a text PDF of `pages` pages with `images` RGB images spread across
+    them. The file is assembled by hand (Helvetica text, Flate-compressed
+    image XObjects) so no PDF library beyond pypdf is needed to read it.
+    """
+    rng = random.Random(seed)
+    lines = _wrap(report_paragraphs(pages, citation_density, seed))
+    page_lines = [lines[i * LINES_PER_PAGE:(i + 1) * LINES_PER_PAGE] for i in range(pages)]
+
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    def stream(header: bytes, payload: bytes) -> bytes:
+        return b"<< %s /Length %d >>\nstream\n%s\nendstream" % (header, len(payload), payload)
+
+    catalog = add(b"")  # filled once the page tree exists
+    pages_id = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    image_ids = [
+        add(stream(b"/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode"
+                   % (image_size, image_size), zlib.compress(_image(rng, image_size))))
+        for _ in range(images)
+    ]
+    page_ids = []
+    for p in range(pages):
+        text = [b"BT /F1 10 Tf 12 TL 40 760 Td"]
+        text += [b"(%s) '" % _pdf_escape(line).encode("latin-1", "replace") for line in page_lines[p]]
+        text.append(b"ET")
+        own_images = [(i, image_ids[i]) for i in range(images) if i % pages == p]
+        draws = [b"q 120 0 0 120 %d 40 cm /Im%d Do Q" % (40 + 130 * (k % 4), i) for k, (i, _) in enumerate(own_images)]
+        content = add(stream(b"", b"\n".join(text + draws)))
+        xobjects = b" ".join(b"/Im%d %d 0 R" % (i, obj) for i, obj in own_images)
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> /XObject << %s >> >> >>" % (pages_id, content, font, xobjects)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % i for i in page_ids), len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(bytes(out))
+    return path
+
+def make_synthetic_markdown(path: str, pages: int = 10, citation_density: float = 0.2, seed: int = 0) -> str:
+    """
+    Writes the same prose as `make_synthetic_pdf` as Markdown, with a heading
+    every few paragraphs and citations in list items and code spans.
+    """
+    paragraphs = report_paragraphs(pages, citation_density, seed)
+    lines = ["# Synthetic Audit Report", ""]
+    for i, paragraph in enumerate(paragraphs):
+        if i % 5 == 0:
+            lines += [f"## Section {i // 5 + 1}", ""]
+        lines += [f"- {paragraph}" if i % 4 == 3 else paragraph, ""]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("kind", choices=["repo", "pdf", "markdown"])
+    parser.add_argument("path")
+    parser.add_argument("--commits", type=int, default=100)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--file-kb", type=int, default=4)
+    parser.add_argument("--graph-nodes", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--images", type=int, default=2)
+    parser.add_argument("--citation-density", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.kind == "repo":
+        make_synthetic_repo(args.path, args.commits, args.files, args.file_kb, args.graph_nodes, args.seed)
+    elif args.kind == "pdf":
+        make_synthetic_pdf(args.path, args.pages, args.images, args.citation_density, args.seed)
+    else:
+        make_synthetic_markdown(args.path, args.pages, args.citation_density, args.seed)
+    print(args.path)
+
+if __name__ == "__main__":
+    main()
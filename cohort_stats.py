@@ -0,0 +1,76 @@
+# automation-auditor/cohort_stats.py
+"""
+Cohort-level statistics over stored or archived audits: per-criterion score
+distributions, judge bias, inter-judge agreement and outlier submissions.
+
+    python cohort_stats.py [--store reports/audits.db | --archive reports/audits] [--cache reports/cohort.npz] [--json]
+"""
+import argparse
+import json
+import os
+import time
+
+from src.archive import iter_audit_paths
+from src.cohort import Cohort, cohort_from_score_rows, criterion_distributions, flag_outliers, judge_agreement, judge_bias, load_cohort, synthesize_cohort
+from src.config import get_settings
+from src.rubric import RUBRIC_PATH, load_synthesis_rules
+from src.store import get_store
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize a cohort of archived audits.")
+    parser.add_argument("--store", default=get_settings().audit_store_path, help="SQLite audit store to read")
+    parser.add_argument("--archive", default=None, help="Read this gzip archive directory instead of the store")
+    parser.add_argument("--rubric", default=RUBRIC_PATH, help="Rubric whose synthesis_rules parameters are applied")
+    parser.add_argument("--cache", default="", help="Reuse (or create) a .npz snapshot of the cohort scores")
+    parser.add_argument("--outlier-z", type=float, default=3.5, help="Robust z-score beyond which a submission is flagged")
+    parser.add_argument("--json", action="store_true", help="Print the statistics as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.cache and os.path.exists(args.cache):
+        cohort = Cohort.load(args.cache)
+    else:
+        if args.archive or not args.store:
+            cohort = load_cohort(iter_audit_paths(args.archive or get_settings().audit_archive_dir))
+        else:
+            cohort = cohort_from_score_rows(get_store(args.store).score_rows())
+        if args.cache:
+            cohort.save(args.cache)
+    loaded = time.perf_counter()
+
+    rules = load_synthesis_rules(args.rubric)
+    synthesis = synthesize_cohort(cohort, rules)
+    stats = {
+        "submissions": len(cohort.audit_ids),
+        "distributions": criterion_distributions(cohort, synthesis["final"], rules),
+        "judge_bias": judge_bias(cohort),
+        "agreement": judge_agreement(cohort, synthesis),
+        "outliers": flag_outliers(cohort, synthesis["overall"], args.outlier_z),
+    }
+    finished = time.perf_counter()
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return stats
+
+    print(f"# Cohort Statistics ({stats['submissions']} submissions)")
+    print("\n| Criterion | N | Mean | Std | P10 | P50 | P90 | Pass Rate | Mean Spread | Dissent Rate |")
+    print("| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |")
+    for criterion, d in stats["distributions"].items():
+        a = stats["agreement"][criterion]
+        print(f"| {criterion} | {d['count']} | {d['mean']:.1f} | {d['std']:.1f} | {d['p10']:.0f} | {d['p50']:.0f} | {d['p90']:.0f} | "
+              f"{d['pass_rate']:.0%} | {a['mean_spread']:.1f} | {a['dissent_rate']:.0%} |")
+    print("\n| Judge | Mean Offset From Panel |")
+    print("| :--- | :--- |")
+    for judge, biases in stats["judge_bias"].items():
+        print(f"| {judge} | {biases['overall']:+.1f} |")
+    print(f"\n## Outliers (|z| > {args.outlier_z})")
+    for outlier in stats["outliers"]:
+        print(f"- {outlier['audit_id']}: overall {outlier['overall']:.2f} (z {outlier['z']:+.1f})")
+    if not stats["outliers"]:
+        print("- None")
+    print(f"\nLoaded in {loaded - started:.2f}s, analysed in {finished - loaded:.2f}s.")
+    return stats
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# automation-auditor/forensics.py
+"""
+Offline forensics: runs only the deterministic detectives and prints evidence JSON.
+
+    python forensics.py https://github.com/user/repo.git [--pdf report.pdf]
+    python forensics.py --manifest submissions.csv --workers 8 --out evidence.jsonl
+
+No judge, Chief Justice or LLM client is imported, so start-up stays short
+enough to pre-screen many repositories. One JSON line is written per submission.
+"""
+import argparse
+import json
+import sys
+
+from src.forensics import collect_evidence
+from src.profiling import write_profile
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect detective evidence without judging.")
+    parser.add_argument("repo_urls", nargs="*", help="Repositories to inspect")
+    parser.add_argument("--pdf", default="", help="Report PDF for the DocAnalyst (single repository only)")
+    parser.add_argument("--manifest", default=None, help="CSV or JSONL manifest with repo_url and pdf_path columns")
+    parser.add_argument("--workers", type=int, default=4, help="Submissions inspected concurrently")
+    parser.add_argument("--out", default=None, help="Write JSONL here instead of stdout")
+    args = parser.parse_args(argv)
+
+    submissions = [{"repo_url": url, "pdf_path": args.pdf} for url in args.repo_urls]
+    if args.manifest:
+        from src.runner import load_manifest
+        submissions += [entry.model_dump() for entry in load_manifest(args.manifest)]
+    if not submissions:
+        parser.error("give at least one repository URL or --manifest")
+
+    records = collect_evidence(submissions, workers=args.workers)
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+    finally:
+        if args.out:
+            out.close()
+    # Profile summary goes to stderr so stdout stays JSONL
+    write_profile(file=sys.stderr)
+    return records
+
+if __name__ == "__main__":
+    main()
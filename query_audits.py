@@ -0,0 +1,99 @@
+# automation-auditor/query_audits.py
+"""
+Queries the audit store and renders stored reports on demand.
+
+    python query_audits.py audits --repo https://github.com/user/repo
+    python query_audits.py criteria --criterion state_management_rigor --failing --since 7d
+    python query_audits.py render <audit_id> [--out report.md]
+"""
+import argparse
+import json
+import math
+import re
+import sys
+import time
+from datetime import datetime
+
+from src.config import get_settings
+from src.nodes.justice import render_report_markdown
+from src.rubric import RUBRIC_PATH, load_synthesis_rules
+from src.store import AuditStore
+
+_DURATION_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+def parse_time(value: str) -> float:
+    """
+    Accepts a relative age ("30m", "12h", "7d", "2w") or an ISO date/time.
+    """
+    match = re.fullmatch(r"(\d+)([mhdw])", value)
+    if match:
+        return time.time() - int(match.group(1)) * _DURATION_UNITS[match.group(2)]
+    return datetime.fromisoformat(value).timestamp()
+
+def _print_rows(rows, as_json: bool):
+    if as_json:
+        print(json.dumps(rows, indent=2))
+        return
+    for row in rows:
+        row = dict(row, created_at=datetime.fromtimestamp(row["created_at"]).strftime("%Y-%m-%d %H:%M"))
+        print("\t".join("" if v is None else str(v) for v in row.values()))
+    print(f"({len(rows)} rows)", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query stored audit results.")
+    parser.add_argument("--db", default=get_settings().audit_store_path, help="Path to the audit store")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_filters(sub):
+        sub.add_argument("--repo", help="Exact repository URL")
+        sub.add_argument("--commit", help="Commit SHA or prefix")
+        sub.add_argument("--since", type=parse_time, help="Age (7d) or ISO timestamp")
+        sub.add_argument("--until", type=parse_time, help="Age (7d) or ISO timestamp")
+        sub.add_argument("--limit", type=int, default=100)
+
+    add_filters(commands.add_parser("audits", help="List audits"))
+    criteria = commands.add_parser("criteria", help="List criterion results")
+    add_filters(criteria)
+    criteria.add_argument("--criterion", help="Criterion id, e.g. state_management_rigor")
+    criteria.add_argument("--min-score", type=int)
+    criteria.add_argument("--max-score", type=int)
+    criteria.add_argument("--failing", action="store_true", help="Only scores below the rubric pass threshold")
+    render = commands.add_parser("render", help="Render a stored audit as Markdown")
+    render.add_argument("audit_id")
+    render.add_argument("--out", help="Write to a file instead of stdout")
+    args = parser.parse_args(argv)
+
+    store = AuditStore(args.db)
+    try:
+        if args.command == "audits":
+            rows = store.list_audits(args.repo, args.commit, args.since, args.until, args.limit)
+            _print_rows(rows, args.json)
+            return rows
+
+        rules = load_synthesis_rules(RUBRIC_PATH)
+        if args.command == "criteria":
+            max_score = args.max_score
+            if args.failing:
+                below_pass = math.ceil(rules.pass_threshold) - 1
+                max_score = below_pass if max_score is None else min(max_score, below_pass)
+            rows = store.query_criteria(args.criterion, args.min_score, max_score, args.repo, args.commit,
+                                        args.since, args.until, args.limit)
+            _print_rows(rows, args.json)
+            return rows
+
+        report = store.load_report(args.audit_id)
+        if report is None:
+            parser.error(f"No stored audit {args.audit_id!r} in {args.db}")
+        md_content = render_report_markdown(report, store.load_llm_usage(args.audit_id), rules)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                f.write(md_content)
+        else:
+            print(md_content)
+        return md_content
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
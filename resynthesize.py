@@ -0,0 +1,55 @@
+# automation-auditor/resynthesize.py
+"""
+Re-runs Chief Justice synthesis over stored or archived audits without
+cloning repos or calling the LLM. Use after changing `synthesis_rules.parameters`
+in the rubric to see how every past submission would have scored.
+
+    python resynthesize.py [--store reports/audits.db | --archive reports/audits] [--rubric rubric/week2_rubric.json] [--out reports/resynthesized]
+"""
+import argparse
+import os
+import time
+
+from src.archive import iter_audits
+from src.config import get_settings
+from src.nodes.justice import render_report_markdown, synthesize_report
+from src.rubric import RUBRIC_PATH, load_synthesis_rules
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute audit reports from archived opinions.")
+    parser.add_argument("--store", default=get_settings().audit_store_path, help="SQLite audit store to read")
+    parser.add_argument("--archive", default=None, help="Read this gzip archive directory instead of the store")
+    parser.add_argument("--rubric", default=RUBRIC_PATH, help="Rubric whose synthesis_rules parameters are applied")
+    parser.add_argument("--out", default="reports/resynthesized", help="Directory for regenerated Markdown reports")
+    parser.add_argument("--no-markdown", action="store_true", help="Only print score changes")
+    args = parser.parse_args(argv)
+
+    rules = load_synthesis_rules(args.rubric)
+    if not args.no_markdown:
+        os.makedirs(args.out, exist_ok=True)
+
+    started = time.perf_counter()
+    count = changed = 0
+    store_path = "" if args.archive else args.store
+    for audit in iter_audits(args.archive or get_settings().audit_archive_dir, store_path):
+        report = synthesize_report(audit["repo_url"], audit["rubric"], audit["opinions"], rules)
+        # Synthesis cannot tell which stages ran out of time; keep what the original audit recorded
+        report.degraded_stages = audit.get("degraded_stages", [])
+        count += 1
+
+        previous = audit.get("overall_score")
+        if previous is not None and abs(previous - report.overall_score) > 1e-9:
+            changed += 1
+            print(f"{audit['audit_id']}: {previous:.2f} -> {report.overall_score:.2f}")
+
+        if not args.no_markdown:
+            md_content = render_report_markdown(report, audit.get("llm_usage", []), rules)
+            with open(os.path.join(args.out, f"audit_{audit['audit_id']}.md"), "w", encoding="utf-8") as f:
+                f.write(md_content)
+
+    elapsed = time.perf_counter() - started
+    print(f"Re-synthesized {count} audits in {elapsed:.2f}s ({changed} overall scores changed).")
+    return count
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# automation-auditor/run_batch.py
+"""
+Audits every submission in a manifest concurrently.
+
+    python run_batch.py submissions.csv [--max-audits 8] [--clone-concurrency 4] [--cpu-concurrency 4] [--llm-concurrency 8]
+    python run_batch.py submissions.csv --profile reports/profile.json
+
+The manifest is CSV (header: repo_url,pdf_path[,rubric]) or JSONL with the same keys.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from src.config import init_tracing, reset_settings
+from src.llm.rate_limit import get_rate_limiter
+from src.profiling import write_profile
+from src.runner import load_manifest, run_batch, summarize_batch
+
+def _progress(done: int, total: int, outcome) -> None:
+    detail = f"{outcome.overall_score:.2f}" if outcome.overall_score is not None else (outcome.error or outcome.status)
+    print(f"[{done}/{total}] {outcome.status:<9} {outcome.elapsed_s:7.1f}s  {outcome.repo_url}  {detail}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many audits with bounded per-stage concurrency.")
+    parser.add_argument("manifest", help="CSV or JSONL manifest of submissions")
+    parser.add_argument("--max-audits", type=int, help="Audits in flight (AUDITOR_BATCH_MAX_AUDITS)")
+    parser.add_argument("--clone-concurrency", type=int, help="Concurrent git clones (AUDITOR_BATCH_CLONE_CONCURRENCY)")
+    parser.add_argument("--cpu-concurrency", type=int, help="Concurrent CPU-bound parsing (AUDITOR_BATCH_CPU_CONCURRENCY)")
+    parser.add_argument("--llm-concurrency", type=int, help="Concurrent LLM calls (AUDITOR_LLM_MAX_CONCURRENCY)")
+    parser.add_argument("--summary-json", help="Also write outcomes and the throughput summary to this file")
+    parser.add_argument("--profile", metavar="TRACE_JSON", help="Record profiling spans to this Chrome trace (AUDITOR_PROFILE_TRACE_PATH)")
+    args = parser.parse_args(argv)
+
+    overrides = {
+        "AUDITOR_BATCH_MAX_AUDITS": args.max_audits,
+        "AUDITOR_BATCH_CLONE_CONCURRENCY": args.clone_concurrency,
+        "AUDITOR_BATCH_CPU_CONCURRENCY": args.cpu_concurrency,
+        "AUDITOR_LLM_MAX_CONCURRENCY": args.llm_concurrency,
+        "AUDITOR_PROFILE_TRACE_PATH": args.profile,
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            os.environ[name] = str(value)
+    reset_settings()
+
+    init_tracing()
+    entries = load_manifest(args.manifest)
+    print(f"--- Auditing {len(entries)} submissions ---")
+
+    started = time.perf_counter()
+    outcomes = asyncio.run(run_batch(entries, on_progress=_progress))
+    summary = summarize_batch(outcomes, time.perf_counter() - started)
+
+    queue = get_rate_limiter().metrics()
+    print(f"\n{summary['ok']}/{summary['audits']} audits succeeded in {summary['wall_s']:.1f}s "
+          f"({summary['audits_per_min']:.1f} audits/min, mean {summary['mean_audit_s']:.1f}s, p95 {summary['p95_audit_s']:.1f}s)")
+    waits = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in sorted(summary["resource_wait_s"].items())) or "none"
+    print(f"Resource wait: {waits}; LLM queue wait mean {queue['mean_wait_s']:.2f}s, max {queue['max_wait_s']:.2f}s")
+    for outcome in outcomes:
+        if outcome.status != "ok":
+            print(f"FAILED {outcome.repo_url}: {outcome.error or outcome.status}")
+    write_profile()
+
+    if args.summary_json:
+        with open(args.summary_json, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "outcomes": [o.model_dump() for o in outcomes]}, f, indent=2)
+    return outcomes
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,57 @@
 # automation-auditor/run_graph.py
-import json
-import os
+"""
+Audits the configured submission through the full graph.
+
+    python run_graph.py [--fresh]
+
+With a checkpoint database an interrupted audit resumes from its last
+completed super-step; `--fresh` discards that progress and starts over.
+"""
+import argparse
+import asyncio
 from src.graph import build_graph
 from src.state import AgentState
-from src.config import init_tracing
+from src.checkpoint import ainvoke_resumable, audit_thread_id, checkpointed_graph
+from src.config import get_settings, init_tracing
+from src.deadline import audit_deadline
+from src.profiling import write_profile
+from src.llm.rate_limit import get_rate_limiter
+from src.rubric import RUBRIC_PATH, load_rubric
+from src.runner import make_initial_state
+
+async def _invoke_checkpointed(checkpoint_path: str, initial_state: AgentState, fresh: bool = False) -> dict:
+    thread_id = audit_thread_id(initial_state["repo_url"], initial_state["pdf_path"], RUBRIC_PATH)
+    async with checkpointed_graph(checkpoint_path) as app:
+        return await ainvoke_resumable(app, initial_state, thread_id, fresh=fresh)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one audit through the full graph.")
+    parser.add_argument("--fresh", action="store_true", help="Ignore any checkpointed progress and start the audit over")
+    args = parser.parse_args(argv)
 
-def main():
     # 1. Initialize Tracing
     init_tracing()
     
-    # 2. Build the Graph
-    app = build_graph()
-    
-    # 3. Create initial state (dictionary for TypedDict)
-    rubric_payload = []
-    rubric_path = "rubric/week2_rubric.json"
-    if os.path.exists(rubric_path):
-        with open(rubric_path, "r", encoding="utf-8") as f:
-            rubric_payload = json.load(f).get("dimensions", [])
-            
-    initial_state: AgentState = {
-        "repo_url": "https://github.com/bettyabay/Automaton-Auditor.git",
-        "pdf_path": "reports/interim_report.md",
-        "rubric_dimensions": rubric_payload,
-        "evidences": {},
-        "opinions": [],
-        "final_report": None
-    }
+    # 2. Create initial state (dictionary for TypedDict)
+    rubric_payload = load_rubric().get("dimensions", [])
+    initial_state: AgentState = make_initial_state(
+        "https://github.com/bettyabay/Automaton-Auditor.git",
+        "reports/interim_report.md",
+        rubric_payload,
+    )
     
-    # 4. Invoke the app
+    # 3. Invoke the graph (async so the judges share pooled clients and wait concurrently).
+    #    With a checkpoint database the audit resumes from its last completed super-step;
+    #    only without one is a plain graph built here.
     print("--- Invoking LangGraph ---")
-    final_state_snapshot = app.invoke(initial_state)
+    #    Every stage runs within the audit deadline (AUDITOR_AUDIT_DEADLINE_S).
+    checkpoint_path = get_settings().checkpoint_path
+    with audit_deadline():
+        if checkpoint_path:
+            final_state_snapshot = asyncio.run(_invoke_checkpointed(checkpoint_path, initial_state, fresh=args.fresh))
+        else:
+            app = build_graph()
+            final_state_snapshot = asyncio.run(app.ainvoke(initial_state))
     
     # langgraph.invoke returns the state snapshot
     print("\n--- Final State ---")
@@ -42,5 +63,10 @@ def main():
     else:
         print("Graph finished, but no Final Report was generated.")
 
+    queue = get_rate_limiter().metrics()
+    print(f"LLM queue wait: {queue['queued']}/{queue['requests']} calls queued, mean {queue['mean_wait_s']:.2f}s, p95 {queue['p95_wait_s']:.2f}s, max {queue['max_wait_s']:.2f}s")
+    # With AUDITOR_PROFILE_TRACE_PATH set: Chrome trace plus per-span summary
+    write_profile()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,126 @@
+# automation-auditor/serve_audits.py
+"""
+Resident audit service: one warm process answers many audit requests.
+
+    python serve_audits.py                      # JSONL requests on stdin, events on stdout
+    python serve_audits.py --socket /tmp/auditor.sock
+
+Each request is one JSON line: {"id": "a1", "repo_url": "...", "pdf_path": "...", "rubric": "..."}.
+Each event is one JSON line tagged with the request id: accepted, progress, result or error.
+EOF on stdin, SIGINT or SIGTERM stops accepting requests and drains in-flight audits.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import sys
+import threading
+
+from src.config import get_settings, init_tracing
+from src.service import AuditService
+
+def _decode(line: str):
+    try:
+        payload = json.loads(line)
+    except json.JSONDecodeError as e:
+        return None, str(e)
+    if not isinstance(payload, dict):
+        return None, "request must be a JSON object"
+    return payload, None
+
+def _read_lines(loop: asyncio.AbstractEventLoop, lines: asyncio.Queue) -> None:
+    # Daemon thread: a blocked readline must not keep the process alive after a signal
+    for line in sys.stdin:
+        loop.call_soon_threadsafe(lines.put_nowait, line)
+    loop.call_soon_threadsafe(lines.put_nowait, None)
+
+async def _serve_stdio(service: AuditService, out) -> None:
+    loop = asyncio.get_running_loop()
+    lock = asyncio.Lock()
+
+    async def emit(event: dict) -> None:
+        async with lock:
+            out.write(json.dumps(event) + "\n")
+            out.flush()
+
+    lines: asyncio.Queue = asyncio.Queue()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, lines.put_nowait, None)
+    threading.Thread(target=_read_lines, args=(loop, lines), daemon=True).start()
+    while (line := await lines.get()) is not None:
+        if not line.strip():
+            continue
+        payload, error = _decode(line)
+        if error:
+            await emit({"id": "", "event": "error", "error": error})
+            continue
+        service.submit(payload, emit)
+    await service.drain()
+
+async def _serve_socket(service: AuditService, path: str) -> None:
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+
+        async def emit(event: dict) -> None:
+            async with lock:
+                writer.write((json.dumps(event) + "\n").encode("utf-8"))
+                with contextlib.suppress(ConnectionError):
+                    await writer.drain()
+
+        tasks = []
+        while line := await reader.readline():
+            if not line.strip():
+                continue
+            payload, error = _decode(line.decode("utf-8"))
+            if error:
+                await emit({"id": "", "event": "error", "error": error})
+                continue
+            task = service.submit(payload, emit)
+            if task is not None:
+                tasks.append(task)
+        # The client closed its side; finish its audits before closing the connection
+        await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(handle, path=path)
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"--- Audit service listening on {path} (max {service.max_audits} concurrent audits) ---", file=sys.stderr)
+    await stop.wait()
+    server.close()
+    await service.drain()
+    await server.wait_closed()
+    os.unlink(path)
+
+async def _main(args) -> AuditService:
+    service = AuditService(max_audits=args.max_audits)
+    service.warm_up()
+    if args.socket:
+        await _serve_socket(service, args.socket)
+    else:
+        # Node progress prints would corrupt the JSONL stream; send them to stderr
+        out = sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            await _serve_stdio(service, out)
+    return service
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve audits from a warm process over stdin JSONL or a Unix socket.")
+    parser.add_argument("--socket", default=None, help="Listen on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--max-audits", type=int, default=None, help=f"Audits running at once (AUDITOR_SERVICE_MAX_AUDITS, default {get_settings().service_max_audits})")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        init_tracing()
+    service = asyncio.run(_main(args))
+    print(f"--- Audit service stopped: {service.completed} completed, {service.failed} failed ---", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
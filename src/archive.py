@@ -0,0 +1,77 @@
+# automation-auditor/src/archive.py
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .state import Evidence, JudicialOpinion
+from .store import get_store
+
+ARCHIVE_FORMAT = 1
+ARCHIVE_SUFFIX = ".json.gz"
+
+def _dump_models(items: List[Any]) -> List[Dict[str, Any]]:
+    return [item.model_dump(mode="json", exclude_defaults=True) if hasattr(item, "model_dump") else item for item in items]
+
+def save_audit(state: Dict[str, Any], archive_dir: str, audit_id: str, overall_score: Optional[float] = None) -> str:
+    """
+    Persists an audit's evidence and opinions as gzipped compact JSON.
+
+    Only what synthesis needs is kept: rubric ids/names, evidence, opinions,
+    LLM usage and degraded stage names. Returns the archive file path.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    record = {
+        "format": ARCHIVE_FORMAT,
+        "audit_id": audit_id,
+        "created_at": time.time(),
+        "repo_url": state.get("repo_url", "unknown"),
+        "pdf_path": state.get("pdf_path"),
+        "overall_score": overall_score,
+        "rubric": [{"id": d["id"], "name": d.get("name", d["id"])} for d in state.get("rubric_dimensions", []) if "id" in d],
+        "evidences": {key: _dump_models(items) for key, items in (state.get("evidences") or {}).items()},
+        "opinions": _dump_models(state.get("opinions", [])),
+        "llm_usage": state.get("llm_usage", []),
+        "degraded_stages": [d["stage"] for d in state.get("degraded_stages") or []],
+    }
+    path = os.path.join(archive_dir, f"{audit_id}{ARCHIVE_SUFFIX}")
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(record, f, separators=(",", ":"), default=str)
+    os.replace(tmp_path, path)
+    return path
+
+def load_audit(path: str) -> Dict[str, Any]:
+    """
+    Reads an archived audit, rebuilding Evidence and JudicialOpinion models.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        record = json.load(f)
+    if record.get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"Unsupported audit archive format {record.get('format')!r} in {path}")
+    record["evidences"] = {
+        key: [Evidence.model_validate(item) for item in items] for key, items in record.get("evidences", {}).items()
+    }
+    record["opinions"] = [JudicialOpinion.model_validate(item) for item in record.get("opinions", [])]
+    return record
+
+def iter_audit_paths(archive_dir: str) -> Iterator[str]:
+    """
+    Yields archived audit files in name (i.e. timestamp) order.
+    """
+    yield from sorted(glob.glob(os.path.join(archive_dir, f"*{ARCHIVE_SUFFIX}")))
+
+def iter_audits(archive_dir: str = "", store_path: str = "") -> Iterator[Dict[str, Any]]:
+    """
+    Yields past audits as `load_audit` records, from the SQLite store when
+    `store_path` is set (the Chief Justice skips the archive then), else from
+    the gzip archive in `archive_dir`.
+    """
+    if store_path:
+        yield from get_store(store_path).iter_records()
+        return
+    for path in iter_audit_paths(archive_dir):
+        yield load_audit(path)
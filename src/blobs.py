@@ -0,0 +1,86 @@
+# automation-auditor/src/blobs.py
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+
+from .config import get_settings
+from .state import Evidence
+
+# Characters of offloaded content kept inline so logs and reports stay readable
+PREVIEW_CHARS = 160
+
+class BlobStore:
+    """
+    Content-addressed text store: `put` returns the sha256 of the text and
+    writes it once to `<root>/<ref[:2]>/<ref>`; identical content is stored once.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, ref: str) -> str:
+        return os.path.join(self.root, ref[:2], ref)
+
+    def put(self, text: str) -> str:
+        data = text.encode("utf-8")
+        ref = hashlib.sha256(data).hexdigest()
+        path = self._path(ref)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return ref
+
+    def get(self, ref: str) -> str:
+        with open(self._path(ref), "rb") as f:
+            return f.read().decode("utf-8")
+
+_stores: Dict[str, BlobStore] = {}
+
+def get_blob_store() -> Optional[BlobStore]:
+    """
+    The store at AUDITOR_EVIDENCE_BLOB_DIR, or None when offloading is disabled.
+    """
+    root = get_settings().evidence_blob_dir
+    if not root:
+        return None
+    if root not in _stores:
+        _stores[root] = BlobStore(root)
+    return _stores[root]
+
+def compact_evidence(evidence: Evidence) -> Evidence:
+    """
+    Moves content longer than `evidence_inline_max` characters into the blob
+    store, leaving a preview and a `content_ref` in the state.
+    """
+    content = evidence.content
+    store = get_blob_store()
+    if store is None or content is None or evidence.content_ref or len(content) <= get_settings().evidence_inline_max:
+        return evidence
+    ref = store.put(content)
+    preview = f"{content[:PREVIEW_CHARS]}... [{len(content)} chars, blob {ref[:12]}]"
+    return evidence.model_copy(update={"content": preview, "content_ref": ref})
+
+def resolve_content(evidence: Evidence) -> Optional[str]:
+    """
+    Full evidence content, read from the blob store when it was offloaded.
+    Falls back to the preview if the store is disabled or the blob is gone.
+    """
+    store = get_blob_store()
+    if not evidence.content_ref or store is None:
+        return evidence.content
+    try:
+        return store.get(evidence.content_ref)
+    except OSError:
+        return evidence.content
+
+def resolve_evidence(evidence: Evidence) -> Evidence:
+    """
+    Copy of `evidence` with its full content inline.
+    """
+    if not evidence.content_ref:
+        return evidence
+    return evidence.model_copy(update={"content": resolve_content(evidence), "content_ref": None})
@@ -0,0 +1,97 @@
+# automation-auditor/src/checkpoint.py
+import glob
+import hashlib
+import json
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiosqlite
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from .config import get_settings
+from .fingerprint import audit_fingerprint, file_hash, remote_head
+from .llm.clients import DEFAULT_MODEL
+from .state import AgentState
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Source files whose behaviour shapes opinions, synthesis and the checkpointed graph itself
+PIPELINE_SOURCES = ("graph.py", "nodes/judges.py", "nodes/fast_path.py", "nodes/justice.py")
+# Settings that change what the judges produce or how the graph is wired
+PIPELINE_SETTING_PREFIXES = ("judge_", "graph_")
+
+@lru_cache(maxsize=1)
+def _pipeline_source_hash() -> str:
+    digest = hashlib.sha256()
+    for pattern in PIPELINE_SOURCES:
+        for path in sorted(glob.glob(os.path.join(ROOT, pattern))):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def pipeline_version() -> str:
+    """
+    Hash of the judge and graph code, the judge model and the AUDITOR_JUDGE_*
+    and AUDITOR_GRAPH_* settings. Part of every thread id, so a checkpoint
+    is never resumed by a pipeline that would judge it differently.
+    """
+    settings = get_settings().model_dump()
+    key = {
+        "code": _pipeline_source_hash(),
+        "model": DEFAULT_MODEL,
+        "settings": {name: value for name, value in settings.items() if name.startswith(PIPELINE_SETTING_PREFIXES)},
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def thread_id_for(fingerprint: str) -> str:
+    """
+    Checkpoint thread id for an audit fingerprint under the current pipeline version.
+    """
+    return f"{fingerprint}-{pipeline_version()}"
+
+def audit_thread_id(repo_url: str, pdf_path: str, rubric_path: str, commit_sha: Optional[str] = None) -> str:
+    """
+    Checkpoint thread id derived from the audit inputs and the pipeline
+    version, so re-running the same submission finds its earlier progress.
+    """
+    commit_sha = remote_head(repo_url) if commit_sha is None else commit_sha
+    return thread_id_for(audit_fingerprint(repo_url, commit_sha, file_hash(pdf_path), file_hash(rubric_path)))
+
+# State models restored from checkpoints (anything else is refused by the serializer)
+CHECKPOINT_TYPES = [("src.state", name) for name in ("Evidence", "JudicialOpinion", "CriterionResult", "AuditReport")]
+
+@asynccontextmanager
+async def checkpointed_graph(path: str) -> AsyncIterator[Any]:
+    """
+    Yields `build_graph()` compiled with an SQLite checkpointer at `path`.
+    """
+    # Imported here so the thread-id helpers do not load every graph node
+    from .graph import build_graph
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    async with aiosqlite.connect(path) as conn:
+        saver = AsyncSqliteSaver(conn, serde=JsonPlusSerializer(allowed_msgpack_modules=CHECKPOINT_TYPES))
+        yield build_graph(checkpointer=saver)
+
+async def ainvoke_resumable(app, state: AgentState, thread_id: str, fresh: bool = False) -> Dict[str, Any]:
+    """
+    Runs an audit on a checkpointed graph.
+
+    A run on `thread_id` that stopped with pending nodes (interrupted or
+    failed) resumes from its last completed super-step, so completed
+    detectives and judges are not re-run. A thread whose run finished is
+    discarded and the audit starts over, as does any thread with `fresh`.
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+    snapshot = None if fresh else await app.aget_state(config)
+    if snapshot is not None and snapshot.next:
+        print(f"--- Resuming audit {thread_id[:12]} at {', '.join(snapshot.next)} ---")
+        return await app.ainvoke(None, config)
+    if snapshot is not None and snapshot.values:
+        print(f"--- Audit {thread_id[:12]} already finished; starting a new run ---")
+    await app.checkpointer.adelete_thread(thread_id)
+    return await app.ainvoke(state, config)
@@ -0,0 +1,239 @@
+# automation-auditor/src/cohort.py
+import gzip
+import json
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .archive import ARCHIVE_FORMAT
+from .rubric import SynthesisRules
+
+JUDGES = ("Prosecutor", "Defense", "TechLead")
+PERCENTILES = (10, 25, 50, 75, 90)
+
+@dataclass
+class Cohort:
+    """
+    Judge scores of many audits as a float array shaped
+    submission x criterion x judge (NaN where a judge gave no opinion).
+    """
+    audit_ids: List[str]
+    repo_urls: List[str]
+    criteria: List[str]
+    scores: np.ndarray
+
+    def save(self, path: str) -> None:
+        """
+        Caches the cohort as a compressed .npz for fast interactive reloads.
+        """
+        np.savez_compressed(path, audit_ids=np.array(self.audit_ids), repo_urls=np.array(self.repo_urls),
+                            criteria=np.array(self.criteria), scores=self.scores)
+
+    @classmethod
+    def load(cls, path: str) -> "Cohort":
+        data = np.load(path)
+        return cls(list(data["audit_ids"]), list(data["repo_urls"]), list(data["criteria"]), data["scores"])
+
+def _read_raw(path: str) -> Dict:
+    # Skips pydantic validation: cohort loading only needs the scores
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        record = json.load(f)
+    if record.get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"Unsupported audit archive format {record.get('format')!r} in {path}")
+    return record
+
+def load_cohort(paths: Iterable[str], workers: int = 8) -> Cohort:
+    """
+    Reads archived audits into a `Cohort`. Criteria are the union across the
+    cohort, ordered by first appearance.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        records = list(pool.map(_read_raw, paths))
+    return cohort_from_records(records)
+
+def _opinion_fields(opinion) -> tuple:
+    # Raw archive records hold dicts, store records hold JudicialOpinion models
+    if isinstance(opinion, dict):
+        return opinion["criterion_id"], opinion["judge"], opinion["score"]
+    return opinion.criterion_id, opinion.judge, opinion.score
+
+def cohort_from_records(records: Iterable[Dict]) -> Cohort:
+    """
+    Builds a `Cohort` from audit records, e.g. `AuditStore.iter_records()`.
+    """
+    records = list(records)
+    criteria: Dict[str, int] = {}
+    for record in records:
+        for opinion in record.get("opinions", []):
+            criteria.setdefault(_opinion_fields(opinion)[0], len(criteria))
+
+    judge_index = {judge: j for j, judge in enumerate(JUDGES)}
+    scores = np.full((len(records), len(criteria), len(JUDGES)), np.nan)
+    for s, record in enumerate(records):
+        for opinion in record.get("opinions", []):
+            criterion_id, judge, score = _opinion_fields(opinion)
+            c = criteria[criterion_id]
+            j = judge_index[judge]
+            # The Chief Justice reads the first opinion per judge, so do the same
+            if np.isnan(scores[s, c, j]):
+                scores[s, c, j] = score
+
+    return Cohort(
+        audit_ids=[r.get("audit_id", "") for r in records],
+        repo_urls=[r.get("repo_url", "unknown") for r in records],
+        criteria=list(criteria),
+        scores=scores,
+    )
+
+def cohort_from_score_rows(rows: Iterable[tuple]) -> Cohort:
+    """
+    Builds a `Cohort` straight from (audit_id, repo_url, criterion_id, judge,
+    score) rows such as `AuditStore.score_rows()`, without loading records.
+    Rows of one audit must be adjacent; None criterion rows add an unjudged submission.
+    """
+    audits: Dict[str, int] = {}
+    repo_urls: List[str] = []
+    criteria: Dict[str, int] = {}
+    judge_index = {judge: j for j, judge in enumerate(JUDGES)}
+    cells: List[tuple] = []
+    values: List[float] = []
+    for audit_id, repo_url, criterion_id, judge, score in rows:
+        if audit_id not in audits:
+            audits[audit_id] = len(audits)
+            repo_urls.append(repo_url or "unknown")
+        if criterion_id is None:
+            continue
+        cells.append((audits[audit_id], criteria.setdefault(criterion_id, len(criteria)), judge_index[judge]))
+        values.append(score)
+
+    scores = np.full((len(audits), len(criteria), len(JUDGES)), np.nan)
+    if cells:
+        flat = np.ravel_multi_index(np.array(cells).T, scores.shape)
+        # The Chief Justice reads the first opinion per judge, so do the same
+        _, first = np.unique(flat, return_index=True)
+        scores.flat[flat[first]] = np.asarray(values, dtype=float)[first]
+    return Cohort(audit_ids=list(audits), repo_urls=repo_urls, criteria=list(criteria), scores=scores)
+
+def synthesize_cohort(cohort: Cohort, rules: Optional[SynthesisRules] = None) -> Dict[str, np.ndarray]:
+    """
+    Vectorized equivalent of `synthesize_report` over a whole cohort.
+
+    Returns `final` (submission x criterion, NaN where a criterion had no
+    opinions), `spread`, `dissent` and `overall` (per submission).
+    """
+    rules = rules or SynthesisRules()
+    scores = cohort.scores
+    prosecutor = scores[..., JUDGES.index("Prosecutor")]
+    tech_lead = scores[..., JUDGES.index("TechLead")]
+    judged = ~np.isnan(scores).all(axis=2)
+
+    with _quiet_nan_warnings():
+        final = np.round(np.nanmean(scores, axis=2))
+        spread = np.nanmax(scores, axis=2) - np.nanmin(scores, axis=2)
+
+    vetoed = prosecutor <= rules.security_veto_score
+    final = np.where(vetoed, np.minimum(final, rules.security_cap), final)
+
+    architecture = np.array([any(k in c.lower() for k in rules.functionality_keywords) for c in cohort.criteria], dtype=bool)
+    use_tech_lead = architecture[np.newaxis, :] & ~np.isnan(tech_lead)
+    final = np.where(use_tech_lead, tech_lead, final)
+
+    final = np.where(judged, np.clip(final, 1, 100), np.nan)
+    with _quiet_nan_warnings():
+        overall = np.nanmean(final, axis=1)
+    overall = np.where(judged.any(axis=1), overall, 0.0)
+    return {
+        "final": final,
+        "spread": np.where(judged, spread, np.nan),
+        "dissent": judged & (spread >= rules.dissent_threshold),
+        "overall": overall,
+    }
+
+def criterion_distributions(cohort: Cohort, final: np.ndarray, rules: Optional[SynthesisRules] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Per-criterion count, mean, standard deviation, percentiles and pass rate of final scores.
+    """
+    rules = rules or SynthesisRules()
+    with _quiet_nan_warnings():
+        counts = np.sum(~np.isnan(final), axis=0)
+        means = np.nanmean(final, axis=0)
+        stds = np.nanstd(final, axis=0)
+        percentiles = np.nanpercentile(final, PERCENTILES, axis=0)
+        pass_rate = np.nansum(final >= rules.pass_threshold, axis=0) / np.maximum(counts, 1)
+    result = {}
+    for c, criterion in enumerate(cohort.criteria):
+        stats = {"count": int(counts[c]), "mean": float(means[c]), "std": float(stds[c]), "pass_rate": float(pass_rate[c])}
+        stats.update({f"p{p}": float(percentiles[i, c]) for i, p in enumerate(PERCENTILES)})
+        result[criterion] = stats
+    return result
+
+def judge_bias(cohort: Cohort) -> Dict[str, Dict[str, float]]:
+    """
+    Mean offset of each judge from the panel mean, per criterion and overall.
+    Positive values mean the judge scores more generously than the panel.
+    """
+    with _quiet_nan_warnings():
+        panel = np.nanmean(cohort.scores, axis=2, keepdims=True)
+        offsets = cohort.scores - panel
+        per_criterion = np.nanmean(offsets, axis=0)
+        overall = np.nanmean(offsets.reshape(-1, len(JUDGES)), axis=0)
+    result = {}
+    for j, judge in enumerate(JUDGES):
+        biases = {criterion: float(per_criterion[c, j]) for c, criterion in enumerate(cohort.criteria)}
+        biases["overall"] = float(overall[j])
+        result[judge] = biases
+    return result
+
+def judge_agreement(cohort: Cohort, synthesis: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+    """
+    Per-criterion inter-judge agreement: mean spread, dissent rate, and the
+    Pearson correlation of each judge pair over submissions where both scored.
+    """
+    judged = ~np.isnan(synthesis["spread"])
+    with _quiet_nan_warnings():
+        mean_spread = np.nanmean(synthesis["spread"], axis=0)
+    dissent_rate = synthesis["dissent"].sum(axis=0) / np.maximum(judged.sum(axis=0), 1)
+
+    result = {}
+    for c, criterion in enumerate(cohort.criteria):
+        stats = {"mean_spread": float(mean_spread[c]), "dissent_rate": float(dissent_rate[c])}
+        for a in range(len(JUDGES)):
+            for b in range(a + 1, len(JUDGES)):
+                stats[f"corr_{JUDGES[a]}_{JUDGES[b]}"] = _pearson(cohort.scores[:, c, a], cohort.scores[:, c, b])
+        result[criterion] = stats
+    return result
+
+def flag_outliers(cohort: Cohort, overall: np.ndarray, threshold: float = 3.5) -> List[Dict[str, float]]:
+    """
+    Submissions whose overall score has a robust z-score (median/MAD) beyond `threshold`.
+    """
+    median = np.median(overall) if overall.size else 0.0
+    mad = np.median(np.abs(overall - median)) if overall.size else 0.0
+    if mad == 0:
+        return []
+    z = 0.6745 * (overall - median) / mad
+    flagged = np.flatnonzero(np.abs(z) > threshold)
+    return [
+        {"audit_id": cohort.audit_ids[i], "repo_url": cohort.repo_urls[i], "overall": float(overall[i]), "z": float(z[i])}
+        for i in flagged[np.argsort(-np.abs(z[flagged]))]
+    ]
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> float:
+    both = ~np.isnan(x) & ~np.isnan(y)
+    if both.sum() < 2:
+        return float("nan")
+    x, y = x[both], y[both]
+    if x.std() == 0 or y.std() == 0:
+        return float("nan")
+    return float(np.corrcoef(x, y)[0, 1])
+
+@contextmanager
+def _quiet_nan_warnings():
+    # NaN results for unjudged cells are expected; silence numpy's all-NaN slice warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        yield
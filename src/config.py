@@ -1,14 +1,25 @@
 # automation-auditor/src/config.py
 import os
-from dotenv import load_dotenv
+from pydantic import BaseModel
 
-# Load environment variables from .env file
-load_dotenv()
+_env_loaded = False
+
+def load_env() -> None:
+    """
+    Loads variables from `.env` once. Called on first settings read rather
+    than at import, so importing a module has no environment side effects.
+    """
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
 
 def init_tracing():
     """
     Ensures LangSmith tracing is enabled based on environment variables.
     """
+    load_env()
     tracing_enabled = os.environ.get("LANGCHAIN_TRACING_V2", "false").lower() == "true"
     
     if tracing_enabled:
@@ -16,6 +27,115 @@ def init_tracing():
     else:
         print("--- LangSmith Tracing Disabled ---")
 
-# Individual config values can be accessed here
-OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY") # Added for Gemini support if needed
+class AuditorSettings(BaseModel):
+    """
+    Runtime tuning knobs. Each field can be overridden with an
+    `AUDITOR_<FIELD_NAME>` environment variable (e.g. AUDITOR_LLM_RPM=120).
+    """
+    # Shared LLM rate limiter (Gemini quotas are per project, not per caller)
+    llm_rpm: int = 60
+    llm_tpm: int = 250_000
+    # Backoff on 429 / 5xx responses
+    llm_max_attempts: int = 5
+    llm_backoff_base_s: float = 1.0
+    llm_backoff_max_s: float = 30.0
+    # Cap on in-flight LLM calls per process, shared by async and blocking calls of all judges and audits
+    llm_max_concurrency: int = 8
+    # Time budgets (0 disables): the whole audit, plus caps on git clone, other
+    # git subprocesses and each LLM call, all bounded by what is left of the audit
+    audit_deadline_s: float = 900.0
+    clone_timeout_s: float = 180.0
+    git_timeout_s: float = 60.0
+    llm_call_timeout_s: float = 120.0
+    # Criteria per judge call; 0 sends every dimension in one call
+    judge_shard_size: int = 0
+    # Score criteria with conclusive detective evidence by rule instead of LLM
+    judge_fast_path: bool = True
+    # Give criteria with only failed or missing evidence the safe default opinion without an LLM call
+    judge_skip_missing_evidence: bool = True
+    # Self-consistency sampling: up to this many samples per criterion (1 = off).
+    # Sampling stops after two samples that agree within the tolerance.
+    judge_samples_max: int = 1
+    judge_sample_tolerance: int = 10
+    judge_sample_temperature: float = 0.7
+    # Per-detective lanes that start judging a criterion as soon as its evidence is ready
+    graph_pipelined: bool = False
+    # LLM transport: live | record | replay | fake
+    llm_transport: str = "live"
+    llm_cassette_dir: str = "cassettes"
+    # "" / "recorded", "fixed:<s>", "uniform:<lo>,<hi>" or "lognormal:<median>,<sigma>"
+    llm_simulated_latency: str = ""
+    llm_transport_seed: int = 0
+    # Hedged requests: duplicate a call still pending past this latency
+    # percentile (per call type), capped at `llm_hedge_budget` extra requests per call
+    llm_hedge_enabled: bool = False
+    llm_hedge_percentile: float = 0.95
+    llm_hedge_min_samples: int = 20
+    llm_hedge_budget: float = 0.1
+    # JSONL file receiving one instrumentation record per LLM call ("" disables export)
+    llm_metrics_path: str = "reports/llm_metrics.jsonl"
+    # Batch runner: audits in flight, concurrent git clones and CPU-bound parsing slots (0 = CPU count)
+    batch_max_audits: int = 8
+    batch_clone_concurrency: int = 4
+    batch_cpu_concurrency: int = 0
+    # Opt-in profiling spans around graph nodes and tool functions, written as
+    # Chrome trace-event JSON to this path ("" disables); tracemalloc adds overhead
+    profile_trace_path: str = ""
+    profile_memory: bool = True
+    # Evidence content longer than `evidence_inline_max` characters is kept in a
+    # content-addressed blob store and referenced from the state ("" disables)
+    evidence_blob_dir: str = "reports/blobs"
+    evidence_inline_max: int = 512
+    # Detective memo: evidence reused when repo HEAD, report hash and analyzer sources match ("" disables)
+    detective_memo_dir: str = "reports/detective_memo"
+    # LangGraph checkpoint database for resumable audits ("" disables)
+    checkpoint_path: str = "reports/checkpoints.db"
+    # Durable job queue (audit_queue.py): SQLite file, lease length, retries and result directory
+    queue_path: str = "reports/queue.db"
+    queue_lease_s: float = 300.0
+    queue_poll_s: float = 2.0
+    queue_max_attempts: int = 3
+    queue_results_dir: str = "reports/results"
+    # Resident audit service (serve_audits.py): audits running at once
+    service_max_audits: int = 4
+    # Directory for compact per-audit archives, written only when the audit store is disabled ("" disables)
+    audit_archive_dir: str = "reports/audits"
+    # SQLite store of reports, criteria, opinions and evidence, queried with query_audits.py ("" disables)
+    audit_store_path: str = "reports/audits.db"
+
+    @classmethod
+    def from_env(cls) -> "AuditorSettings":
+        overrides = {}
+        for name, field in cls.model_fields.items():
+            value = os.environ.get(f"AUDITOR_{name.upper()}")
+            # An empty value keeps the default, except for strings where "" can mean disabled
+            if value is None or (value == "" and field.annotation is not str):
+                continue
+            overrides[name] = value
+        return cls(**overrides)
+
+_settings = None
+
+def get_settings() -> AuditorSettings:
+    """
+    Returns the process-wide settings, reading the environment on first use.
+    """
+    global _settings
+    if _settings is None:
+        load_env()
+        _settings = AuditorSettings.from_env()
+    return _settings
+
+def reset_settings() -> None:
+    """
+    Forces the next `get_settings()` call to re-read the environment.
+    """
+    global _settings
+    _settings = None
+
+def __getattr__(name: str):
+    # Individual config values (OPENAI_API_KEY, GOOGLE_API_KEY) are read after .env is loaded
+    if name in ("OPENAI_API_KEY", "GOOGLE_API_KEY"):
+        load_env()
+        return os.environ.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
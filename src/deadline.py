@@ -0,0 +1,74 @@
+# automation-auditor/src/deadline.py
+import subprocess
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Union
+
+from .config import get_settings
+
+# Absolute wall-clock deadline (time.time()) of the audit running in this
+# context. LangGraph copies the context into every node, Send task and
+# worker thread, so setting it once around `invoke` reaches all stages.
+_deadline: ContextVar[Optional[float]] = ContextVar("audit_deadline", default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a stage runs out of its time budget."""
+    pass
+
+@contextmanager
+def audit_deadline(seconds: Optional[float] = None) -> Iterator[Optional[float]]:
+    """
+    Runs the block under an audit deadline `seconds` from now (default
+    AUDITOR_AUDIT_DEADLINE_S; 0 means no deadline). A deadline already set
+    by an enclosing block is kept if it is earlier.
+    """
+    seconds = get_settings().audit_deadline_s if seconds is None else seconds
+    deadline = time.time() + seconds if seconds > 0 else None
+    outer = _deadline.get()
+    if outer is not None and (deadline is None or outer < deadline):
+        deadline = outer
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left before the audit deadline, or None without one.
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.time()
+
+def stage_budget(cap: float, stage: str = "stage") -> Optional[float]:
+    """
+    Seconds `stage` may run: its own cap (<= 0 for none) bounded by what is
+    left of the audit deadline. None means unbounded. Raises
+    DeadlineExceeded when the deadline has already passed.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"{stage}: audit deadline passed {-left:.1f}s ago")
+    budgets = [b for b in (cap if cap > 0 else None, left) if b is not None]
+    return min(budgets) if budgets else None
+
+def is_timeout(exc: Optional[BaseException]) -> bool:
+    """
+    True when a timeout (deadline, asyncio or subprocess) appears anywhere in the exception chain.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, (TimeoutError, subprocess.TimeoutExpired)):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+def degraded(stage: str, reason: Union[BaseException, str]) -> Dict[str, Any]:
+    """
+    Record for AgentState.degraded_stages: `stage` fell back to a default because of `reason`.
+    """
+    if isinstance(reason, BaseException):
+        reason = f"{reason.__class__.__name__}: {reason}"
+    return {"stage": stage, "reason": reason, "ts": time.time()}
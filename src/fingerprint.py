@@ -0,0 +1,48 @@
+# automation-auditor/src/fingerprint.py
+import hashlib
+import os
+import subprocess
+from typing import Optional
+
+from .config import get_settings
+from .deadline import DeadlineExceeded, stage_budget
+
+def remote_head(repo_url: str, timeout: Optional[float] = None) -> str:
+    """
+    Resolves the remote HEAD commit with `git ls-remote` (no clone).
+    `timeout` defaults to AUDITOR_GIT_TIMEOUT_S, bounded by the audit
+    deadline. Returns "" when the remote cannot be reached in time.
+    """
+    try:
+        if timeout is None:
+            timeout = stage_budget(get_settings().git_timeout_s, "ls-remote")
+        result = subprocess.run(
+            ["git", "ls-remote", repo_url, "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=timeout
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError, DeadlineExceeded):
+        return ""
+    line = result.stdout.strip().split("\n", 1)[0]
+    return line.split("\t", 1)[0] if line else ""
+
+def file_hash(path: str) -> str:
+    """
+    sha256 of a file's bytes, or "" if it does not exist.
+    """
+    if not path or not os.path.isfile(path):
+        return ""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def audit_fingerprint(repo_url: str, commit_sha: str, report_hash: str, rubric_hash: str) -> str:
+    """
+    Identity of an audit's inputs: identical fingerprints produce identical evidence and prompts.
+    """
+    key = "\0".join((repo_url.rstrip("/"), commit_sha, report_hash, rubric_hash))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
@@ -0,0 +1,63 @@
+# automation-auditor/src/forensics.py
+from typing import Any, Dict, List
+
+from langgraph.graph import StateGraph, START, END
+
+from .blobs import resolve_evidence
+from .memo import memoized
+from .profiling import profiled
+from .nodes.detectives import doc_analyst_node, repo_investigator_node
+from .state import AgentState
+
+# Deterministic detectives only: the VisionInspector needs a model call
+FORENSIC_DETECTIVES = {
+    "repo_investigator": repo_investigator_node,
+    "doc_analyst": doc_analyst_node,
+}
+
+def _memoized_node(name: str):
+    @profiled(name, "node")
+    def node(state: AgentState) -> AgentState:
+        return memoized(name, state, lambda: FORENSIC_DETECTIVES[name](state))
+    node.__name__ = name
+    return node
+
+def build_forensics_graph():
+    """
+    Compiles the detective half of the audit graph, without judges or the
+    Chief Justice, so collecting evidence never imports or calls an LLM client.
+    """
+    builder = StateGraph(AgentState)
+    for name in FORENSIC_DETECTIVES:
+        builder.add_node(name, _memoized_node(name))
+        builder.add_edge(START, name)
+        builder.add_edge(name, END)
+    return builder.compile()
+
+def evidence_record(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON-ready summary of one forensic run.
+    """
+    return {
+        "repo_url": state.get("repo_url"),
+        "pdf_path": state.get("pdf_path") or "",
+        "commit_sha": state.get("commit_sha", ""),
+        "evidences": {k: [resolve_evidence(e).model_dump(mode="json") for e in items] for k, items in (state.get("evidences") or {}).items()},
+        "timings": state.get("timings", []),
+    }
+
+def collect_evidence(submissions: List[Dict[str, str]], app=None, workers: int = 4) -> List[Dict[str, Any]]:
+    """
+    Runs the forensic detectives on each `{"repo_url", "pdf_path"}` submission,
+    `workers` at a time, and returns one evidence record per submission in order.
+    """
+    app = app or build_forensics_graph()
+    states = [{"repo_url": s["repo_url"], "pdf_path": s.get("pdf_path") or "", "evidences": {}} for s in submissions]
+    results = app.batch(states, config={"max_concurrency": max(1, workers)}, return_exceptions=True)
+    records = []
+    for state, result in zip(states, results):
+        if isinstance(result, Exception):
+            records.append(dict(evidence_record(state), error=f"{result.__class__.__name__}: {result}"))
+        else:
+            records.append(evidence_record(result))
+    return records
@@ -1,61 +1,265 @@
 # automation-auditor/src/graph.py
-from langgraph.graph import StateGraph, END
+from typing import Dict, List
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+from .config import get_settings
 from .state import AgentState
-from .nodes.detectives import repo_investigator_node, doc_analyst_node, vision_inspector_node
-from .nodes.judges import prosecutor_node, defense_node, techlead_node
-from .nodes.justice import chief_justice_node
+from .nodes.detectives import repo_investigator_node, doc_analyst_node, vision_inspector_node, avision_inspector_node
+from .nodes.judges import (
+    prosecutor_node, defense_node, techlead_node,
+    aprosecutor_node, adefense_node, atechlead_node,
+    judge_node, ajudge_node, default_opinions_node, JUDGE_PROMPTS
+)
+from .nodes.fast_path import has_usable_evidence
+from .nodes.justice import chief_justice_node, criterion_synthesis_node
+from .memo import amemoized, memoized
+from .profiling import profiled, span
+from .rubric import criteria_by_detective, evidence_for_criteria
 
+@profiled("start", "node")
 def start(state: AgentState) -> AgentState:
     """
-    Initial pass-through node for setup or smoke testing.
+    Initial no-op node for setup or smoke testing; writes nothing, so the
+    reducer keys of the input are not added to themselves.
     """
     print("--- Auditor Swarm Starting ---")
-    return state
+    return {}
 
+# Detectives are memoized on their inputs (repo HEAD, report hash, analyzer
+# sources); see src/memo.py.
+@profiled("repo_investigator", "node")
 def repo_investigator(state: AgentState) -> AgentState:
     print("--- Running RepoInvestigator ---")
-    return repo_investigator_node(state)
+    return memoized("repo_investigator", state, lambda: repo_investigator_node(state))
 
+@profiled("doc_analyst", "node")
 def doc_analyst(state: AgentState) -> AgentState:
     print("--- Running DocAnalyst ---")
-    return doc_analyst_node(state)
+    return memoized("doc_analyst", state, lambda: doc_analyst_node(state))
 
+@profiled("vision_inspector", "node")
 def vision_inspector(state: AgentState) -> AgentState:
-    return vision_inspector_node(state)
+    return memoized("vision_inspector", state, lambda: vision_inspector_node(state))
 
+@profiled("vision_inspector", "node")
+async def avision_inspector(state: AgentState) -> AgentState:
+    return await amemoized("vision_inspector", state, lambda: avision_inspector_node(state))
+
+@profiled("evidence_aggregator", "node")
 def evidence_aggregator(state: AgentState) -> AgentState:
     print("--- Aggregating Forensic Evidence ---")
-    return state
+    # The detectives' writes are already merged by the reducers; returning the
+    # state would add llm_usage, timings and degraded_stages to themselves
+    return {}
+
+def route_after_evidence(state: AgentState):
+    """
+    Skips the judges when no dimension has usable evidence (e.g. the clone
+    failed and no report was found); per-dimension gaps are handled by the
+    judges themselves without LLM calls.
+    """
+    evidences = state.get("evidences", {})
+    if get_settings().judge_skip_missing_evidence and not any(
+        has_usable_evidence(d.get("id", ""), evidences) for d in state.get("rubric_dimensions", [])
+    ):
+        return "default_opinions"
+    return ["prosecutor", "defense", "tech_lead"]
+
+@profiled("default_opinions", "node")
+def default_opinions(state: AgentState) -> AgentState:
+    return default_opinions_node(state)
 
+@profiled("prosecutor", "node")
 def prosecutor(state: AgentState) -> AgentState:
     return prosecutor_node(state)
 
+@profiled("defense", "node")
 def defense(state: AgentState) -> AgentState:
     return defense_node(state)
 
+@profiled("tech_lead", "node")
 def tech_lead(state: AgentState) -> AgentState:
     return techlead_node(state)
 
+@profiled("prosecutor", "node")
+async def aprosecutor(state: AgentState) -> AgentState:
+    return await aprosecutor_node(state)
+
+@profiled("defense", "node")
+async def adefense(state: AgentState) -> AgentState:
+    return await adefense_node(state)
+
+@profiled("tech_lead", "node")
+async def atech_lead(state: AgentState) -> AgentState:
+    return await atechlead_node(state)
+
+def _dual(func, afunc) -> RunnableLambda:
+    """
+    Wraps a node so `app.invoke` uses the sync body and `app.ainvoke` awaits the async one.
+    """
+    return RunnableLambda(func, afunc=afunc, name=func.__name__)
+
+@profiled("chief_justice", "node")
 def chief_justice(state: AgentState) -> AgentState:
     return chief_justice_node(state)
 
-def build_graph():
+# --- Pipelined topology -------------------------------------------------
+# Each detective runs in its own lane subgraph: as soon as the detective
+# returns, judge tasks for the criteria that only need its evidence are
+# dispatched with `Send`, and those criteria are synthesized when their
+# opinions are in. LangGraph synchronizes parallel nodes at every
+# super-step, so the lanes are separate subgraphs: inside a lane the
+# barrier only spans that lane's own judges.
+
+def judge_task(task: Dict) -> AgentState:
+    with span(f"judge.{task['persona']}", "node"):
+        return judge_node(task, task["persona"], JUDGE_PROMPTS[task["persona"]])
+
+async def ajudge_task(task: Dict) -> AgentState:
+    with span(f"judge.{task['persona']}", "node"):
+        return await ajudge_node(task, task["persona"], JUDGE_PROMPTS[task["persona"]])
+
+@profiled("synthesize", "node")
+def criterion_synthesis(state: AgentState) -> AgentState:
+    return criterion_synthesis_node(state)
+
+def _judge_sends(dimensions: List[Dict], evidences: Dict) -> List[Send]:
+    """
+    One judge task per persona and criterion shard (`judge_shard_size`),
+    each carrying only the evidence its criteria need.
+    """
+    shard_size = get_settings().judge_shard_size
+    if shard_size <= 0:
+        shard_size = max(len(dimensions), 1)
+    shards = [dimensions[i:i + shard_size] for i in range(0, len(dimensions), shard_size)]
+    return [
+        Send("judge", {
+            "persona": persona,
+            "rubric_dimensions": shard,
+            "evidences": evidence_for_criteria([d["id"] for d in shard if "id" in d], evidences),
+        })
+        for shard in shards
+        for persona in JUDGE_PROMPTS
+    ]
+
+def dispatch_judges(state: AgentState) -> List[Send]:
+    return _judge_sends(state.get("rubric_dimensions", []), state.get("evidences", {}))
+
+def dispatch_remaining_judges(state: AgentState):
+    """
+    After every lane: judges the criteria that need several detectives, or
+    goes straight to the Chief Justice when there are none.
+    """
+    remaining = criteria_by_detective(state.get("rubric_dimensions", []))[""]
+    if not remaining:
+        return "chief_justice"
+    return _judge_sends(remaining, state.get("evidences", {}))
+
+@profiled("lanes_joined", "node")
+def lanes_joined(state: AgentState) -> AgentState:
+    print("--- All detective lanes finished ---")
+    return {}
+
+LANE_DETECTIVES = {
+    "repo_investigator": repo_investigator,
+    "doc_analyst": doc_analyst,
+    "vision_inspector": _dual(vision_inspector, avision_inspector),
+}
+# Keys a lane hands back to the parent graph
+LANE_OUTPUT_KEYS = ("evidences", "opinions", "criterion_results", "llm_usage", "timings", "degraded_stages", "commit_sha")
+
+def build_lane(detective: str):
+    """
+    Compiles the lane subgraph: detective -> Send judge tasks -> criterion synthesis.
+    """
+    builder = StateGraph(AgentState)
+    builder.add_node(detective, LANE_DETECTIVES[detective])
+    builder.add_node("judge", _dual(judge_task, ajudge_task))
+    builder.add_node("synthesize", criterion_synthesis)
+    builder.add_edge(START, detective)
+    builder.add_conditional_edges(detective, dispatch_judges, ["judge"])
+    builder.add_edge("judge", "synthesize")
+    builder.add_edge("synthesize", END)
+    return builder.compile()
+
+def _lane_node(detective: str) -> RunnableLambda:
+    """
+    Wraps a lane so the parent receives only what the lane produced; the
+    lane starts from empty reducer keys and only sees its own criteria.
+    """
+    lane = build_lane(detective)
+
+    def lane_input(state: AgentState) -> AgentState:
+        dimensions = criteria_by_detective(state.get("rubric_dimensions", []))[detective]
+        return {**state, "rubric_dimensions": dimensions, "evidences": {}, "opinions": [], "criterion_results": [], "llm_usage": [], "timings": [], "degraded_stages": []}
+
+    def delta(inputs: AgentState, result: AgentState) -> AgentState:
+        return {k: result[k] for k in LANE_OUTPUT_KEYS if result.get(k) and result[k] != inputs.get(k)}
+
+    @profiled(f"{detective}_lane", "lane")
+    def run_lane(state: AgentState) -> AgentState:
+        inputs = lane_input(state)
+        return delta(inputs, lane.invoke(inputs))
+
+    @profiled(f"{detective}_lane", "lane")
+    async def arun_lane(state: AgentState) -> AgentState:
+        inputs = lane_input(state)
+        return delta(inputs, await lane.ainvoke(inputs))
+
+    return RunnableLambda(run_lane, afunc=arun_lane, name=f"{detective}_lane")
+
+def build_pipelined_graph(checkpointer=None):
+    """
+    Criterion-granular variant of `build_graph`: judges start per lane as
+    soon as a detective's evidence is ready instead of after the slowest
+    detective, and criteria needing several detectives are judged after all lanes.
+    """
+    builder = StateGraph(AgentState)
+    builder.add_node("start", start)
+    for detective in LANE_DETECTIVES:
+        builder.add_node(f"{detective}_lane", _lane_node(detective))
+        builder.add_edge("start", f"{detective}_lane")
+        builder.add_edge(f"{detective}_lane", "lanes_joined")
+    builder.add_node("lanes_joined", lanes_joined)
+    builder.add_node("judge", _dual(judge_task, ajudge_task))
+    builder.add_node("synthesize", criterion_synthesis)
+    builder.add_node("chief_justice", chief_justice)
+
+    builder.set_entry_point("start")
+    builder.add_conditional_edges("lanes_joined", dispatch_remaining_judges, ["judge", "chief_justice"])
+    builder.add_edge("judge", "synthesize")
+    builder.add_edge("synthesize", "chief_justice")
+    builder.add_edge("chief_justice", END)
+    return builder.compile(checkpointer=checkpointer)
+
+def build_graph(checkpointer=None, pipelined=None):
     """
     Builds and compiles the Automaton Auditor LangGraph with parallel detective and judge orchestration.
+
+    With a `checkpointer` every completed super-step is persisted, so a failed
+    or interrupted audit can resume (see `src.checkpoint`). `pipelined`
+    (default `AUDITOR_GRAPH_PIPELINED`) selects `build_pipelined_graph`.
     """
+    if pipelined is None:
+        pipelined = get_settings().graph_pipelined
+    if pipelined:
+        return build_pipelined_graph(checkpointer)
+
     builder = StateGraph(AgentState)
     
     # Add nodes
     builder.add_node("start", start)
     builder.add_node("repo_investigator", repo_investigator)
     builder.add_node("doc_analyst", doc_analyst)
-    builder.add_node("vision_inspector", vision_inspector)
+    builder.add_node("vision_inspector", _dual(vision_inspector, avision_inspector))
     builder.add_node("evidence_aggregator", evidence_aggregator)
     
-    builder.add_node("prosecutor", prosecutor)
-    builder.add_node("defense", defense)
-    builder.add_node("tech_lead", tech_lead)
+    builder.add_node("prosecutor", _dual(prosecutor, aprosecutor))
+    builder.add_node("defense", _dual(defense, adefense))
+    builder.add_node("tech_lead", _dual(tech_lead, atech_lead))
     
+    builder.add_node("default_opinions", default_opinions)
     builder.add_node("chief_justice", chief_justice)
     
     builder.set_entry_point("start")
@@ -70,20 +274,19 @@ def build_graph():
     builder.add_edge("doc_analyst", "evidence_aggregator")
     builder.add_edge("vision_inspector", "evidence_aggregator")
     
-    # Parallel Judges
-    builder.add_edge("evidence_aggregator", "prosecutor")
-    builder.add_edge("evidence_aggregator", "defense")
-    builder.add_edge("evidence_aggregator", "tech_lead")
+    # Parallel Judges, or deterministic defaults when every input failed
+    builder.add_conditional_edges("evidence_aggregator", route_after_evidence, ["prosecutor", "defense", "tech_lead", "default_opinions"])
     
     # Fan-in Judges to Chief Justice
     builder.add_edge("prosecutor", "chief_justice")
     builder.add_edge("defense", "chief_justice")
     builder.add_edge("tech_lead", "chief_justice")
+    builder.add_edge("default_opinions", "chief_justice")
     
     # End
     builder.add_edge("chief_justice", END)
     
     # Compile the graph
-    app = builder.compile()
+    app = builder.compile(checkpointer=checkpointer)
     
     return app
@@ -0,0 +1,188 @@
+# automation-auditor/src/job_queue.py
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .fingerprint import audit_fingerprint, file_hash, remote_head
+from .runner import ManifestEntry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    fingerprint TEXT NOT NULL UNIQUE,
+    repo_url TEXT NOT NULL,
+    commit_sha TEXT,
+    pdf_path TEXT,
+    report_hash TEXT,
+    rubric TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    enqueued_at REAL NOT NULL,
+    finished_at REAL,
+    result_path TEXT,
+    overall_score REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, lease_expires);
+"""
+
+class Job(BaseModel):
+    """A leased audit job."""
+    job_id: int
+    fingerprint: str
+    repo_url: str
+    commit_sha: str = ""
+    pdf_path: str = ""
+    rubric: str
+    attempts: int
+
+class JobQueue:
+    """
+    Durable audit queue in an SQLite file.
+
+    Workers in any number of processes lease jobs for a limited time and
+    heartbeat to keep them; a job whose lease expires is handed to the next
+    worker until `max_attempts` is used up. Every operation is a short
+    `BEGIN IMMEDIATE` transaction, so the file can be shared by processes
+    on one host or on several hosts through a filesystem with working
+    POSIX locks.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Shared with the worker's heartbeat thread; `_lock` serializes use
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _transaction(self):
+        return _Immediate(self._conn, self._lock)
+
+    def enqueue(self, entry: ManifestEntry, commit_sha: Optional[str] = None) -> Tuple[int, bool]:
+        """
+        Adds a job unless an identical (repo, commit, report hash, rubric) job exists.
+
+        The commit is resolved with `git ls-remote` when not given. Returns
+        `(job_id, created)`.
+        """
+        commit_sha = remote_head(entry.repo_url) if commit_sha is None else commit_sha
+        report_hash = file_hash(entry.pdf_path)
+        fingerprint = audit_fingerprint(entry.repo_url, commit_sha, report_hash, file_hash(entry.rubric))
+        with self._transaction():
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO jobs (fingerprint, repo_url, commit_sha, pdf_path, report_hash, rubric, max_attempts, enqueued_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (fingerprint, entry.repo_url, commit_sha, entry.pdf_path, report_hash, entry.rubric, self.max_attempts, time.time()),
+            )
+            created = cursor.rowcount == 1
+            job_id = self._conn.execute("SELECT job_id FROM jobs WHERE fingerprint = ?", (fingerprint,)).fetchone()["job_id"]
+        return job_id, created
+
+    def lease(self, worker_id: str, lease_s: float) -> Optional[Job]:
+        """
+        Claims the oldest pending job, or one whose lease has expired.
+        """
+        now = time.time()
+        with self._transaction():
+            # Expired leases with no attempts left will never be retried
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY job_id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 WHERE job_id = ?",
+                (worker_id, now + lease_s, row["job_id"]),
+            )
+        return Job(job_id=row["job_id"], fingerprint=row["fingerprint"], repo_url=row["repo_url"], commit_sha=row["commit_sha"] or "",
+                   pdf_path=row["pdf_path"] or "", rubric=row["rubric"], attempts=row["attempts"] + 1)
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_s: float) -> bool:
+        """
+        Extends the lease; False means the lease was lost to another worker.
+        """
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + lease_s, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result_path: str, overall_score: Optional[float]) -> bool:
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, result_path = ?, overall_score = ?, error = NULL "
+                "WHERE job_id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time(), result_path, overall_score, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """
+        Records a failed attempt; the job is retried until `max_attempts` is reached.
+        """
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+                "finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END, "
+                "lease_owner = NULL, lease_expires = NULL, error = ? "
+                "WHERE job_id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time(), error, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+class _Immediate:
+    """Context manager for a `BEGIN IMMEDIATE` write transaction."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+        return False
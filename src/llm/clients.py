@@ -0,0 +1,294 @@
+# automation-auditor/src/llm/clients.py
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Hashable, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from ..config import get_settings
+from ..deadline import DeadlineExceeded, stage_budget
+from ..profiling import span
+from .rate_limit import call_with_backoff, acall_with_backoff, get_concurrency_cap, get_rate_limiter
+from .hedging import hedged_call, hedged_call_sync
+from .transport import get_transport
+from .metrics import build_usage_record
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+# Gemini bills roughly this many input tokens per attached image.
+IMAGE_TOKENS = 258
+# Headroom reserved against the TPM budget for the model's reply.
+DEFAULT_OUTPUT_TOKENS = 2048
+
+# Process-wide pool of chat clients keyed by model and settings. Each
+# ChatGoogleGenerativeAI owns its own HTTP client, so sharing instances lets
+# the three judges, the vision inspector and concurrent audits reuse
+# keep-alive connections instead of repeating the handshake per call.
+_pool: Dict[Tuple[Hashable, ...], Any] = {}
+_pool_lock = threading.Lock()
+
+def _chat_model_class():
+    """
+    Imports the Gemini client on first real use. It pulls in google-genai,
+    which dominates import time, and offline runs never need it.
+    """
+    cls = globals().get("ChatGoogleGenerativeAI")
+    if cls is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI as cls
+        globals()["ChatGoogleGenerativeAI"] = cls
+    return cls
+
+def __getattr__(name: str) -> Any:
+    if name == "ChatGoogleGenerativeAI":
+        return _chat_model_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _pool_key(kind: str, model: str, temperature: float, extra: Dict[str, Any]) -> Tuple[Hashable, ...]:
+    return (kind, model, float(temperature)) + tuple(sorted(extra.items()))
+
+def get_llm(model: str = DEFAULT_MODEL, temperature: float = 0.2, **kwargs) -> "ChatGoogleGenerativeAI":
+    """
+    Returns a pooled chat client for the given model and settings.
+
+    Extra keyword arguments are forwarded to ChatGoogleGenerativeAI and become
+    part of the pool key, so they must be hashable. SDK-level retries are
+    disabled by default because `invoke_llm` owns retry and backoff.
+    """
+    kwargs.setdefault("max_retries", 1)
+    key = _pool_key("chat", model, temperature, kwargs)
+    with _pool_lock:
+        llm = _pool.get(key)
+        if llm is None:
+            llm = _chat_model_class()(model=model, temperature=temperature, **kwargs)
+            _pool[key] = llm
+    return llm
+
+def get_structured_llm(schema: Type[BaseModel], model: str = DEFAULT_MODEL, temperature: float = 0.2,
+                       include_raw: bool = False, **kwargs):
+    """
+    Returns a pooled structured-output runnable bound to `schema`.
+
+    The runnable wraps the pooled chat client from `get_llm`, so every
+    structured variant shares the same underlying connection.
+    """
+    kwargs.setdefault("max_retries", 1)
+    key = _pool_key("structured", model, temperature, dict(kwargs, schema=schema, include_raw=include_raw))
+    with _pool_lock:
+        runnable = _pool.get(key)
+    if runnable is not None:
+        return runnable
+
+    runnable = get_llm(model, temperature, **kwargs).with_structured_output(schema, include_raw=include_raw)
+    with _pool_lock:
+        return _pool.setdefault(key, runnable)
+
+def clear_pool() -> None:
+    """
+    Drops every pooled client. Intended for tests and for re-configuring credentials.
+    """
+    with _pool_lock:
+        _pool.clear()
+
+@contextmanager
+def _concurrency_slot(timeout: Optional[float], what: str) -> Iterator[None]:
+    """
+    Holds one slot of the process-wide LLM concurrency cap for a blocking call.
+    """
+    cap = get_concurrency_cap()
+    if not cap.acquire(timeout):
+        raise DeadlineExceeded(f"{what} waited {timeout:.1f}s for a concurrency slot")
+    try:
+        yield
+    finally:
+        cap.release()
+
+@asynccontextmanager
+async def _aconcurrency_slot() -> AsyncIterator[None]:
+    cap = get_concurrency_cap()
+    await cap.aacquire()
+    try:
+        yield
+    finally:
+        cap.release()
+
+def _time_left(deadline: Optional[float], timeout: Optional[float], what: str) -> Optional[float]:
+    """
+    Seconds left before `deadline` (None without one); raises DeadlineExceeded once it has passed.
+    """
+    if deadline is None:
+        return None
+    left = deadline - time.perf_counter()
+    if left <= 0:
+        raise DeadlineExceeded(f"{what} exceeded its {timeout:.1f}s budget")
+    return left
+
+def estimate_tokens(messages: list, output_tokens: int = DEFAULT_OUTPUT_TOKENS) -> int:
+    """
+    Cheap token estimate (~4 characters per token) used to debit the TPM bucket before a call.
+    """
+    chars = 0
+    images = 0
+    for message in messages:
+        content = message[1] if isinstance(message, tuple) else getattr(message, "content", message)
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for part in content:
+            if isinstance(part, dict) and part.get("type") == "image_url":
+                images += 1
+            elif isinstance(part, dict):
+                chars += len(str(part.get("text", "")))
+            else:
+                chars += len(str(part))
+    return chars // 4 + images * IMAGE_TOKENS + output_tokens
+
+class LLMCall:
+    """
+    Describes one model call: which pooled runnable serves it and what it is for.
+
+    The runnable is only built when a transport actually needs it, so offline
+    transports (replay, fake) never construct a Gemini client or need an API key.
+    `tags` carry call context such as node, persona and criteria. After
+    `invoke_llm`/`ainvoke_llm` returns (or raises), `usage` holds the call's
+    instrumentation record.
+    """
+
+    def __init__(self, call_type: str, schema: Optional[Type[BaseModel]] = None, temperature: float = 0.2,
+                 include_raw: bool = False, model: str = DEFAULT_MODEL, tags: Optional[Dict[str, Any]] = None):
+        self.call_type = call_type
+        self.schema = schema
+        self.temperature = temperature
+        self.include_raw = include_raw
+        self.model = model
+        self.tags = tags or {}
+        self.usage: Optional[Dict[str, Any]] = None
+
+    def runnable(self, timeout: Optional[float] = None):
+        """
+        The pooled runnable, or with a `timeout` (seconds) a copy of the pooled
+        client that enforces it as the request timeout. The copy shares the
+        pooled client's connections.
+        """
+        if timeout is None:
+            if self.schema is not None:
+                return get_structured_llm(self.schema, self.model, self.temperature, include_raw=self.include_raw)
+            return get_llm(self.model, self.temperature)
+        llm = get_llm(self.model, self.temperature).model_copy(update={"timeout": timeout})
+        if self.schema is not None:
+            return llm.with_structured_output(self.schema, include_raw=self.include_raw)
+        return llm
+
+    def request_key(self, messages: list) -> str:
+        """
+        Stable fingerprint of the call settings and message payload, used as the cassette key.
+        """
+        payload = {
+            "call_type": self.call_type,
+            "model": self.model,
+            "temperature": self.temperature,
+            "schema": self.schema.__name__ if self.schema is not None else None,
+            "include_raw": self.include_raw,
+            "messages": _serialize_messages(messages),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _serialize_messages(messages: list) -> List[List[Any]]:
+    serialized = []
+    for message in messages:
+        if isinstance(message, tuple):
+            serialized.append([message[0], message[1]])
+        else:
+            serialized.append([getattr(message, "type", "unknown"), getattr(message, "content", str(message))])
+    return serialized
+
+def _transport_name(transport) -> str:
+    # The transport itself may be what failed to build
+    return transport.name if transport is not None else get_settings().llm_transport
+
+def invoke_llm(call: LLMCall, messages: list):
+    """
+    Sends `messages` through the active transport, the process-wide
+    concurrency cap, the shared rate limiter and backoff on 429/5xx,
+    recording usage on `call.usage`. Raises
+    DeadlineExceeded when the call outlives AUDITOR_LLM_CALL_TIMEOUT_S or
+    the audit deadline; the slot wait, the limiter queue, backoff and the
+    request itself all draw on that one budget. `call.usage` is set even
+    when the call fails before reaching the transport.
+    """
+    transport = None
+    tokens = 0
+    stats: Dict[str, float] = {}
+    started = time.perf_counter()
+    try:
+        transport = get_transport()
+        tokens = estimate_tokens(messages)
+        what = f"{call.call_type} call"
+        timeout = stage_budget(get_settings().llm_call_timeout_s, what)
+        deadline = time.perf_counter() + timeout if timeout is not None else None
+
+        def attempt():
+            # Each backoff attempt may be hedged. A blocking request cannot be
+            # cancelled, so each request gets what is left of the budget as its timeout.
+            return hedged_call_sync(
+                call.call_type,
+                lambda: transport.invoke(call, messages, timeout=_time_left(deadline, timeout, what)),
+                may_send=lambda: get_rate_limiter().try_acquire(tokens),
+                stats=stats,
+            )
+
+        try:
+            with span(f"llm.{call.call_type}", "llm"), _concurrency_slot(_time_left(deadline, timeout, what), what):
+                result = call_with_backoff(attempt, tokens=tokens, stats=stats, deadline=deadline)
+        except Exception as e:
+            # Provider timeout exceptions vary; past the deadline any failure is the budget running out
+            if deadline is not None and time.perf_counter() >= deadline and not isinstance(e, DeadlineExceeded):
+                raise DeadlineExceeded(f"{what} exceeded its {timeout:.1f}s budget") from e
+            raise
+    except Exception as e:
+        call.usage = build_usage_record(call, None, tokens, time.perf_counter() - started, stats, _transport_name(transport), error=e)
+        raise
+    call.usage = build_usage_record(call, result, tokens, time.perf_counter() - started, stats, transport.name)
+    return result
+
+async def ainvoke_llm(call: LLMCall, messages: list):
+    """
+    Async variant of `invoke_llm`. At most `llm_max_concurrency` calls are
+    in flight per process; the rest wait here without holding threads.
+    Waiting for a slot counts against the call's time budget; on expiry the
+    call is cancelled.
+    """
+    transport = None
+    tokens = 0
+    stats: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    def attempt():
+        # Each backoff attempt may be hedged with a duplicate request.
+        return hedged_call(
+            call.call_type,
+            lambda: transport.ainvoke(call, messages),
+            may_send=lambda: get_rate_limiter().try_acquire(tokens),
+            stats=stats,
+        )
+
+    async def bounded():
+        async with _aconcurrency_slot():
+            return await acall_with_backoff(attempt, tokens=tokens, stats=stats)
+
+    try:
+        transport = get_transport()
+        tokens = estimate_tokens(messages)
+        timeout = stage_budget(get_settings().llm_call_timeout_s, f"{call.call_type} call")
+        try:
+            with span(f"llm.{call.call_type}", "llm"):
+                result = await asyncio.wait_for(bounded(), timeout)
+        except TimeoutError as e:
+            raise DeadlineExceeded(f"{call.call_type} call exceeded its {timeout:.1f}s budget") from e
+    except Exception as e:
+        call.usage = build_usage_record(call, None, tokens, time.perf_counter() - started, stats, _transport_name(transport), error=e)
+        raise
+    call.usage = build_usage_record(call, result, tokens, time.perf_counter() - started, stats, transport.name)
+    return result
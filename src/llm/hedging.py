@@ -0,0 +1,198 @@
+# automation-auditor/src/llm/hedging.py
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from ..config import get_settings
+
+class LatencyTracker:
+    """
+    Rolling per-call-type latency histogram (most recent `window` samples).
+    """
+
+    def __init__(self, window: int = 256):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, call_type: str, latency_s: float) -> None:
+        with self._lock:
+            self._samples.setdefault(call_type, deque(maxlen=self.window)).append(latency_s)
+
+    def count(self, call_type: str) -> int:
+        with self._lock:
+            return len(self._samples.get(call_type, ()))
+
+    def quantile(self, call_type: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(call_type, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+class HedgeBudget:
+    """
+    Caps duplicate requests to a fraction of primary calls.
+    """
+
+    def __init__(self, ratio: float):
+        self.ratio = ratio
+        self.calls = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.ratio * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def refund(self) -> None:
+        """
+        Returns a hedge taken by `try_spend` that was never sent.
+        """
+        with self._lock:
+            self.hedges = max(0, self.hedges - 1)
+
+_tracker = LatencyTracker()
+_budget: Optional[HedgeBudget] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_budget_lock = threading.Lock()
+
+def get_latency_tracker() -> LatencyTracker:
+    return _tracker
+
+def get_hedge_budget() -> HedgeBudget:
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = HedgeBudget(get_settings().llm_hedge_budget)
+        return _budget
+
+def reset_hedging() -> None:
+    global _tracker, _budget
+    with _budget_lock:
+        _tracker = LatencyTracker()
+        _budget = None
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    """
+    Worker threads for hedged blocking calls, created on first use.
+    """
+    global _executor
+    with _budget_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=2 * max(1, get_settings().llm_max_concurrency),
+                                           thread_name_prefix="llm-hedge")
+        return _executor
+
+def _hedge_threshold(call_type: str) -> Optional[float]:
+    """
+    Latency after which a pending `call_type` call is hedged, or None when hedging is off or unwarmed.
+    """
+    settings = get_settings()
+    tracker = get_latency_tracker()
+    if settings.llm_hedge_enabled and tracker.count(call_type) >= settings.llm_hedge_min_samples:
+        return tracker.quantile(call_type, settings.llm_hedge_percentile)
+    return None
+
+def hedged_call_sync(call_type: str, make_call: Callable[[], Any],
+                     may_send: Callable[[], bool] = lambda: True,
+                     stats: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Blocking variant of `hedged_call`.
+
+    Until a hedge threshold exists the call runs in the caller's thread.
+    After that the primary and any duplicate run on worker threads, each in
+    a copy of the caller's context so audit deadlines and spans still apply,
+    and the first answer wins. A blocking request cannot be cancelled: the
+    loser runs on until its own request timeout and its answer is dropped.
+    """
+    tracker = get_latency_tracker()
+    budget = get_hedge_budget()
+    budget.record_call()
+    started = time.perf_counter()
+
+    threshold = _hedge_threshold(call_type)
+    if threshold is None:
+        result = make_call()
+        tracker.observe(call_type, time.perf_counter() - started)
+        return result
+
+    executor = _hedge_executor()
+    pending = {executor.submit(contextvars.copy_context().run, make_call)}
+    done, _ = wait(pending, timeout=threshold)
+    if not done and budget.try_spend():
+        if may_send():
+            pending.add(executor.submit(contextvars.copy_context().run, make_call))
+            if stats is not None:
+                stats["hedged"] = True
+        else:
+            # Refused by the rate limiter: the hedge was never sent
+            budget.refund()
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        errors = [f.exception() for f in done]
+        winner = next((f for f, error in zip(done, errors) if error is None), None)
+        if winner is not None:
+            tracker.observe(call_type, time.perf_counter() - started)
+            return winner.result()
+        if not pending:
+            raise errors[0]
+
+async def hedged_call(call_type: str, make_call: Callable[[], Awaitable[Any]],
+                      may_send: Callable[[], bool] = lambda: True,
+                      stats: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Awaits `make_call()`; if it has not returned within the configured
+    percentile of recent latency for `call_type`, a duplicate is sent and
+    whichever answer arrives first is used.
+
+    Duplicates are only sent when hedging is enabled, enough latency samples
+    exist, the hedge budget allows it and `may_send()` (the rate limiter)
+    agrees. The losing request is cancelled.
+    """
+    tracker = get_latency_tracker()
+    budget = get_hedge_budget()
+    budget.record_call()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    threshold = _hedge_threshold(call_type)
+
+    primary = asyncio.ensure_future(make_call())
+    tasks = {primary}
+    try:
+        if threshold is not None:
+            done, _ = await asyncio.wait(tasks, timeout=threshold)
+            if not done and budget.try_spend():
+                if may_send():
+                    tasks.add(asyncio.ensure_future(make_call()))
+                    if stats is not None:
+                        stats["hedged"] = True
+                else:
+                    # Refused by the rate limiter: the hedge was never sent
+                    budget.refund()
+
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            errors = [t.exception() for t in done]
+            winner = next((t for t, error in zip(done, errors) if error is None), None)
+            if winner is not None:
+                tracker.observe(call_type, loop.time() - started)
+                return winner.result()
+            if not tasks:
+                raise errors[0]
+    finally:
+        for task in tasks:
+            task.cancel()
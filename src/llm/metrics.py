@@ -0,0 +1,125 @@
+# automation-auditor/src/llm/metrics.py
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from ..deadline import is_timeout
+
+# USD per 1M tokens (input, output). Unknown models are costed at zero.
+MODEL_PRICING = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+_write_lock = threading.Lock()
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+def _usage_metadata(result: Any) -> Optional[Dict[str, int]]:
+    message = result.get("raw") if isinstance(result, dict) else result
+    usage = getattr(message, "usage_metadata", None)
+    if usage and usage.get("input_tokens") is not None:
+        return usage
+    return None
+
+def build_usage_record(call, result: Any, prompt_estimate: int, total_s: float, stats: Dict[str, float],
+                       transport: str, error: Optional[BaseException] = None) -> Dict[str, Any]:
+    """
+    One instrumentation record for a model call.
+
+    Token counts come from the provider's usage metadata when the response
+    carries it, otherwise from the pre-call estimate (`tokens_estimated`).
+    Calls are not streamed, so the first token arrives with the full
+    response and `ttft_s` equals the final attempt's latency.
+    """
+    usage = _usage_metadata(result) if result is not None else None
+    if usage:
+        prompt_tokens = int(usage.get("input_tokens", 0))
+        completion_tokens = int(usage.get("output_tokens", 0))
+    else:
+        prompt_tokens = prompt_estimate
+        completion_tokens = 0
+    attempts = int(stats.get("attempts", 1 if error is None else 0))
+    latency_s = float(stats.get("last_attempt_s", total_s))
+    return {
+        "ts": time.time(),
+        "call_type": call.call_type,
+        "node": call.tags.get("node"),
+        "persona": call.tags.get("persona"),
+        "criteria": list(call.tags.get("criteria", [])),
+        "model": call.model,
+        "transport": transport,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "tokens_estimated": usage is None,
+        "ttft_s": latency_s,
+        "latency_s": latency_s,
+        "total_s": total_s,
+        "queue_wait_s": float(stats.get("queue_wait_s", 0.0)),
+        "retries": max(0, attempts - 1),
+        "hedged": bool(stats.get("hedged", False)),
+        "validation_failures": 0,
+        "cost_usd": estimate_cost(call.model, prompt_tokens, completion_tokens),
+        "error": f"{error.__class__.__name__}: {error}" if error is not None else None,
+        "timed_out": is_timeout(error),
+    }
+
+def export_jsonl(records: List[Dict[str, Any]], path: str, audit: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Appends usage records to a JSONL file, tagging each with the audit context.
+    """
+    if not records:
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    lines = [json.dumps(dict(record, **(audit or {})), default=str) for record in records]
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def summarize_usage(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregates usage records per node/persona.
+    """
+    groups: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for record in records:
+        label = record.get("persona") or record.get("node") or record.get("call_type")
+        group = groups[label]
+        group["calls"] += 1
+        group["prompt_tokens"] += record.get("prompt_tokens", 0)
+        group["completion_tokens"] += record.get("completion_tokens", 0)
+        group["latency_s"] += record.get("latency_s", 0.0)
+        group["max_latency_s"] = max(group["max_latency_s"], record.get("latency_s", 0.0))
+        group["retries"] += record.get("retries", 0)
+        group["validation_failures"] += record.get("validation_failures", 0)
+        group["cost_usd"] += record.get("cost_usd", 0.0)
+    return {label: dict(values) for label, values in groups.items()}
+
+def render_usage_markdown(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Markdown lines for the report's LLM usage section.
+    """
+    if not records:
+        return []
+    lines = [
+        "\n## LLM Usage",
+        "| Source | Calls | Prompt Tokens | Completion Tokens | Total Latency (s) | Max Latency (s) | Retries | Validation Failures | Est. Cost (USD) |",
+        "| :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- | :--- |",
+    ]
+    summary = summarize_usage(records)
+    for label in sorted(summary):
+        g = summary[label]
+        lines.append(
+            f"| {label} | {int(g['calls'])} | {int(g['prompt_tokens'])} | {int(g['completion_tokens'])} | "
+            f"{g['latency_s']:.2f} | {g['max_latency_s']:.2f} | {int(g['retries'])} | {int(g['validation_failures'])} | {g['cost_usd']:.4f} |"
+        )
+    total_cost = sum(g["cost_usd"] for g in summary.values())
+    if any(r.get("tokens_estimated") for r in records):
+        lines.append("\n_Token counts marked as estimated where the provider returned no usage metadata._")
+    lines.append(f"\n**Estimated LLM cost for this audit:** ${total_cost:.4f}")
+    return lines
@@ -0,0 +1,356 @@
+# automation-auditor/src/llm/rate_limit.py
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..config import get_settings
+from ..deadline import DeadlineExceeded
+
+class TokenBucket:
+    """
+    Thread-safe token bucket using reservations: a caller that finds the
+    bucket short still debits it and is told how long to wait, so waiters
+    are served in arrival order instead of racing each other on refill.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self._level = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Debits `amount` tokens and returns the seconds to wait before using them.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.refill_per_second)
+            self._updated = now
+            self._level -= amount
+            if self._level >= 0:
+                return 0.0
+            return -self._level / self.refill_per_second
+
+    def try_reserve(self, amount: float = 1.0) -> bool:
+        """
+        Debits `amount` tokens only if they are available right now.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * self.refill_per_second)
+            self._updated = now
+            if self._level < amount:
+                return False
+            self._level -= amount
+            return True
+
+    def refund(self, amount: float = 1.0) -> None:
+        """
+        Returns `amount` tokens taken by a reservation that was not used.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._level = min(self.capacity, self._level + amount)
+
+class RateLimiter:
+    """
+    Combined requests-per-minute and tokens-per-minute limiter shared by every LLM call site.
+    """
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm, rpm / 60.0)
+        self.tokens = TokenBucket(tpm, tpm / 60.0)
+        # Running totals plus a bounded window for percentiles, so a resident
+        # process does not grow this without limit.
+        self._count = 0
+        self._queued = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recent_waits = deque(maxlen=4096)
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int, max_wait: Optional[float] = None) -> float:
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if max_wait is not None and wait > max_wait:
+            # Hand the reservation back so callers behind us are not held up by a request never sent
+            self._refund(tokens)
+            raise DeadlineExceeded(f"Rate limiter queue wait of {wait:.1f}s exceeds the {max(max_wait, 0.0):.1f}s left")
+        with self._lock:
+            self._count += 1
+            self._queued += 1 if wait > 0 else 0
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._recent_waits.append(wait)
+        return wait
+
+    def _refund(self, tokens: int) -> None:
+        self.requests.refund(1)
+        self.tokens.refund(tokens)
+
+    def try_acquire(self, tokens: int = 0) -> bool:
+        """
+        Admits an optional extra request (e.g. a hedge) only if it needs no queueing.
+        """
+        if not self.requests.try_reserve(1):
+            return False
+        if not self.tokens.try_reserve(tokens):
+            # Hand the request slot back; the token bucket is the binding limit.
+            self.requests.refund(1)
+            return False
+        return True
+
+    def acquire(self, tokens: int = 0, max_wait: Optional[float] = None) -> float:
+        """
+        Blocks until a request carrying `tokens` may be sent. Returns the queue wait in seconds.
+
+        With `max_wait` a reservation that would queue longer is refunded
+        and DeadlineExceeded is raised instead of sleeping.
+        """
+        wait = self._reserve(tokens, max_wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """
+        Async variant of `acquire` that yields to the event loop while queued.
+        A caller cancelled while queued refunds its reservation.
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._refund(tokens)
+                raise
+        return wait
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Snapshot of queue-wait statistics since the limiter was created.
+        """
+        with self._lock:
+            count, queued, total, max_wait = self._count, self._queued, self._total_wait, self._max_wait
+            recent = sorted(self._recent_waits)
+        return {
+            "requests": count,
+            "queued": queued,
+            "total_wait_s": total,
+            "mean_wait_s": total / count if count else 0.0,
+            "p95_wait_s": recent[min(len(recent) - 1, int(0.95 * len(recent)))] if recent else 0.0,
+            "max_wait_s": max_wait,
+        }
+
+class ConcurrencyCap:
+    """
+    Process-wide cap on in-flight LLM calls (`llm_max_concurrency`), shared by
+    blocking callers on any thread and async callers on any event loop.
+    Waiters are admitted in arrival order; a released slot is handed
+    straight to the next waiter.
+    """
+
+    def __init__(self):
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _limit() -> int:
+        return max(1, get_settings().llm_max_concurrency)
+
+    def _try_take(self) -> bool:
+        # Call with `_lock` held
+        if self._in_flight < self._limit() and not self._waiters:
+            self._in_flight += 1
+            return True
+        return False
+
+    def _grant(self, future: "asyncio.Future") -> None:
+        # Runs on the waiter's loop; a waiter cancelled meanwhile passes the slot on
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until a slot is free. Returns False if `timeout` expires first.
+        """
+        with self._lock:
+            if self._try_take():
+                return True
+            event = threading.Event()
+            self._waiters.append(event)
+        if event.wait(timeout):
+            return True
+        with self._lock:
+            if event.is_set():
+                return True
+            self._waiters.remove(event)
+            return False
+
+    async def aacquire(self) -> None:
+        """
+        Async variant of `acquire`; waits without holding a thread.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_take():
+                return
+            future = loop.create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                    raise
+            # The slot was handed over just as we were cancelled
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            while self._waiters and self._in_flight < self._limit():
+                waiter = self._waiters.popleft()
+                self._in_flight += 1
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                else:
+                    waiter.get_loop().call_soon_threadsafe(self._grant, waiter)
+
+_limiter: Optional[RateLimiter] = None
+_concurrency_cap: Optional[ConcurrencyCap] = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Returns the process-wide limiter configured from `AuditorSettings`.
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            settings = get_settings()
+            _limiter = RateLimiter(settings.llm_rpm, settings.llm_tpm)
+        return _limiter
+
+def get_concurrency_cap() -> ConcurrencyCap:
+    """
+    Returns the process-wide cap on in-flight LLM calls.
+    """
+    global _concurrency_cap
+    with _limiter_lock:
+        if _concurrency_cap is None:
+            _concurrency_cap = ConcurrencyCap()
+        return _concurrency_cap
+
+def reset_rate_limiter() -> None:
+    global _limiter, _concurrency_cap
+    with _limiter_lock:
+        _limiter = None
+        _concurrency_cap = None
+
+# gRPC status names reported by Gemini errors (google.genai APIError.status,
+# google.api_core GoogleAPICallError.grpc_status_code) that are worth retrying
+RETRYABLE_GRPC_STATUSES = {"RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "INTERNAL"}
+
+def _retryable_status(status: Any) -> bool:
+    return isinstance(status, int) and not isinstance(status, bool) and (status == 429 or 500 <= status < 600)
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    True for rate-limit (429) and server-side (5xx) failures anywhere in the
+    exception chain, judged by the HTTP status or gRPC code the provider
+    attaches to its exception. Message text is never inspected, so an error
+    that merely mentions "429" is not mistaken for a quota error.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        for attr in ("code", "status_code"):
+            if _retryable_status(getattr(exc, attr, None)):
+                return True
+        response = getattr(exc, "response", None)
+        if _retryable_status(getattr(response, "status_code", None)):
+            return True
+        status = getattr(exc, "status", None)
+        if isinstance(status, str) and status in RETRYABLE_GRPC_STATUSES:
+            return True
+        grpc_code = getattr(exc, "grpc_status_code", None)
+        if getattr(grpc_code, "name", None) in RETRYABLE_GRPC_STATUSES:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Exponential backoff with full jitter for the given zero-based retry attempt.
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def _track(stats: Optional[Dict[str, float]], attempt: int, wait: float, started: float) -> None:
+    if stats is not None:
+        stats["attempts"] = attempt + 1
+        stats["queue_wait_s"] = stats.get("queue_wait_s", 0.0) + wait
+        stats["last_attempt_s"] = time.perf_counter() - started
+
+def call_with_backoff(fn: Callable[[], Any], tokens: int = 0, limiter: Optional[RateLimiter] = None,
+                      stats: Optional[Dict[str, float]] = None, deadline: Optional[float] = None) -> Any:
+    """
+    Runs `fn` through the shared limiter, retrying 429/5xx failures with jittered backoff.
+
+    If `stats` is given it is updated with the attempt count, accumulated
+    queue wait and the duration of the last attempt. With a `deadline`
+    (a `time.perf_counter()` value) neither the limiter queue nor a backoff
+    sleeps past it; DeadlineExceeded is raised instead.
+    """
+    settings = get_settings()
+    limiter = limiter or get_rate_limiter()
+    for attempt in range(settings.llm_max_attempts):
+        wait = limiter.acquire(tokens, max_wait=deadline - time.perf_counter() if deadline is not None else None)
+        started = time.perf_counter()
+        try:
+            result = fn()
+            _track(stats, attempt, wait, started)
+            return result
+        except Exception as e:
+            _track(stats, attempt, wait, started)
+            if not is_retryable(e) or attempt == settings.llm_max_attempts - 1:
+                raise
+            delay = backoff_delay(attempt, settings.llm_backoff_base_s, settings.llm_backoff_max_s)
+            if deadline is not None and time.perf_counter() + delay >= deadline:
+                raise DeadlineExceeded(f"No time left to retry after {e.__class__.__name__}") from e
+            print(f"RateLimiter: transient LLM error ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+async def acall_with_backoff(afn: Callable[[], Awaitable[Any]], tokens: int = 0, limiter: Optional[RateLimiter] = None,
+                             stats: Optional[Dict[str, float]] = None) -> Any:
+    """
+    Async variant of `call_with_backoff`.
+    """
+    settings = get_settings()
+    limiter = limiter or get_rate_limiter()
+    for attempt in range(settings.llm_max_attempts):
+        wait = await limiter.aacquire(tokens)
+        started = time.perf_counter()
+        try:
+            result = await afn()
+            _track(stats, attempt, wait, started)
+            return result
+        except Exception as e:
+            _track(stats, attempt, wait, started)
+            if not is_retryable(e) or attempt == settings.llm_max_attempts - 1:
+                raise
+            delay = backoff_delay(attempt, settings.llm_backoff_base_s, settings.llm_backoff_max_s)
+            print(f"RateLimiter: transient LLM error ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
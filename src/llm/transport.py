@@ -0,0 +1,260 @@
+# automation-auditor/src/llm/transport.py
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from pydantic import BaseModel
+
+from ..config import get_settings
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode when no recording exists for a request."""
+    pass
+
+def parse_latency(spec: str, seed: int = 0) -> Optional[Callable[[], float]]:
+    """
+    Parses a simulated-latency spec into a sampler returning seconds.
+
+    Supported forms: "" or "recorded" (None: use recorded latency or zero),
+    "fixed:<s>", "uniform:<lo>,<hi>" and "lognormal:<median>,<sigma>".
+    """
+    if not spec or spec == "recorded":
+        return None
+    rng = random.Random(seed)
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()]
+    if kind == "fixed":
+        return lambda: values[0]
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda: rng.lognormvariate(mu, values[1])
+    raise ValueError(f"Unknown latency spec: {spec}")
+
+def encode_result(result: Any) -> Dict[str, Any]:
+    """
+    Converts a model-call result into JSON-safe form for cassettes.
+    """
+    if isinstance(result, BaseMessage):
+        return {"kind": "message", "message": message_to_dict(result)}
+    if isinstance(result, BaseModel):
+        return {"kind": "model", "data": result.model_dump(mode="json")}
+    if isinstance(result, dict) and "raw" in result:
+        parsed = result.get("parsed")
+        error = result.get("parsing_error")
+        return {
+            "kind": "structured_raw",
+            "raw": message_to_dict(result["raw"]) if result.get("raw") is not None else None,
+            "parsed": parsed.model_dump(mode="json") if parsed is not None else None,
+            "parsing_error": str(error) if error is not None else None,
+        }
+    raise TypeError(f"Cannot record LLM result of type {type(result).__name__}")
+
+def decode_result(payload: Dict[str, Any], schema: Optional[type] = None) -> Any:
+    """
+    Inverse of `encode_result`; `schema` rebuilds parsed structured output.
+    """
+    kind = payload["kind"]
+    if kind == "message":
+        return messages_from_dict([payload["message"]])[0]
+    if kind == "model":
+        return schema.model_validate(payload["data"])
+    raw = messages_from_dict([payload["raw"]])[0] if payload.get("raw") else None
+    parsed = schema.model_validate(payload["parsed"]) if payload.get("parsed") is not None else None
+    error = ValueError(payload["parsing_error"]) if payload.get("parsing_error") else None
+    return {"raw": raw, "parsed": parsed, "parsing_error": error}
+
+def _simulate_latency(delay: float, timeout: Optional[float]) -> None:
+    """
+    Sleeps a simulated request latency, failing where a live client's request timeout would.
+    """
+    if timeout is not None and delay > timeout:
+        time.sleep(timeout)
+        raise TimeoutError(f"Simulated request exceeded its {timeout:.1f}s timeout")
+    time.sleep(delay)
+
+class LLMTransport:
+    """
+    Live transport: sends the call to the pooled model client.
+
+    Subclasses replace how a call is answered; retries, rate limiting and
+    concurrency caps stay in `invoke_llm` so they behave the same offline.
+    """
+
+    name = "live"
+
+    def invoke(self, call, messages: list, timeout: Optional[float] = None) -> Any:
+        """
+        Blocking call; `timeout` (seconds) becomes the client's request timeout.
+        """
+        return call.runnable(timeout).invoke(messages)
+
+    async def ainvoke(self, call, messages: list) -> Any:
+        return await call.runnable().ainvoke(messages)
+
+class RecordingTransport(LLMTransport):
+    """
+    Live transport that also writes each request/response pair to a cassette file.
+    """
+
+    name = "record"
+
+    def __init__(self, cassette_dir: str):
+        self.cassette_dir = cassette_dir
+        os.makedirs(cassette_dir, exist_ok=True)
+
+    def _write(self, call, messages: list, result: Any, latency_s: float) -> None:
+        key = call.request_key(messages)
+        entry = {
+            "key": key,
+            "call_type": call.call_type,
+            "tags": call.tags,
+            "latency_s": latency_s,
+            "response": encode_result(result),
+        }
+        path = os.path.join(self.cassette_dir, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, path)
+
+    def invoke(self, call, messages: list, timeout: Optional[float] = None) -> Any:
+        started = time.perf_counter()
+        result = super().invoke(call, messages, timeout)
+        self._write(call, messages, result, time.perf_counter() - started)
+        return result
+
+    async def ainvoke(self, call, messages: list) -> Any:
+        started = time.perf_counter()
+        result = await super().ainvoke(call, messages)
+        self._write(call, messages, result, time.perf_counter() - started)
+        return result
+
+class ReplayTransport(LLMTransport):
+    """
+    Answers calls from cassette files, sleeping a recorded or simulated latency.
+    """
+
+    name = "replay"
+
+    def __init__(self, cassette_dir: str, latency: Optional[Callable[[], float]] = None):
+        self.cassette_dir = cassette_dir
+        self.latency = latency
+
+    def _lookup(self, call, messages: list):
+        key = call.request_key(messages)
+        path = os.path.join(self.cassette_dir, f"{key}.json")
+        if not os.path.exists(path):
+            raise CassetteMissError(f"No cassette for {call.call_type} request {key[:12]} in {self.cassette_dir}")
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        delay = self.latency() if self.latency else float(entry.get("latency_s", 0.0))
+        return decode_result(entry["response"], call.schema), delay
+
+    def invoke(self, call, messages: list, timeout: Optional[float] = None) -> Any:
+        result, delay = self._lookup(call, messages)
+        _simulate_latency(delay, timeout)
+        return result
+
+    async def ainvoke(self, call, messages: list) -> Any:
+        result, delay = self._lookup(call, messages)
+        await asyncio.sleep(delay)
+        return result
+
+class FakeTransport(LLMTransport):
+    """
+    Synthetic model for offline runs.
+
+    Structured judge calls get one schema-valid opinion per requested
+    criterion (scores derived deterministically from seed, persona and
+    criterion); plain calls get a short synthetic verdict message.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: Optional[Callable[[], float]] = None, seed: int = 0):
+        self.latency = latency
+        self.seed = seed
+
+    def _score(self, persona: str, criterion_id: str) -> int:
+        digest = hashlib.sha256(f"{self.seed}:{persona}:{criterion_id}".encode("utf-8")).digest()
+        return 30 + digest[0] % 66
+
+    def respond(self, call, messages: list) -> Any:
+        if call.schema is None:
+            return AIMessage(content="Synthetic verdict: the diagrams depict a parallel fan-out/fan-in flow.")
+
+        persona = call.tags.get("persona", "TechLead")
+        opinions = [
+            {
+                "criterion_id": criterion_id,
+                "judge": persona,
+                "score": self._score(persona, criterion_id),
+                "argument": f"Synthetic {persona} opinion for {criterion_id}.",
+                "cited_evidence": [],
+            }
+            for criterion_id in call.tags.get("criteria", [])
+        ]
+        payload = {"opinions": opinions}
+        parsed = call.schema.model_validate(payload)
+        if not call.include_raw:
+            return parsed
+        raw = AIMessage(content="", tool_calls=[{"name": call.schema.__name__, "args": payload, "id": "fake"}])
+        return {"raw": raw, "parsed": parsed, "parsing_error": None}
+
+    def invoke(self, call, messages: list, timeout: Optional[float] = None) -> Any:
+        if self.latency:
+            _simulate_latency(self.latency(), timeout)
+        return self.respond(call, messages)
+
+    async def ainvoke(self, call, messages: list) -> Any:
+        if self.latency:
+            await asyncio.sleep(self.latency())
+        return self.respond(call, messages)
+
+_transport: Optional[LLMTransport] = None
+_transport_lock = threading.Lock()
+
+def build_transport(name: str, cassette_dir: str, latency_spec: str = "", seed: int = 0) -> LLMTransport:
+    latency = parse_latency(latency_spec, seed)
+    if name == "live":
+        return LLMTransport()
+    if name == "record":
+        return RecordingTransport(cassette_dir)
+    if name == "replay":
+        return ReplayTransport(cassette_dir, latency)
+    if name == "fake":
+        return FakeTransport(latency, seed)
+    raise ValueError(f"Unknown LLM transport: {name}")
+
+def get_transport() -> LLMTransport:
+    """
+    Returns the active transport, built from AUDITOR_LLM_TRANSPORT on first use.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            settings = get_settings()
+            _transport = build_transport(
+                settings.llm_transport,
+                settings.llm_cassette_dir,
+                settings.llm_simulated_latency,
+                settings.llm_transport_seed,
+            )
+        return _transport
+
+def set_transport(transport: Optional[LLMTransport]) -> None:
+    """
+    Installs `transport` process-wide (None re-reads settings on next use).
+    """
+    global _transport
+    with _transport_lock:
+        _transport = transport
@@ -0,0 +1,122 @@
+# automation-auditor/src/memo.py
+import asyncio
+import glob
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .config import get_settings
+from .fingerprint import file_hash, remote_head
+from .nodes.detectives import NO_MEMO, VISION_MODEL, VISION_TEMPERATURE
+from .state import AgentState, Evidence
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Source files whose behaviour shapes detective output
+ANALYZER_SOURCES = ("nodes/detectives.py", "tools/*.py")
+
+@lru_cache(maxsize=1)
+def analyzer_version() -> str:
+    """
+    Hash of the detective and tool sources, so editing an analyzer
+    invalidates every memoized result without a manual version bump.
+    """
+    digest = hashlib.sha256()
+    for pattern in ANALYZER_SOURCES:
+        for path in sorted(glob.glob(os.path.join(ROOT, pattern))):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+def detective_memo_key(node: str, state: AgentState) -> Optional[str]:
+    """
+    Memo key for a detective: the pinned commit (else the remote HEAD) for
+    the RepoInvestigator, the report hash for the PDF detectives. The
+    VisionInspector key also covers the model, its temperature and the LLM
+    transport, since they decide what the diagrams are said to show. None
+    when the input cannot be identified (unreachable remote, missing
+    report), which disables the memo.
+    """
+    if node == "repo_investigator":
+        parts = [state.get("repo_url") or "", state.get("pinned_commit") or remote_head(state.get("repo_url") or "")]
+    else:
+        parts = [file_hash(state.get("pdf_path") or "")]
+        if node == "doc_analyst":
+            parts.append(json.dumps(state.get("known_files"), sort_keys=True))
+        elif node == "vision_inspector":
+            vision = {"model": VISION_MODEL, "temperature": VISION_TEMPERATURE, "transport": get_settings().llm_transport}
+            parts.append(json.dumps(vision, sort_keys=True))
+    if not all(parts):
+        return None
+    return hashlib.sha256("\0".join([node, analyzer_version(), *parts]).encode("utf-8")).hexdigest()
+
+def _memo_path(node: str, key: str) -> str:
+    return os.path.join(get_settings().detective_memo_dir, node, f"{key}.json")
+
+def load_memo(node: str, key: str) -> Optional[Dict[str, Any]]:
+    path = _memo_path(node, key)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    update = dict(payload)
+    update["evidences"] = {k: [Evidence.model_validate(e) for e in items] for k, items in payload.get("evidences", {}).items()}
+    return update
+
+def _cacheable(update: Dict[str, Any], no_memo: bool) -> bool:
+    # Failed collection is reported as zero-confidence evidence, transient failures with NO_MEMO; never memoize them
+    evidences = update.get("evidences") or {}
+    return not no_memo and bool(evidences) and all(e.confidence > 0.0 for items in evidences.values() for e in items)
+
+def save_memo(node: str, key: str, update: Dict[str, Any], no_memo: bool = False) -> None:
+    if not _cacheable(update, no_memo):
+        return
+    # Usage, timings and degradations describe the run that collected the evidence, not the evidence itself
+    payload = {k: v for k, v in update.items() if k not in ("llm_usage", "timings", "degraded_stages")}
+    payload["evidences"] = {k: [e.model_dump(mode="json") for e in items] for k, items in update["evidences"].items()}
+    path = _memo_path(node, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+def _lookup(node: str, state: AgentState):
+    if not get_settings().detective_memo_dir:
+        return None, None
+    key = detective_memo_key(node, state)
+    if key is None:
+        return None, None
+    cached = load_memo(node, key)
+    if cached is not None:
+        print(f"--- {node}: memo hit ({key[:12]}), skipping collection ---")
+    return key, cached
+
+def memoized(node: str, state: AgentState, run: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Returns the stored update for this detective's inputs, or runs it and stores the result.
+    """
+    key, cached = _lookup(node, state)
+    if cached is not None:
+        return cached
+    update = run()
+    # NO_MEMO is an instruction to this wrapper, not graph state
+    no_memo = bool(update.pop(NO_MEMO, False))
+    if key is not None:
+        save_memo(node, key, update, no_memo)
+    return update
+
+async def amemoized(node: str, state: AgentState, run: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Async twin of `memoized`; the key lookup (git ls-remote, hashing) runs in a worker thread.
+    """
+    key, cached = await asyncio.to_thread(_lookup, node, state)
+    if cached is not None:
+        return cached
+    update = await run()
+    no_memo = bool(update.pop(NO_MEMO, False))
+    if key is not None:
+        save_memo(node, key, update, no_memo)
+    return update
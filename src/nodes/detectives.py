@@ -1,12 +1,22 @@
 # automation-auditor/src/nodes/detectives.py
 import os
+import asyncio
+import operator
+import time
+from functools import lru_cache
+from typing import Annotated, Any, Callable, Dict, List
+from typing_extensions import TypedDict
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 from ..state import AgentState, Evidence
 import base64
 from langchain_core.messages import HumanMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from ..llm.clients import DEFAULT_MODEL, LLMCall, invoke_llm, ainvoke_llm
 from ..tools.repo_tools import (
     clone_repo, 
+    remove_clone,
     extract_git_history, 
+    head_commit,
     check_sidecar_files, 
     analyze_code_structure, 
     ast_analyze_source,
@@ -19,6 +29,12 @@ from ..tools.repo_tools import (
 )
 from ..tools.doc_tools import ingest_pdf, verify_citations, analyze_concept_depth
 from ..tools.vision_tools import extract_images_from_pdf
+from ..blobs import compact_evidence
+from ..config import get_settings
+from ..deadline import DeadlineExceeded, degraded, is_timeout, stage_budget
+from ..profiling import span
+from ..resources import resource_slot
+from ..rubric import DETECTIVE_EVIDENCE
 
 def _append_evidence(new_evidences: dict, criterion_id: str, evidence: Evidence):
     """
@@ -26,153 +42,190 @@ def _append_evidence(new_evidences: dict, criterion_id: str, evidence: Evidence)
     """
     if criterion_id not in new_evidences:
         new_evidences[criterion_id] = []
-    new_evidences[criterion_id].append(evidence)
+    new_evidences[criterion_id].append(compact_evidence(evidence))
 
-def repo_investigator_node(state: AgentState) -> AgentState:
-    """
-    Node that clones the repository and performs code forensics.
-    """
-    repo_url = state.get("repo_url")
-    if not repo_url:
-        print("Error: No repo_url provided for investigation.")
-        return state
-    
-    url = repo_url
-    
+def _git_protocol(repo_path: str) -> Dict[str, List[Evidence]]:
+    """Git history and narrative (dimension: git_forensic_analysis)."""
     new_evidences = {}
-    
-    try:
-        # 1. Clone
-        repo_path = clone_repo(url)
-        
-        # 2. Extract Git History (Maps to dimension: git_forensic_analysis)
-        history = extract_git_history(repo_path)
-        _append_evidence(new_evidences, "git_history", Evidence(
-            goal="Extract Git History for progression analysis",
-            found=True,
-            content=f"Extracted {len(history)} commits from history.",
-            location="git:log",
-            rationale="Collected git log --oneline --reverse to show development progression.",
+    history = extract_git_history(repo_path, timeout=stage_budget(get_settings().git_timeout_s, "git log"))
+    _append_evidence(new_evidences, "git_history", Evidence(
+        goal="Extract Git History for progression analysis",
+        found=True,
+        content=f"Extracted {len(history)} commits from history.",
+        location="git:log",
+        rationale="Collected git log --oneline --reverse to show development progression.",
+        confidence=1.0
+    ))
+    narrative = classify_git_narrative(history)
+    _append_evidence(new_evidences, "git_narrative", Evidence(
+        goal="Analyze git history for step-by-step meaningful commits",
+        found=True,
+        content=f"Repository has {narrative['commit_count']} commits. Classification: {narrative['classification']}. Meaningful messages: {narrative['has_meaningful_messages']}.",
+        location="git:log",
+        rationale="Applied semantic checks on git messages and overall commit count.",
+        confidence=0.9
+    ))
+    return new_evidences
+
+def _sidecar_protocol(repo_path: str) -> Dict[str, List[Evidence]]:
+    """Orchestration sidecar files (ad-hoc, not strictly rubric but good intel)."""
+    new_evidences = {}
+    sidecars = check_sidecar_files(repo_path)
+    active_intents = sidecars.get("active_intents", {})
+    agent_trace = sidecars.get("agent_trace", {})
+
+    summary = []
+    if active_intents.get("exists"):
+        summary.append(f"ActiveIntents found at {active_intents['path']}")
+    if agent_trace.get("exists"):
+        summary.append(f"AgentTrace found at {agent_trace['path']}")
+
+    _append_evidence(new_evidences, "sidecar_files", Evidence(
+        goal="Identify orchestration sidecar files",
+        found=bool(summary),
+        content=" | ".join(summary) if summary else "No orchestration sidecars detected.",
+        location=".orchestration/",
+        rationale="Checked specific predefined paths for ActiveIntents and AgentTrace files.",
+        confidence=0.9
+    ))
+    return new_evidences
+
+def _structure_protocol(repo_path: str) -> Dict[str, List[Evidence]]:
+    """Project layout (dimensions: safe_tool_engineering / layout)."""
+    new_evidences = {}
+    structure = analyze_code_structure(repo_path)
+    missing = [k for k, v in structure.items() if not v]
+
+    _append_evidence(new_evidences, "repo_structure", Evidence(
+        goal="Verify root structure of the LangGraph project",
+        found=len(missing) == 0,
+        content=f"Structure valid. Missing: {missing}" if missing else "Full folder structure verified.",
+        location="src/",
+        rationale="Checked for standard src/graph.py, src/state.py, nodes/ and tools/ directories.",
+        confidence=0.8
+    ))
+    return new_evidences
+
+def _state_protocol(repo_path: str) -> Dict[str, List[Evidence]]:
+    """Protocol A: state models (dimension: state_management_rigor)."""
+    new_evidences = {}
+    state_file = os.path.join(repo_path, "src", "state.py")
+    state_info = ast_analyze_source(state_file)
+    if "error" in state_info:
+        _append_evidence(new_evidences, "state_structure", Evidence(
+            goal="Parse state.py for error",
+            found=False,
+            content=f"Error analyzing state.py: {state_info['error']}",
+            location="src/state.py",
+            rationale="AST parsing failed on state file.",
             confidence=1.0
         ))
-        
-        # 3. Sidecar Check (Ad-hoc / Not strictly rubric but good intel)
-        sidecars = check_sidecar_files(repo_path)
-        active_intents = sidecars.get("active_intents", {})
-        agent_trace = sidecars.get("agent_trace", {})
-        
-        summary = []
-        if active_intents.get("exists"):
-            summary.append(f"ActiveIntents found at {active_intents['path']}")
-        if agent_trace.get("exists"):
-            summary.append(f"AgentTrace found at {agent_trace['path']}")
-            
-        _append_evidence(new_evidences, "sidecar_files", Evidence(
-            goal="Identify orchestration sidecar files",
-            found=bool(summary),
-            content=" | ".join(summary) if summary else "No orchestration sidecars detected.",
-            location=".orchestration/",
-            rationale="Checked specific predefined paths for ActiveIntents and AgentTrace files.",
-            confidence=0.9
-        ))
-        
-        # 4. Structure Analysis (Maps to dimension: safe_tool_engineering / layout)
-        structure = analyze_code_structure(repo_path)
-        missing = [k for k, v in structure.items() if not v]
-        
-        _append_evidence(new_evidences, "repo_structure", Evidence(
-            goal="Verify root structure of the LangGraph project",
-            found=len(missing) == 0,
-            content=f"Structure valid. Missing: {missing}" if missing else "Full folder structure verified.",
-            location="src/",
-            rationale="Checked for standard src/graph.py, src/state.py, nodes/ and tools/ directories.",
-            confidence=0.8
+    else:
+        found_types = state_info.get("has_typed_dict", False) or state_info.get("has_pydantic_model", False)
+        _append_evidence(new_evidences, "state_structure", Evidence(
+            goal="AST check for Pydantic/TypedDict state models",
+            found=found_types,
+            content=f"State types detected: TypedDict={state_info.get('has_typed_dict')}, BaseModel={state_info.get('has_pydantic_model')}",
+            location="src/state.py",
+            rationale="Used AST parsing to confidently detect inheritance from TypedDict or BaseModel.",
+            confidence=1.0
         ))
+    return new_evidences
 
-        # 5. Advanced Repo Checks: Protocol A (Maps to dimension: state_management_rigor)
-        state_file = os.path.join(repo_path, "src", "state.py")
-        state_info = ast_analyze_source(state_file)
-        if "error" in state_info:
-            _append_evidence(new_evidences, "state_structure", Evidence(
-                goal="Parse state.py for error",
-                found=False,
-                content=f"Error analyzing state.py: {state_info['error']}",
-                location="src/state.py",
-                rationale="AST parsing failed on state file.",
-                confidence=1.0
-            ))
-        else:
-            found_types = state_info.get("has_typed_dict", False) or state_info.get("has_pydantic_model", False)
-            _append_evidence(new_evidences, "state_structure", Evidence(
-                goal="AST check for Pydantic/TypedDict state models",
-                found=found_types,
-                content=f"State types detected: TypedDict={state_info.get('has_typed_dict')}, BaseModel={state_info.get('has_pydantic_model')}",
-                location="src/state.py",
-                rationale="Used AST parsing to confidently detect inheritance from TypedDict or BaseModel.",
-                confidence=1.0
-            ))
-        
-        # Protocol B: Graph Parallelism (Maps to dimension: graph_orchestration)
-        graph_file = os.path.join(repo_path, "src", "graph.py")
-        graph_info = analyze_graph_structure(graph_file)
-        if not graph_info["parsed_ok"]:
-            _append_evidence(new_evidences, "graph_parallelism", Evidence(
-                goal="Parse graph.py for error",
-                found=False,
-                content="Error analyzing graph.py AST.",
-                location="src/graph.py",
-                rationale="AST parsing wrapper reported parsed_ok=False.",
-                confidence=1.0
-            ))
-        else:
-            has_fanout = graph_info.get("has_parallel_edges", False)
-            content_msg = "Parallel fan-out edges detected in graph wiring." if has_fanout else "Graph appears linear; no fan-out edges found."
-            _append_evidence(new_evidences, "graph_parallelism", Evidence(
-                goal="Detect fan-out orchestration patterns in StateGraph",
-                found=has_fanout,
-                content=content_msg,
-                location="src/graph.py",
-                rationale="AST parsed builder.add_edge calls indicating multiple outgoing paths.",
-                confidence=0.9
-            ))
-        
-        # Protocol C: Git Narrative (Maps to dimension: git_forensic_analysis)
-        narrative = classify_git_narrative(history)
-        _append_evidence(new_evidences, "git_narrative", Evidence(
-            goal="Analyze git history for step-by-step meaningful commits",
-            found=True,
-            content=f"Repository has {narrative['commit_count']} commits. Classification: {narrative['classification']}. Meaningful messages: {narrative['has_meaningful_messages']}.",
-            location="git:log",
-            rationale="Applied semantic checks on git messages and overall commit count.",
-            confidence=0.9
-        ))
-        
-        # Protocol D: Safe Tool Engineering (Maps to dimension: safe_tool_engineering)
-        security_findings = analyze_tool_security(repo_path)
-        sec_msg = f"Tools secure: tempfile={security_findings['has_tempfile']}, subprocess={security_findings['has_subprocess']}, no_os_system={not security_findings['has_os_system']}."
-        _append_evidence(new_evidences, "safe_tool_engineering", Evidence(
-            goal="Verify safe tool execution practices in src/tools/",
-            found=security_findings['has_tempfile'] and security_findings['has_subprocess'] and not security_findings['has_os_system'],
-            content=sec_msg,
-            location="src/tools/",
-            rationale="Scanned source files for tempfile sandboxing, subprocess usage, and zero os.system calls.",
+def _graph_protocol(repo_path: str) -> Dict[str, List[Evidence]]:
+    """Protocol B: graph parallelism (dimension: graph_orchestration)."""
+    new_evidences = {}
+    graph_file = os.path.join(repo_path, "src", "graph.py")
+    graph_info = analyze_graph_structure(graph_file)
+    if not graph_info["parsed_ok"]:
+        _append_evidence(new_evidences, "graph_parallelism", Evidence(
+            goal="Parse graph.py for error",
+            found=False,
+            content="Error analyzing graph.py AST.",
+            location="src/graph.py",
+            rationale="AST parsing wrapper reported parsed_ok=False.",
             confidence=1.0
         ))
-        
-        # Protocol E: Structured Output Enforcement (Maps to dimension: structured_output_enforcement)
-        struct_findings = analyze_structured_output(repo_path)
-        struct_msg = f"Structured Output: used={struct_findings['has_structured_output']}, retry_logic={struct_findings['has_retry_logic']}."
-        _append_evidence(new_evidences, "structured_output_enforcement", Evidence(
-            goal="Verify LLMs use structured output and robust retry logic",
-            found=struct_findings['has_structured_output'] and struct_findings['has_retry_logic'],
-            content=struct_msg,
-            location="src/nodes/judges.py",
-            rationale="Scanned judges.py for .with_structured_output integration and try/except retry loops.",
-            confidence=1.0
+    else:
+        has_fanout = graph_info.get("has_parallel_edges", False)
+        content_msg = "Parallel fan-out edges detected in graph wiring." if has_fanout else "Graph appears linear; no fan-out edges found."
+        _append_evidence(new_evidences, "graph_parallelism", Evidence(
+            goal="Detect fan-out orchestration patterns in StateGraph",
+            found=has_fanout,
+            content=content_msg,
+            location="src/graph.py",
+            rationale="AST parsed builder.add_edge calls indicating multiple outgoing paths.",
+            confidence=0.9
         ))
-        
-    except (RepoCloneError, GitHistoryError) as e:
+    return new_evidences
+
+def _tool_security_protocol(repo_path: str) -> Dict[str, List[Evidence]]:
+    """Protocol D: safe tool engineering (dimension: safe_tool_engineering)."""
+    new_evidences = {}
+    security_findings = analyze_tool_security(repo_path)
+    sec_msg = f"Tools secure: tempfile={security_findings['has_tempfile']}, subprocess={security_findings['has_subprocess']}, no_os_system={not security_findings['has_os_system']}."
+    _append_evidence(new_evidences, "safe_tool_engineering", Evidence(
+        goal="Verify safe tool execution practices in src/tools/",
+        found=security_findings['has_tempfile'] and security_findings['has_subprocess'] and not security_findings['has_os_system'],
+        content=sec_msg,
+        location="src/tools/",
+        rationale="Scanned source files for tempfile sandboxing, subprocess usage, and zero os.system calls.",
+        confidence=1.0
+    ))
+    return new_evidences
+
+def _structured_output_protocol(repo_path: str) -> Dict[str, List[Evidence]]:
+    """Protocol E: structured output enforcement (dimension: structured_output_enforcement)."""
+    new_evidences = {}
+    struct_findings = analyze_structured_output(repo_path)
+    struct_msg = f"Structured Output: used={struct_findings['has_structured_output']}, retry_logic={struct_findings['has_retry_logic']}."
+    _append_evidence(new_evidences, "structured_output_enforcement", Evidence(
+        goal="Verify LLMs use structured output and robust retry logic",
+        found=struct_findings['has_structured_output'] and struct_findings['has_retry_logic'],
+        content=struct_msg,
+        location="src/nodes/judges.py",
+        rationale="Scanned judges.py for .with_structured_output integration and try/except retry loops.",
+        confidence=1.0
+    ))
+    return new_evidences
+
+# Forensic protocols run in parallel after the clone, keyed by the evidence
+# key a failure is reported under.
+REPO_PROTOCOLS: Dict[str, Callable[[str], Dict[str, List[Evidence]]]] = {
+    "git_history": _git_protocol,
+    "sidecar_files": _sidecar_protocol,
+    "repo_structure": _structure_protocol,
+    "state_structure": _state_protocol,
+    "graph_parallelism": _graph_protocol,
+    "safe_tool_engineering": _tool_security_protocol,
+    "structured_output_enforcement": _structured_output_protocol,
+}
+
+class RepoForensicsState(TypedDict):
+    """State of the RepoInvestigator subgraph."""
+    repo_url: str
+    repo_path: str
+    pinned_commit: str
+    commit_sha: str
+    evidences: Annotated[Dict[str, List[Evidence]], operator.ior]
+    timings: Annotated[List[Dict], operator.add]
+    degraded_stages: Annotated[List[Dict], operator.add]
+
+def clone_submission(state: RepoForensicsState) -> Dict[str, Any]:
+    """
+    Clones the submission (at `pinned_commit` when set); a failure
+    is reported as zero-confidence git evidence. The clone gets
+    AUDITOR_CLONE_TIMEOUT_S, bounded by the audit deadline.
+    """
+    settings = get_settings()
+    started = time.perf_counter()
+    try:
+        pinned = {"commit_sha": state["pinned_commit"]} if state.get("pinned_commit") else {}
+        with resource_slot("clone"):
+            repo_path = clone_repo(state["repo_url"], timeout=stage_budget(settings.clone_timeout_s, "clone"), **pinned)
+    except (RepoCloneError, GitHistoryError, DeadlineExceeded) as e:
         print(f"Error RepoInvestigator: {str(e)}")
+        new_evidences = {}
         _append_evidence(new_evidences, "git_history", Evidence(
             goal="Catch forensic collection failure",
             found=False,
@@ -181,8 +234,90 @@ def repo_investigator_node(state: AgentState) -> AgentState:
             rationale="Subprocess exception during clone or history extraction.",
             confidence=0.0
         ))
-        
-    return {"evidences": new_evidences}
+        update = {"evidences": new_evidences, "timings": [_timing("clone", started, ok=False)]}
+        if is_timeout(e):
+            update["degraded_stages"] = [degraded("repo_investigator.clone", e)]
+        return update
+    commit_sha = head_commit(repo_path, timeout=settings.git_timeout_s or None)
+    return {"repo_path": repo_path, "commit_sha": commit_sha, "timings": [_timing("clone", started)]}
+
+def run_repo_protocol(task: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Runs one forensic protocol on the clone. An exception is contained to
+    that protocol and reported as zero-confidence evidence under its key.
+    """
+    name = task["protocol"]
+    started = time.perf_counter()
+    try:
+        # CPU-bound work (git log parsing, AST walks)
+        with resource_slot("cpu"):
+            # Protocols that cannot be interrupted are at least not started past the deadline
+            stage_budget(0, name)
+            with span(f"protocol.{name}", "protocol"):
+                new_evidences = REPO_PROTOCOLS[name](task["repo_path"])
+    except Exception as e:
+        print(f"Error RepoInvestigator protocol {name}: {e}")
+        new_evidences = {}
+        _append_evidence(new_evidences, name, Evidence(
+            goal=f"Run the {name} forensic protocol",
+            found=False,
+            content=f"Protocol failed: {e.__class__.__name__}: {e}",
+            location="repo_root",
+            rationale="Exception raised inside this protocol; the other protocols were unaffected.",
+            confidence=0.0
+        ))
+        update = {"evidences": new_evidences, "timings": [_timing(name, started, ok=False)]}
+        if is_timeout(e):
+            update["degraded_stages"] = [degraded(f"repo_investigator.{name}", e)]
+        return update
+    return {"evidences": new_evidences, "timings": [_timing(name, started)]}
+
+def _timing(step: str, started: float, ok: bool = True) -> Dict[str, Any]:
+    return {"stage": f"repo_investigator.{step}", "seconds": round(time.perf_counter() - started, 4), "ok": ok}
+
+def _dispatch_protocols(state: RepoForensicsState):
+    if not state.get("repo_path"):
+        return END
+    return [Send("protocol", {"protocol": name, "repo_path": state["repo_path"]}) for name in REPO_PROTOCOLS]
+
+@lru_cache(maxsize=1)
+def repo_forensics_graph():
+    """
+    Clone, then fan the forensic protocols out in parallel; each writes its
+    evidence through the `operator.ior` reducer.
+    """
+    builder = StateGraph(RepoForensicsState)
+    builder.add_node("clone", clone_submission)
+    builder.add_node("protocol", run_repo_protocol)
+    builder.add_edge(START, "clone")
+    builder.add_conditional_edges("clone", _dispatch_protocols, ["protocol", END])
+    builder.add_edge("protocol", END)
+    return builder.compile()
+
+def repo_investigator_node(state: AgentState) -> AgentState:
+    """
+    Node that clones the repository and performs code forensics.
+    """
+    repo_url = state.get("repo_url")
+    if not repo_url:
+        print("Error: No repo_url provided for investigation.")
+        return {}
+
+    result = repo_forensics_graph().invoke({"repo_url": repo_url, "pinned_commit": state.get("pinned_commit", ""), "evidences": {},
+                                            "timings": [], "degraded_stages": []})
+    # Every protocol has read the clone by now; evidence content is already in the result
+    if result.get("repo_path"):
+        remove_clone(result["repo_path"])
+    # Protocols finish in any order; keep evidence and timings in a stable order for prompts and cassettes
+    evidence_order = {key: i for i, key in enumerate(DETECTIVE_EVIDENCE["repo_investigator"])}
+    evidences = dict(sorted(result.get("evidences", {}).items(), key=lambda item: evidence_order.get(item[0], len(evidence_order))))
+    step_order = {name: i for i, name in enumerate(["clone", *REPO_PROTOCOLS])}
+    timings = sorted(result.get("timings", []), key=lambda t: step_order.get(t["stage"].split(".", 1)[1], len(step_order)))
+    print("RepoInvestigator timings: " + ", ".join(f"{t['stage'].split('.', 1)[1]} {t['seconds']:.2f}s" for t in timings))
+    update = {"evidences": evidences, "commit_sha": result.get("commit_sha", ""), "timings": timings}
+    if result.get("degraded_stages"):
+        update["degraded_stages"] = result["degraded_stages"]
+    return update
 
 def doc_analyst_node(state: AgentState) -> AgentState:
     """
@@ -191,16 +326,17 @@ def doc_analyst_node(state: AgentState) -> AgentState:
     pdf_path = state.get("pdf_path")
     if not pdf_path:
         print("Error: No PDF path provided for analysis.")
-        return state
+        return {}
         
     if not os.path.exists(pdf_path):
         print(f"Error: PDF file not found: {pdf_path}")
-        return state
+        return {}
         
     new_evidences = {}
     try:
         # 1. Ingest
-        chunks = ingest_pdf(pdf_path)
+        with resource_slot("cpu"):
+            chunks = ingest_pdf(pdf_path)
         raw_text = "".join(chunks)
         
         # 2. Search for theoretical concepts: Protocol B (Maps to dimension: theoretical_depth)
@@ -248,35 +384,60 @@ def doc_analyst_node(state: AgentState) -> AgentState:
         
     return {"evidences": new_evidences}
 
-def vision_inspector_node(state: AgentState) -> AgentState:
+VISION_MODEL = DEFAULT_MODEL
+# Update key telling the detective memo not to store this result (see src/memo.py)
+NO_MEMO = "no_memo"
+VISION_TEMPERATURE = 0.1
+EXPECTED_FLOW = "Detectives (parallel) -> EvidenceAggregator -> Judges (parallel) -> ChiefJustice"
+
+def _build_vision_message(images: list) -> HumanMessage:
     """
-    Parallel stub for visual flow analysis. 
-    In the future, this will use Docling/Vision models to analyze diagrams.
+    Packs the extracted diagrams and the expected-flow instruction into one multimodal message.
+    """
+    content_parts = [{"type": "text", "text": f"Analyze these architecture diagrams according to the needs of the project. The expected flow is: {EXPECTED_FLOW}. Identify if the diagrams strictly depict this complex parallel fan-out/fan-in flow or just a plain linear process. Give a brief but explicit verdict."}]
+    for img_bytes in images:
+        img_base64 = base64.b64encode(img_bytes).decode('utf-8')
+        content_parts.append({
+            "type": "image_url",
+            "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"}
+        })
+    return HumanMessage(content=content_parts)
+
+def _extract_images(pdf_path: str) -> list:
+    with resource_slot("cpu"):
+        return extract_images_from_pdf(pdf_path)
+
+async def _inspect_diagrams(state: AgentState, blocking: bool) -> AgentState:
+    """
+    Shared body of the sync and async VisionInspector nodes.
     """
     print("--- Running VisionInspector (Stub) ---")
     
     new_evidences = {}
+    usage = []
+    degraded_stages = []
+    vlm_failed = False
     pdf_path = state.get("pdf_path")
     if pdf_path and os.path.exists(pdf_path):
-        images = extract_images_from_pdf(pdf_path)
+        if blocking:
+            images = _extract_images(pdf_path)
+        else:
+            # Keep PDF parsing off the event loop so other audits keep moving
+            images = await asyncio.to_thread(_extract_images, pdf_path)
         img_count = len(images)
         
-        expected = "Detectives (parallel) -> EvidenceAggregator -> Judges (parallel) -> ChiefJustice"
-        
         if img_count > 0:
             try:
-                llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.1)
-                
-                content_parts = [{"type": "text", "text": f"Analyze these architecture diagrams according to the needs of the project. The expected flow is: {expected}. Identify if the diagrams strictly depict this complex parallel fan-out/fan-in flow or just a plain linear process. Give a brief but explicit verdict."}]
-                for img_bytes in images:
-                    img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-                    content_parts.append({
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{img_base64}"}
-                    })
-                
-                msg = HumanMessage(content=content_parts)
-                response = llm.invoke([msg])
+                call = LLMCall("vision", temperature=VISION_TEMPERATURE, model=VISION_MODEL, tags={"node": "vision_inspector", "images": img_count})
+                msg = _build_vision_message(images)
+                try:
+                    if blocking:
+                        response = invoke_llm(call, [msg])
+                    else:
+                        response = await ainvoke_llm(call, [msg])
+                finally:
+                    if call.usage:
+                        usage.append(call.usage)
                 
                 _append_evidence(new_evidences, "flow_analysis", Evidence(
                     goal="Analyze architectural diagram structural flow",
@@ -288,6 +449,9 @@ def vision_inspector_node(state: AgentState) -> AgentState:
                 ))
             except Exception as e:
                 # Fallback to stub if VLM fails
+                vlm_failed = True
+                if is_timeout(e):
+                    degraded_stages.append(degraded("vision_inspector", e))
                 _append_evidence(new_evidences, "flow_analysis", Evidence(
                     goal="Analyze architectural diagram structural flow",
                     found=False,
@@ -300,10 +464,30 @@ def vision_inspector_node(state: AgentState) -> AgentState:
             _append_evidence(new_evidences, "flow_analysis", Evidence(
                 goal="Analyze architectural diagram structural flow",
                 found=False,
-                content=f"0 images extracted. expected_flow: {expected}",
+                content=f"0 images extracted. expected_flow: {EXPECTED_FLOW}",
                 location="pdf:images",
                 rationale="No images found to analyze in PDF.",
                 confidence=0.5
             ))
     
-    return {"evidences": new_evidences}
+    update = {"evidences": new_evidences, "llm_usage": usage}
+    if degraded_stages:
+        update["degraded_stages"] = degraded_stages
+    if vlm_failed:
+        # The images are still usable evidence, but a transient model failure must be retried next run
+        update[NO_MEMO] = True
+    return update
+
+def vision_inspector_node(state: AgentState) -> AgentState:
+    """
+    Parallel stub for visual flow analysis. 
+    In the future, this will use Docling/Vision models to analyze diagrams.
+    """
+    return asyncio.run(_inspect_diagrams(state, blocking=True))
+
+async def avision_inspector_node(state: AgentState) -> AgentState:
+    """
+    Async variant of `vision_inspector_node` that awaits the multimodal call
+    instead of holding a worker thread.
+    """
+    return await _inspect_diagrams(state, blocking=False)
@@ -0,0 +1,116 @@
+# automation-auditor/src/nodes/fast_path.py
+import re
+from typing import Dict, List, Optional, Tuple
+
+from ..rubric import evidence_keys_for
+from ..state import Evidence, JudicialOpinion
+
+FAST_PATH_MARKER = "[fast-path]"
+
+def evidence_flags(evidence: Evidence) -> Dict[str, bool]:
+    """
+    Parses the `name=True/False` flags detectives write into evidence content.
+    """
+    return {name: value == "True" for name, value in re.findall(r"(\w+)=(True|False)", evidence.content or "")}
+
+# Each rule decides a criterion outright when its evidence is conclusive.
+# `when` receives the parsed flags of the criterion's evidence; the first
+# matching rule wins and criteria with no match go to the LLM judges.
+FAST_PATH_RULES: List[Dict] = [
+    {
+        "criterion_id": "safe_tool_engineering",
+        "evidence": "safe_tool_engineering",
+        "when": lambda f: f.get("no_os_system") is False,
+        "score": 20,
+        "reason": "Raw os.system call detected in src/tools/; unsanitized shell execution is a confirmed security flaw.",
+    },
+    {
+        "criterion_id": "safe_tool_engineering",
+        "evidence": "safe_tool_engineering",
+        "when": lambda f: f.get("tempfile") is True and f.get("subprocess") is True and f.get("no_os_system") is True,
+        "score": 90,
+        "reason": "Tools sandbox work with tempfile, shell out via subprocess and contain no os.system calls.",
+    },
+    {
+        "criterion_id": "structured_output_enforcement",
+        "evidence": "structured_output_enforcement",
+        "when": lambda f: f.get("used") is True and f.get("retry_logic") is True,
+        "score": 90,
+        "reason": "Judges bind structured output and wrap invocation in retry logic.",
+    },
+    {
+        "criterion_id": "structured_output_enforcement",
+        "evidence": "structured_output_enforcement",
+        "when": lambda f: f.get("used") is False and f.get("retry_logic") is False,
+        "score": 10,
+        "reason": "Judges use neither structured output binding nor retry logic.",
+    },
+]
+
+def _conclusive_evidence(evidences: Dict[str, List[Evidence]], key: str) -> Optional[Evidence]:
+    """
+    Only full-confidence detective findings are treated as conclusive.
+    """
+    items = evidences.get(key) or []
+    if len(items) != 1:
+        return None
+    item = items[0]
+    if not isinstance(item, Evidence) or item.confidence < 1.0:
+        return None
+    return item
+
+def fast_path_opinion(criterion_id: str, evidences: Dict[str, List[Evidence]], persona: str) -> Optional[JudicialOpinion]:
+    """
+    Returns a deterministic opinion for `criterion_id`, or None if the evidence is ambiguous.
+    """
+    for rule in FAST_PATH_RULES:
+        if rule["criterion_id"] != criterion_id:
+            continue
+        evidence = _conclusive_evidence(evidences, rule["evidence"])
+        if evidence is None:
+            continue
+        if rule["when"](evidence_flags(evidence)):
+            return JudicialOpinion(
+                criterion_id=criterion_id,
+                judge=persona,
+                score=rule["score"],
+                argument=f"{FAST_PATH_MARKER} Deterministic rule applied without LLM review: {rule['reason']} Evidence: {evidence.content}",
+                cited_evidence=[evidence.location],
+            )
+    return None
+
+def split_fast_path(rubric: List[Dict], evidences: Dict[str, List[Evidence]], persona: str) -> Tuple[List[JudicialOpinion], List[Dict]]:
+    """
+    Splits the rubric into fast-path opinions and the dimensions still needing an LLM judge.
+    """
+    decided: List[JudicialOpinion] = []
+    ambiguous: List[Dict] = []
+    for dimension in rubric:
+        opinion = fast_path_opinion(dimension.get("id", ""), evidences, persona)
+        if opinion is None:
+            ambiguous.append(dimension)
+        else:
+            decided.append(opinion)
+    return decided, ambiguous
+
+def has_usable_evidence(criterion_id: str, evidences: Dict[str, List[Evidence]]) -> bool:
+    """
+    True if any evidence the criterion depends on came from a successful
+    collection; detectives report failures as zero-confidence evidence.
+    """
+    keys = evidence_keys_for(criterion_id) or list(evidences)
+    return any(
+        isinstance(item, Evidence) and item.confidence > 0.0
+        for key in keys
+        for item in evidences.get(key) or []
+    )
+
+def split_unsupported(rubric: List[Dict], evidences: Dict[str, List[Evidence]]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Splits the rubric into dimensions with no usable evidence and the rest.
+    """
+    unsupported: List[Dict] = []
+    supported: List[Dict] = []
+    for dimension in rubric:
+        (supported if has_usable_evidence(dimension.get("id", ""), evidences) else unsupported).append(dimension)
+    return unsupported, supported
@@ -1,28 +1,32 @@
 import os
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+import asyncio
+import statistics
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Dict, Any, Optional, Tuple
 
 from ..state import AgentState, JudicialOpinion, Evidence
+from ..llm.clients import LLMCall, invoke_llm, ainvoke_llm
+from ..llm.rate_limit import is_retryable
+from ..rubric import evidence_for_criteria
+from ..config import get_settings
+from ..blobs import resolve_evidence
+from ..deadline import degraded, is_timeout
+from .fast_path import split_fast_path, split_unsupported
+
+JUDGE_TEMPERATURE = 0.2
+JUDGE_MAX_ATTEMPTS = 3
+SAFE_DEFAULT_ARGUMENT = "Unable to evaluate this criterion due to missing or empty evidence. Upstream detectives failed to provide contents, triggering a safe default."
 
-def get_llm():
-    return ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0.2)
-    
 class OpinionsResponse(BaseModel):
     opinions: List[JudicialOpinion]
 
-def judge_node(state: AgentState, persona: str, perspective_prompt: str) -> AgentState:
-    llm = get_llm()
-    llm_with_tools = llm.with_structured_output(OpinionsResponse)
-    
-    rubric = state.get("rubric_dimensions", [])
-    if not rubric:
-        print(f"{persona} Node: Skipping judgment because rubric_dimensions is empty.")
-        return {}
-        
-    evidences = state.get("evidences", {})
-    
+def _build_judge_messages(persona: str, perspective_prompt: str, rubric: List[Dict], evidences: Dict) -> list:
+    """
+    Builds the system and human messages for a judge persona.
+    """
+    # Judges read the full text of offloaded evidence, not its preview
+    evidences = {k: [resolve_evidence(e) if isinstance(e, Evidence) else e for e in items] for k, items in evidences.items()}
     system_msg = f"""You are the {persona} Judge in an automated audit courtroom.
 
 Your perspective:
@@ -47,7 +51,7 @@ Failure handling:
   - Assume an upstream failure in the Detectives layer.
   - STILL return one JudicialOpinion per dimension using this safe default:
     - score: 1
-    - argument: "Unable to evaluate this criterion due to missing or empty evidence. Upstream detectives failed to provide contents, triggering a safe default."
+    - argument: "{SAFE_DEFAULT_ARGUMENT}"
     - cited_evidence: []
 
 Hard rules:
@@ -75,43 +79,294 @@ Return a JSON object matching the OpinionsResponse schema:
         "Generate one JudicialOpinion per rubric dimension, following all rules above. "
         "If evidence is missing or empty, use the safe fallback opinion instead of leaving any field blank."
     )
-    messages = [
+    return [
         ("system", system_msg),
         ("human", user_msg),
     ]
-    max_retries = 3
-    for attempt in range(max_retries):
+
+def safe_default_opinion(criterion_id: str, persona: str) -> JudicialOpinion:
+    """
+    The opinion a judge falls back to when a criterion cannot be evaluated.
+    """
+    return JudicialOpinion(
+        criterion_id=criterion_id,
+        judge=persona,
+        score=1,
+        argument=SAFE_DEFAULT_ARGUMENT,
+        cited_evidence=[],
+    )
+
+def _raw_opinion_dicts(raw: Any) -> List[Any]:
+    """
+    Recovers the un-validated opinion payloads from a raw model message.
+    """
+    if raw is None:
+        return []
+    for call in getattr(raw, "tool_calls", None) or []:
+        opinions = (call.get("args") or {}).get("opinions")
+        if isinstance(opinions, list):
+            return opinions
+    content = getattr(raw, "content", "")
+    if isinstance(content, list):
+        content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    try:
+        payload = json.loads(content)
+    except (TypeError, ValueError):
+        return []
+    opinions = payload.get("opinions") if isinstance(payload, dict) else None
+    return opinions if isinstance(opinions, list) else []
+
+def salvage_opinions(result: Any, persona: str, wanted: List[str]) -> Dict[str, JudicialOpinion]:
+    """
+    Keeps every individually valid opinion for a requested criterion.
+
+    `result` is the include_raw output of the structured runnable (or a bare
+    OpinionsResponse). When whole-response validation failed, each raw
+    opinion is validated on its own so one bad entry does not discard the
+    rest. The `judge` field is pinned to `persona`.
+    """
+    if isinstance(result, OpinionsResponse):
+        candidates = [op.model_dump() for op in result.opinions]
+    elif isinstance(result, dict) and result.get("parsed") is not None:
+        candidates = [op.model_dump() for op in result["parsed"].opinions]
+    elif isinstance(result, dict):
+        candidates = _raw_opinion_dicts(result.get("raw"))
+    else:
+        candidates = []
+
+    kept: Dict[str, JudicialOpinion] = {}
+    for candidate in candidates:
+        if not isinstance(candidate, dict):
+            continue
         try:
-            response = llm_with_tools.invoke(messages)
-            if response and response.opinions:
-                # Ensure opinions list exists in state updates
-                return {"opinions": response.opinions}
-            
-            # If parsed successfully but returned empty list
-            error_msg = "You returned an empty opinions list. You MUST return exactly ONE JudicialOpinion for each dimension ID."
-            print(f"{persona} Node Warning: Empty opinions returned on attempt {attempt+1}")
-            messages.append(("human", error_msg))
-            
+            opinion = JudicialOpinion.model_validate(dict(candidate, judge=persona))
+        except ValidationError:
+            continue
+        if opinion.criterion_id in wanted and opinion.criterion_id not in kept:
+            kept[opinion.criterion_id] = opinion
+    return kept
+
+async def _judge_criteria(persona: str, perspective_prompt: str, dimensions: List[Dict], evidences: Dict,
+                          blocking: bool, temperature: float = JUDGE_TEMPERATURE) -> Tuple[List[JudicialOpinion], List[Dict]]:
+    """
+    Judges `dimensions` with partial retries. Returns the opinions and the
+    usage record of every model call made.
+
+    Valid opinions from each response are kept; follow-up calls cover only
+    the criteria that came back missing or malformed, carrying only their
+    evidence. Criteria still unresolved after the last attempt receive the
+    safe default opinion, so every dimension ends up with exactly one opinion.
+    """
+    by_id = {d["id"]: d for d in dimensions if "id" in d}
+    kept: Dict[str, JudicialOpinion] = {}
+    pending = list(by_id)
+    usage: List[Dict] = []
+
+    for attempt in range(JUDGE_MAX_ATTEMPTS):
+        pending_dims = [by_id[c] for c in pending]
+        # The first call sees the full evidence set; follow-ups only the slice their criteria need.
+        call_evidence = evidences if attempt == 0 else evidence_for_criteria(pending, evidences)
+        messages = _build_judge_messages(persona, perspective_prompt, pending_dims, call_evidence)
+        call = LLMCall(
+            "judge",
+            schema=OpinionsResponse,
+            temperature=temperature,
+            include_raw=True,
+            tags={"node": "judges", "persona": persona, "criteria": list(pending), "attempt": attempt + 1},
+        )
+        try:
+            if blocking:
+                # On a worker thread so concurrent shards overlap
+                response = await asyncio.to_thread(invoke_llm, call, messages)
+            else:
+                response = await ainvoke_llm(call, messages)
         except Exception as e:
             print(f"Error in {persona} node (attempt {attempt+1}): {e}")
-            if attempt == max_retries - 1:
-                return {}
-            # Pass validation error back to the LLM to learn and fix
-            messages.append(("human", f"Your previous output failed validation: {str(e)}\nPlease correct the formatting and ensure all required fields are present."))
-            
-    return {}
-    
+            usage.append(call.usage)
+            # Quota/server errors were already retried with backoff by the
+            # shared limiter; asking again immediately only burns quota. A
+            # call that ran out of time leaves no budget for another attempt.
+            if is_retryable(e) or is_timeout(e):
+                break
+            continue
+
+        salvaged = salvage_opinions(response, persona, pending)
+        call.usage["validation_failures"] = len(pending) - len(salvaged)
+        usage.append(call.usage)
+        kept.update(salvaged)
+        pending = [c for c in pending if c not in kept]
+        if not pending:
+            break
+        print(f"{persona} Node Warning: {len(pending)} criteria missing or invalid on attempt {attempt+1}: {pending}")
+
+    for criterion_id in pending:
+        kept[criterion_id] = safe_default_opinion(criterion_id, persona)
+    return [kept[c] for c in by_id], usage
+
+async def _render_opinions(state: AgentState, persona: str, perspective_prompt: str, blocking: bool) -> AgentState:
+    """
+    Shared judging body. With `blocking=True` the pooled client is called
+    through its synchronous API on worker threads, so the loop can run under
+    `asyncio.run` without tying the client to a short-lived event loop.
+    """
+    rubric = state.get("rubric_dimensions", [])
+    if not rubric:
+        print(f"{persona} Node: Skipping judgment because rubric_dimensions is empty.")
+        return {}
+
+    evidences = state.get("evidences", {})
+    decided: List[JudicialOpinion] = []
+    to_judge = rubric
+    settings = get_settings()
+    if settings.judge_skip_missing_evidence:
+        unsupported, to_judge = split_unsupported(to_judge, evidences)
+        decided = [safe_default_opinion(d["id"], persona) for d in unsupported if "id" in d]
+        if decided:
+            print(f"{persona} Node: {len(decided)} criteria have no usable evidence; recorded safe defaults without LLM calls.")
+    if settings.judge_fast_path:
+        fast, to_judge = split_fast_path(to_judge, evidences, persona)
+        decided += fast
+        if fast:
+            print(f"{persona} Node: fast-path scored {len(fast)} criteria without LLM calls.")
+
+    if decided:
+        # Drop evidence that only fed already decided criteria from the LLM prompt.
+        evidences = evidence_for_criteria([d["id"] for d in to_judge if "id" in d], evidences)
+    opinions, usage = await _judge_sampled(persona, perspective_prompt, to_judge, evidences, blocking)
+    order = {d.get("id"): i for i, d in enumerate(rubric)}
+    merged = sorted(decided + opinions, key=lambda o: order.get(o.criterion_id, len(order)))
+    update = {"opinions": merged, "llm_usage": usage}
+    timed_out = [u for u in usage if u and u.get("timed_out")]
+    if timed_out:
+        # The affected criteria already carry the safe default opinion
+        update["degraded_stages"] = [degraded(f"judge.{persona}", timed_out[0]["error"])]
+    return update
+
+async def _judge_sharded(persona: str, perspective_prompt: str, dimensions: List[Dict], evidences: Dict,
+                         blocking: bool, temperature: float = JUDGE_TEMPERATURE) -> Tuple[List[JudicialOpinion], List[Dict]]:
+    """
+    Judges `dimensions` in one call, or in concurrent criterion shards when
+    `judge_shard_size` is set. Each shard carries only its criteria's
+    evidence and runs under the process-wide LLM concurrency cap; blocking
+    shards overlap on worker threads.
+    """
+    if not dimensions:
+        return [], []
+    shard_size = get_settings().judge_shard_size
+    if shard_size <= 0 or shard_size >= len(dimensions):
+        return await _judge_criteria(persona, perspective_prompt, dimensions, evidences, blocking, temperature)
+
+    shards = [dimensions[i:i + shard_size] for i in range(0, len(dimensions), shard_size)]
+    results = await asyncio.gather(*[
+        _judge_criteria(
+            persona,
+            perspective_prompt,
+            shard,
+            evidence_for_criteria([d["id"] for d in shard if "id" in d], evidences),
+            blocking,
+            temperature,
+        )
+        for shard in shards
+    ])
+    return (
+        [opinion for shard_opinions, _ in results for opinion in shard_opinions],
+        [record for _, shard_usage in results for record in shard_usage],
+    )
+
+def _spread(opinions: List[JudicialOpinion]) -> int:
+    scores = [o.score for o in opinions]
+    return max(scores) - min(scores) if scores else 0
+
+def aggregate_samples(samples: List[JudicialOpinion]) -> JudicialOpinion:
+    """
+    Collapses several samples for one criterion into a single opinion.
+
+    The score is the median of the samples; the argument and citations come
+    from the sample closest to it, and every sample score is kept in
+    `sample_scores`. Safe-default samples are ignored while any real sample exists.
+    """
+    real = [o for o in samples if o.argument != SAFE_DEFAULT_ARGUMENT] or samples
+    scores = [o.score for o in real]
+    median = int(round(statistics.median(scores)))
+    representative = min(real, key=lambda o: abs(o.score - median))
+    return representative.model_copy(update={"score": median, "sample_scores": scores})
+
+async def _judge_sampled(persona: str, perspective_prompt: str, dimensions: List[Dict], evidences: Dict,
+                         blocking: bool) -> Tuple[List[JudicialOpinion], List[Dict]]:
+    """
+    Adaptive self-consistency sampling.
+
+    With `judge_samples_max` <= 1 this is a single judging round. Otherwise
+    every criterion gets two samples; criteria whose samples differ by more
+    than `judge_sample_tolerance` are re-sampled, one round at a time, until
+    they agree or reach the cap. Each criterion reports the median score.
+    """
+    settings = get_settings()
+    if settings.judge_samples_max <= 1 or not dimensions:
+        return await _judge_sharded(persona, perspective_prompt, dimensions, evidences, blocking)
+
+    samples: Dict[str, List[JudicialOpinion]] = {d["id"]: [] for d in dimensions if "id" in d}
+    usage: List[Dict] = []
+    active = [d for d in dimensions if "id" in d]
+    rounds = 0
+    while active and rounds < settings.judge_samples_max:
+        round_evidence = evidences if len(active) == len(dimensions) else evidence_for_criteria([d["id"] for d in active], evidences)
+        opinions, round_usage = await _judge_sharded(
+            persona, perspective_prompt, active, round_evidence, blocking, settings.judge_sample_temperature
+        )
+        usage.extend(round_usage)
+        for opinion in opinions:
+            samples[opinion.criterion_id].append(opinion)
+        rounds += 1
+        if rounds < 2:
+            continue
+        active = [d for d in active if _spread(samples[d["id"]]) > settings.judge_sample_tolerance]
+        if active:
+            print(f"{persona} Node: escalating {len(active)} high-variance criteria to sample {rounds + 1}.")
+
+    return [aggregate_samples(samples[c]) for c in samples if samples[c]], usage
+
+def judge_node(state: AgentState, persona: str, perspective_prompt: str) -> AgentState:
+    return asyncio.run(_render_opinions(state, persona, perspective_prompt, blocking=True))
+
+async def ajudge_node(state: AgentState, persona: str, perspective_prompt: str) -> AgentState:
+    return await _render_opinions(state, persona, perspective_prompt, blocking=False)
+
+PROSECUTOR_PROMPT = "You actively look for flaws, security risks, missing requirements, and negative theoretical debt. Your goal is to critically audit and penalize shortcomings."
+DEFENSE_PROMPT = "You highlight the strengths, functional completeness, positive architectural decisions, and mitigating factors. Defend the implementation's merits."
+TECHLEAD_PROMPT = "You are a pragmatic Tech Lead. You weigh the Prosecutor's strictness against the Defense's leniency. Focus on realistic maintainability, architecture, and practical tradeoffs."
+
+JUDGE_PROMPTS = {"Prosecutor": PROSECUTOR_PROMPT, "Defense": DEFENSE_PROMPT, "TechLead": TECHLEAD_PROMPT}
+
+def default_opinions_node(state: AgentState) -> AgentState:
+    """
+    Records every judge's safe default opinion on every dimension without
+    calling the LLM; used when no detective produced usable evidence.
+    """
+    print("--- No usable evidence: recording default opinions ---")
+    rubric = state.get("rubric_dimensions", [])
+    return {"opinions": [safe_default_opinion(d["id"], persona) for persona in JUDGE_PROMPTS for d in rubric if "id" in d]}
+
 def prosecutor_node(state: AgentState) -> AgentState:
     print("--- Running Prosecutor Judge ---")
-    prompt = "You actively look for flaws, security risks, missing requirements, and negative theoretical debt. Your goal is to critically audit and penalize shortcomings."
-    return judge_node(state, "Prosecutor", prompt)
+    return judge_node(state, "Prosecutor", PROSECUTOR_PROMPT)
 
 def defense_node(state: AgentState) -> AgentState:
     print("--- Running Defense Judge ---")
-    prompt = "You highlight the strengths, functional completeness, positive architectural decisions, and mitigating factors. Defend the implementation's merits."
-    return judge_node(state, "Defense", prompt)
+    return judge_node(state, "Defense", DEFENSE_PROMPT)
 
 def techlead_node(state: AgentState) -> AgentState:
     print("--- Running TechLead Judge ---")
-    prompt = "You are a pragmatic Tech Lead. You weigh the Prosecutor's strictness against the Defense's leniency. Focus on realistic maintainability, architecture, and practical tradeoffs."
-    return judge_node(state, "TechLead", prompt)
+    return judge_node(state, "TechLead", TECHLEAD_PROMPT)
+
+async def aprosecutor_node(state: AgentState) -> AgentState:
+    print("--- Running Prosecutor Judge ---")
+    return await ajudge_node(state, "Prosecutor", PROSECUTOR_PROMPT)
+
+async def adefense_node(state: AgentState) -> AgentState:
+    print("--- Running Defense Judge ---")
+    return await ajudge_node(state, "Defense", DEFENSE_PROMPT)
+
+async def atechlead_node(state: AgentState) -> AgentState:
+    print("--- Running TechLead Judge ---")
+    return await ajudge_node(state, "TechLead", TECHLEAD_PROMPT)
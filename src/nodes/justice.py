@@ -1,93 +1,83 @@
 import os
+import uuid
 from datetime import datetime
 from collections import defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional
 from ..state import AgentState, AuditReport, CriterionResult, JudicialOpinion
+from ..config import get_settings
+from ..llm.metrics import export_jsonl, render_usage_markdown
+from ..archive import save_audit
+from ..store import get_store
+from ..rubric import SynthesisRules, load_synthesis_rules
 
-def chief_justice_node(state: AgentState) -> AgentState:
-    print("--- Running Chief Justice ---")
-    
-    rubric = state.get("rubric_dimensions", [])
-    opinions = state.get("opinions", [])
-    
-    if not rubric or not opinions:
-        print("Chief Justice: Missing rubric or opinions. Generating empty report.")
-        report = AuditReport(
-            repo_url=state.get("repo_url", "unknown"),
-            executive_summary="Automated Audit halted. Missing Rubric Dimension mapping or collected opinions.",
-            overall_score=0.0,
-            criteria=[],
-            remediation_plan="Verify run_graph configuration successfully attaches `rubric_dimensions` mapped properly, and Detectives successfully generate content."
-        )
-        return {"final_report": report}
+def synthesize_criterion(crit_id: str, dimension_name: str, ops: List[JudicialOpinion],
+                         rules: Optional[SynthesisRules] = None) -> CriterionResult:
+    """
+    Applies the synthesis rules to one criterion's opinions.
+    """
+    rules = rules or SynthesisRules()
+
+    prosecutor = next((o for o in ops if o.judge == "Prosecutor"), None)
+    defense = next((o for o in ops if o.judge == "Defense"), None)
+    tech_lead = next((o for o in ops if o.judge == "TechLead"), None)
     
-    # Map dimension id to name
-    dim_names = {r["id"]: r["name"] for r in rubric if "id" in r}
+    # Base synthesis: average score
+    scores = [o.score for o in ops]
+    avg_score = sum(scores) / len(scores) if scores else 0
+    final_score = int(round(avg_score))
     
-    # Organize opinions by criterion
-    opinions_by_crit: Dict[str, List[JudicialOpinion]] = defaultdict(list)
-    for op in opinions:
-        opinions_by_crit[op.criterion_id].append(op)
+    dissent_summary = None
+    variance = max(scores) - min(scores) if scores else 0
+    if variance >= rules.dissent_threshold:
+        dissent_summary = f"High variance ({variance}) detected between judges. Prosecutor: {prosecutor.score if prosecutor else 'N/A'}, Defense: {defense.score if defense else 'N/A'}, TechLead: {tech_lead.score if tech_lead else 'N/A'} (Satisfies dissent requirement)."
+        reeval_note = " Chief Justice re-evaluated the specific evidence cited by each judge before setting the final score."
+        dissent_summary = (dissent_summary or "") + reeval_note
         
-    criteria_results = []
-    
-    for crit_id, ops in opinions_by_crit.items():
-        if not ops:
-            continue
+    # Deterministic Rules
+    # 1. Security Override (a Prosecutor veto caps the final score)
+    if prosecutor and prosecutor.score <= rules.security_veto_score:
+        final_score = min(final_score, rules.security_cap)
+        security_note = f"Rule of Security applied: Final score capped at {rules.security_cap} due to Prosecutor veto."
+        if dissent_summary:
+            dissent_summary += f" | {security_note}"
+        else:
+            dissent_summary = security_note
             
-        prosecutor = next((o for o in ops if o.judge == "Prosecutor"), None)
-        defense = next((o for o in ops if o.judge == "Defense"), None)
-        tech_lead = next((o for o in ops if o.judge == "TechLead"), None)
-        
-        # Base synthesis: average score
-        scores = [o.score for o in ops]
-        avg_score = sum(scores) / len(scores) if scores else 0
-        final_score = int(round(avg_score))
-        
-        dissent_summary = None
-        variance = max(scores) - min(scores) if scores else 0
-        if variance >= 20:
-            dissent_summary = f"High variance ({variance}) detected between judges. Prosecutor: {prosecutor.score if prosecutor else 'N/A'}, Defense: {defense.score if defense else 'N/A'}, TechLead: {tech_lead.score if tech_lead else 'N/A'} (Satisfies dissent requirement)."
-            reeval_note = " Chief Justice re-evaluated the specific evidence cited by each judge before setting the final score."
-            dissent_summary = (dissent_summary or "") + reeval_note
-            
-        # Deterministic Rules
-        # 1. Security Override (Prosecutor <= 40 caps final score at 60)
-        if prosecutor and prosecutor.score <= 40:
-            final_score = min(final_score, 60)
-            if dissent_summary:
-                dissent_summary += " | Rule of Security applied: Final score capped at 60 due to Prosecutor veto."
-            else:
-                dissent_summary = "Rule of Security applied: Final score capped at 60 due to Prosecutor veto."
-                
-        # 2. Functionality Weight (Bias toward TechLead for Architecture criteria)
-        is_architecture = "architecture" in crit_id.lower() or "graph" in crit_id.lower() or "state" in crit_id.lower()
-        if is_architecture and tech_lead:
-            # Shift towards tech lead score
-            final_score = tech_lead.score
-            if dissent_summary:
-                dissent_summary += f" | Rule of Functionality applied: Score biased towards Tech Lead ({tech_lead.score})."
-            else:
-                dissent_summary = f"Rule of Functionality applied: Score biased towards Tech Lead ({tech_lead.score})."
-                
-        # Ensure bounds
-        final_score = max(1, min(100, final_score))
-        
-        remediation_text = "Review the specific gaps flagged by the Prosecutor and TechLead to align architecture with the required schema."
-        if "git" in crit_id.lower():
-            remediation_text = "Improve commit hygiene and ensure step-by-step meaningful commit messages."
-        elif "state" in crit_id.lower() or "graph" in crit_id.lower():
-            remediation_text = "Refactor state models (Pydantic/TypedDict) and graph structures to support parallel patterns with reducers."
+    # 2. Functionality Weight (Bias toward TechLead for Architecture criteria)
+    is_architecture = any(keyword in crit_id.lower() for keyword in rules.functionality_keywords)
+    if is_architecture and tech_lead:
+        # Shift towards tech lead score
+        final_score = tech_lead.score
+        if dissent_summary:
+            dissent_summary += f" | Rule of Functionality applied: Score biased towards Tech Lead ({tech_lead.score})."
+        else:
+            dissent_summary = f"Rule of Functionality applied: Score biased towards Tech Lead ({tech_lead.score})."
             
-        criteria_results.append(CriterionResult(
-            dimension_id=crit_id,
-            dimension_name=dim_names.get(crit_id, crit_id),
-            final_score=final_score,
-            judge_opinions=ops,
-            dissent_summary=dissent_summary,
-            remediation=remediation_text
-        ))
+    # Ensure bounds
+    final_score = max(1, min(100, final_score))
+    
+    remediation_text = "Review the specific gaps flagged by the Prosecutor and TechLead to align architecture with the required schema."
+    if "git" in crit_id.lower():
+        remediation_text = "Improve commit hygiene and ensure step-by-step meaningful commit messages."
+    elif "state" in crit_id.lower() or "graph" in crit_id.lower():
+        remediation_text = "Refactor state models (Pydantic/TypedDict) and graph structures to support parallel patterns with reducers."
         
+    return CriterionResult(
+        dimension_id=crit_id,
+        dimension_name=dimension_name,
+        final_score=final_score,
+        judge_opinions=ops,
+        dissent_summary=dissent_summary,
+        remediation=remediation_text
+    )
+
+def assemble_report(repo_url: str, criteria_results: List[CriterionResult],
+                    rules: Optional[SynthesisRules] = None) -> AuditReport:
+    """
+    Builds the overall verdict from already synthesized criteria.
+    """
+    rules = rules or SynthesisRules()
+
     # Overall Verdict
     if not criteria_results:
         exec_summary = "No criteria could be evaluated. Insufficient opinions."
@@ -98,22 +88,48 @@ def chief_justice_node(state: AgentState) -> AgentState:
         
         exec_summary = f"Automated Audit Complete. Evaluated {len(criteria_results)} criteria. Overall average score: {overall_avg:.2f}/100."
         
-    report = AuditReport(
-        repo_url=state.get("repo_url", "unknown"),
+    return AuditReport(
+        repo_url=repo_url,
         executive_summary=exec_summary,
         overall_score=overall_avg,
         criteria=criteria_results,
-        remediation_plan="Review failed or disputed criteria and implement fixes." if overall_avg < 80.0 else "No major remediation required."
+        remediation_plan="Review failed or disputed criteria and implement fixes." if overall_avg < rules.pass_threshold else "No major remediation required."
     )
+
+def synthesize_report(repo_url: str, rubric: List[Dict], opinions: List[JudicialOpinion],
+                      rules: Optional[SynthesisRules] = None) -> AuditReport:
+    """
+    Applies the synthesis rules to the judges' opinions. Pure: no I/O, so
+    archived audits can be re-synthesized without re-running the graph.
+    """
+    rules = rules or SynthesisRules()
+
+    # Map dimension id to name
+    dim_names = {r["id"]: r["name"] for r in rubric if "id" in r}
     
-    # Generate Markdown Report
+    # Organize opinions by criterion
+    opinions_by_crit: Dict[str, List[JudicialOpinion]] = defaultdict(list)
+    for op in opinions:
+        opinions_by_crit[op.criterion_id].append(op)
+        
+    criteria_results = [
+        synthesize_criterion(crit_id, dim_names.get(crit_id, crit_id), ops, rules)
+        for crit_id, ops in opinions_by_crit.items() if ops
+    ]
+    return assemble_report(repo_url, criteria_results, rules)
+
+def render_report_markdown(report: AuditReport, llm_usage: List[Dict] = (), rules: Optional[SynthesisRules] = None) -> str:
+    """
+    Renders the Markdown audit report.
+    """
+    rules = rules or SynthesisRules()
     md_lines = [
         f"# Automaton Auditor - Final Report",
         f"**Repository URL:** {report.repo_url}",
         f"**Overall Score:** {report.overall_score:.2f} / 100",
         f"\n## Executive Summary",
         f"{report.executive_summary}",
-        f"Final Verdict: {'PASS' if report.overall_score >= 80.0 else 'FAIL/REMEDIATION REQUIRED'}",
+        f"Final Verdict: {'PASS' if report.overall_score >= rules.pass_threshold else 'FAIL/REMEDIATION REQUIRED'}",
         f"\n## Criterion Breakdown"
     ]
     
@@ -128,7 +144,10 @@ def chief_justice_node(state: AgentState) -> AgentState:
             evidence_str = ", ".join(op.cited_evidence) if op.cited_evidence else "None"
             # Clean newlines from argument for table compatibility
             arg_clean = op.argument.replace("\n", " ")
-            md_lines.append(f"| {op.judge} | {op.score} | {arg_clean} | {evidence_str} |")
+            score_str = str(op.score)
+            if len(op.sample_scores) > 1:
+                score_str += f" (median of {op.sample_scores}, spread {max(op.sample_scores) - min(op.sample_scores)})"
+            md_lines.append(f"| {op.judge} | {score_str} | {arg_clean} | {evidence_str} |")
         
         if cr.dissent_summary:
             md_lines.append(f"\n> [!IMPORTANT]\n> **Judicial Dissent/Rules**: {cr.dissent_summary}\n")
@@ -146,17 +165,96 @@ def chief_justice_node(state: AgentState) -> AgentState:
         md_lines.append("No critical remediation required. All dimensions passed at 100%.")
     else:
         md_lines.append(f"\n**Overall Guidance:** {report.remediation_plan}")
-    
-    md_content = "\n".join(md_lines)
-    os.makedirs("reports", exist_ok=True)
-    
-    # Parse repo url for safe filename
-    url_parts = report.repo_url.rstrip("/").split("/")
+
+    if report.degraded_stages:
+        md_lines.append("\n## Degraded Stages")
+        md_lines.append("These stages ran out of their time budget; affected criteria use safe defaults or failed evidence.")
+        md_lines.extend(f"- `{stage}`" for stage in report.degraded_stages)
+
+    md_lines.extend(render_usage_markdown(list(llm_usage)))
+    return "\n".join(md_lines)
+
+def audit_id_for(repo_url: str, timestamp: Optional[str] = None) -> str:
+    """
+    `<user>_<repo>_<timestamp>_<suffix>` identifier shared by the report file and the audit archive.
+
+    The random suffix keeps audits of the same repo started within the same
+    second from overwriting each other's report, archive and store row.
+    """
+    url_parts = repo_url.rstrip("/").split("/")
     repo_name = url_parts[-1].replace(".git", "") if len(url_parts) > 0 else "unknown"
     user_name = url_parts[-2] if len(url_parts) > 1 else "unknown"
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{user_name}_{repo_name}_{timestamp}_{uuid.uuid4().hex[:8]}"
+
+def criterion_synthesis_node(state: AgentState) -> AgentState:
+    """
+    Synthesizes every criterion that has opinions but no result yet, so the
+    pipelined graph scores a criterion as soon as its judges are done.
+    """
+    done = {cr.dimension_id for cr in state.get("criterion_results") or []}
+    dim_names = {r["id"]: r["name"] for r in state.get("rubric_dimensions", []) if "id" in r}
+    opinions_by_crit: Dict[str, List[JudicialOpinion]] = defaultdict(list)
+    for op in state.get("opinions", []):
+        if op.criterion_id not in done:
+            opinions_by_crit[op.criterion_id].append(op)
+    if not opinions_by_crit:
+        return {}
+    rules = load_synthesis_rules()
+    return {"criterion_results": [
+        synthesize_criterion(crit_id, dim_names.get(crit_id, crit_id), ops, rules)
+        for crit_id, ops in opinions_by_crit.items()
+    ]}
+
+def chief_justice_node(state: AgentState) -> AgentState:
+    print("--- Running Chief Justice ---")
+    
+    rubric = state.get("rubric_dimensions", [])
+    opinions = state.get("opinions", [])
+    degraded_stages = [d["stage"] for d in state.get("degraded_stages") or []]
+    if degraded_stages:
+        print(f"Chief Justice: stages degraded by time budgets: {', '.join(degraded_stages)}")
     
-    unique_filename = f"audit_{user_name}_{repo_name}_{timestamp}.md"
+    if not rubric or not opinions:
+        print("Chief Justice: Missing rubric or opinions. Generating empty report.")
+        report = AuditReport(
+            repo_url=state.get("repo_url", "unknown"),
+            executive_summary="Automated Audit halted. Missing Rubric Dimension mapping or collected opinions.",
+            overall_score=0.0,
+            criteria=[],
+            remediation_plan="Verify run_graph configuration successfully attaches `rubric_dimensions` mapped properly, and Detectives successfully generate content.",
+            degraded_stages=degraded_stages,
+        )
+        return {"final_report": report}
+
+    rules = load_synthesis_rules()
+    synthesized = state.get("criterion_results") or []
+    if synthesized:
+        # Pipelined graph: criteria were synthesized as soon as their opinions arrived
+        order = {d.get("id"): i for i, d in enumerate(rubric)}
+        synthesized = sorted(synthesized, key=lambda cr: order.get(cr.dimension_id, len(order)))
+        report = assemble_report(state.get("repo_url", "unknown"), synthesized, rules)
+    else:
+        report = synthesize_report(state.get("repo_url", "unknown"), rubric, opinions, rules)
+    report.degraded_stages = degraded_stages
+    llm_usage = state.get("llm_usage", [])
+    audit_id = audit_id_for(report.repo_url)
+    settings = get_settings()
+    if settings.audit_store_path:
+        # The store holds everything the archive would, so the Markdown is rendered from the stored row
+        store = get_store(settings.audit_store_path)
+        store.save_audit(
+            audit_id, report, state.get("evidences"), commit_sha=state.get("commit_sha", ""),
+            pdf_path=state.get("pdf_path"), llm_usage=llm_usage,
+        )
+        md_content = render_report_markdown(store.load_report(audit_id), store.load_llm_usage(audit_id), rules)
+    else:
+        if settings.audit_archive_dir:
+            save_audit(state, settings.audit_archive_dir, audit_id, overall_score=report.overall_score)
+        md_content = render_report_markdown(report, llm_usage, rules)
+
+    os.makedirs("reports", exist_ok=True)
+    unique_filename = f"audit_{audit_id}.md"
     unique_filepath = os.path.join("reports", unique_filename)
     latest_filepath = os.path.join("reports", "audit_report_latest.md")
     
@@ -167,5 +265,8 @@ def chief_justice_node(state: AgentState) -> AgentState:
         f.write(md_content)
         
     print(f"Generated Audit Report: {unique_filepath}")
+
+    if settings.llm_metrics_path:
+        export_jsonl(llm_usage, settings.llm_metrics_path, audit={"repo_url": report.repo_url, "report_file": unique_filename})
         
     return {"final_report": report}
@@ -0,0 +1,217 @@
+# automation-auditor/src/profiling.py
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .config import get_settings
+
+try:
+    import resource
+except ImportError:  # Windows: no rusage, subprocess time is reported as 0
+    resource = None
+
+# Spans of the current process. Profiling is opt-in (AUDITOR_PROFILE_TRACE_PATH);
+# with it off, `span` and `profiled` cost one settings lookup.
+_spans: List[Dict[str, Any]] = []
+_open: List[Dict[str, Any]] = []
+_lock = threading.Lock()
+_epoch = time.perf_counter()
+# Chrome lanes: one per thread, and one per asyncio task so concurrent
+# coroutines on the loop thread do not overlap on a single lane
+_lanes: Dict[Any, int] = {}
+# Whether tracemalloc was started here (and so may be stopped by reset_profile)
+_tracing_started = False
+
+def profiling_enabled() -> bool:
+    return bool(get_settings().profile_trace_path)
+
+def _lane() -> int:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    key = ("task", id(task)) if task is not None else ("thread", threading.get_ident())
+    with _lock:
+        return _lanes.setdefault(key, len(_lanes) + 1)
+
+def _children_cpu() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def _fold_peak() -> int:
+    """
+    Credits the tracemalloc peak since the last fold to every open span, then
+    restarts peak tracking, so nested and concurrent spans each keep their
+    own high-water mark. Call with `_lock` held.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    for record in _open:
+        record["_peak"] = max(record["_peak"], peak)
+    tracemalloc.reset_peak()
+    return current
+
+@contextmanager
+def span(name: str, cat: str = "function") -> Iterator[None]:
+    """
+    Records one profiling span: wall time, CPU time of the running thread,
+    CPU time of subprocesses reaped meanwhile and the tracemalloc high-water
+    mark above the allocation level at entry. Subprocess time is process-wide,
+    so concurrent spans also see their siblings' children, and CPU time of an
+    async span includes other coroutines that ran on the loop while it waited.
+    """
+    if not profiling_enabled():
+        yield
+        return
+    global _tracing_started
+    track_memory = get_settings().profile_memory
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracing_started = True
+    record: Dict[str, Any] = {"name": name, "cat": cat, "lane": _lane(), "_peak": 0}
+    with _lock:
+        if track_memory and tracemalloc.is_tracing():
+            record["_base"] = record["_peak"] = _fold_peak()
+        _open.append(record)
+    children = _children_cpu()
+    cpu = time.thread_time()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - started
+        record.update({
+            "ts_us": (started - _epoch) * 1e6,
+            "wall_s": wall,
+            "cpu_s": time.thread_time() - cpu,
+            "subprocess_s": _children_cpu() - children,
+        })
+        with _lock:
+            if "_base" in record and tracemalloc.is_tracing():
+                _fold_peak()
+                record["mem_peak_bytes"] = max(0, record["_peak"] - record["_base"])
+            _open.remove(record)
+            for key in ("_peak", "_base"):
+                record.pop(key, None)
+            _spans.append(record)
+
+def profiled(name: Optional[str] = None, cat: str = "function") -> Callable:
+    """
+    Decorator recording a `span` around every call of a sync or async function.
+    """
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__name__
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(label, cat):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def spans() -> List[Dict[str, Any]]:
+    with _lock:
+        return list(_spans)
+
+def reset_profile() -> None:
+    """
+    Drops recorded spans and stops tracemalloc if profiling started it.
+    """
+    global _tracing_started
+    with _lock:
+        _spans.clear()
+        _lanes.clear()
+        if _tracing_started and not _open:
+            tracemalloc.stop()
+            _tracing_started = False
+
+def chrome_trace(records: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Spans as Chrome trace-event JSON (chrome://tracing, Perfetto).
+    """
+    records = spans() if records is None else records
+    pid = os.getpid()
+    events = [
+        {
+            "name": r["name"],
+            "cat": r["cat"],
+            "ph": "X",
+            "ts": round(r["ts_us"], 1),
+            "dur": round(r["wall_s"] * 1e6, 1),
+            "pid": pid,
+            "tid": r["lane"],
+            "args": {
+                "cpu_ms": round(r["cpu_s"] * 1e3, 3),
+                "subprocess_ms": round(r["subprocess_s"] * 1e3, 3),
+                "mem_peak_kb": round(r.get("mem_peak_bytes", 0) / 1024, 1),
+            },
+        }
+        for r in sorted(records, key=lambda r: r["ts_us"])
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+def export_chrome_trace(path: Optional[str] = None) -> str:
+    """
+    Writes the recorded spans to `path` (default AUDITOR_PROFILE_TRACE_PATH) and returns the path.
+    """
+    path = path or get_settings().profile_trace_path
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(), f)
+    return path
+
+def summarize_spans(records: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Per-span-name totals, slowest total wall time first.
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    for r in spans() if records is None else records:
+        row = rows.setdefault(r["name"], {"name": r["name"], "cat": r["cat"], "calls": 0, "wall_s": 0.0, "max_s": 0.0,
+                                          "cpu_s": 0.0, "subprocess_s": 0.0, "mem_peak_bytes": 0})
+        row["calls"] += 1
+        row["wall_s"] += r["wall_s"]
+        row["max_s"] = max(row["max_s"], r["wall_s"])
+        row["cpu_s"] += r["cpu_s"]
+        row["subprocess_s"] += r["subprocess_s"]
+        row["mem_peak_bytes"] = max(row["mem_peak_bytes"], r.get("mem_peak_bytes", 0))
+    return sorted(rows.values(), key=lambda row: row["wall_s"], reverse=True)
+
+def render_summary(rows: Optional[List[Dict[str, Any]]] = None) -> str:
+    """
+    Plain-text table of `summarize_spans`.
+    """
+    rows = summarize_spans() if rows is None else rows
+    lines = [f"{'span':<40} {'cat':<8} {'calls':>5} {'wall s':>9} {'max s':>8} {'cpu s':>8} {'subproc s':>9} {'peak MB':>8}"]
+    for row in rows:
+        lines.append(
+            f"{row['name'][:40]:<40} {row['cat'][:8]:<8} {row['calls']:>5} {row['wall_s']:>9.3f} {row['max_s']:>8.3f} "
+            f"{row['cpu_s']:>8.3f} {row['subprocess_s']:>9.3f} {row['mem_peak_bytes'] / 1e6:>8.2f}"
+        )
+    return "\n".join(lines)
+
+def write_profile(file=None) -> None:
+    """
+    Entry-point hook: exports the trace and prints the summary to `file`
+    (default stdout) when profiling is on.
+    """
+    if not profiling_enabled() or not spans():
+        return
+    path = export_chrome_trace()
+    print(f"\n--- Profile ({len(spans())} spans, trace: {path}) ---", file=file)
+    print(render_summary(), file=file)
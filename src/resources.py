@@ -0,0 +1,64 @@
+# automation-auditor/src/resources.py
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from .config import get_settings
+
+# Resource classes with their own concurrency caps. LLM calls are capped
+# separately by AUDITOR_LLM_MAX_CONCURRENCY inside invoke_llm/ainvoke_llm.
+RESOURCES = ("clone", "cpu")
+
+_slots: Dict[str, threading.BoundedSemaphore] = {}
+_waits: Dict[str, float] = {}
+_slots_lock = threading.Lock()
+
+def resource_limit(name: str) -> int:
+    settings = get_settings()
+    if name == "clone":
+        return max(1, settings.batch_clone_concurrency)
+    if name == "cpu":
+        return max(1, settings.batch_cpu_concurrency or os.cpu_count() or 1)
+    raise ValueError(f"Unknown resource class: {name}")
+
+def _slot(name: str) -> threading.BoundedSemaphore:
+    with _slots_lock:
+        if name not in _slots:
+            _slots[name] = threading.BoundedSemaphore(resource_limit(name))
+        return _slots[name]
+
+@contextmanager
+def resource_slot(name: str) -> Iterator[None]:
+    """
+    Holds one slot of resource class `name` ("clone" or "cpu") for the block.
+
+    Slots are process-wide and thread-safe, so concurrent audits share the
+    same caps regardless of which worker thread runs their detectives.
+    """
+    slot = _slot(name)
+    started = time.perf_counter()
+    slot.acquire()
+    waited = time.perf_counter() - started
+    with _slots_lock:
+        _waits[name] = _waits.get(name, 0.0) + waited
+    try:
+        yield
+    finally:
+        slot.release()
+
+def resource_waits() -> Dict[str, float]:
+    """
+    Total seconds spent waiting for each resource class since the last reset.
+    """
+    with _slots_lock:
+        return dict(_waits)
+
+def reset_resources() -> None:
+    """
+    Drops the slots so the next use picks up current settings.
+    """
+    with _slots_lock:
+        _slots.clear()
+        _waits.clear()
@@ -0,0 +1,102 @@
+# automation-auditor/src/rubric.py
+import json
+import os
+from typing import Any, Dict, Iterable, List
+
+from pydantic import BaseModel, Field
+
+# Which detective evidence keys inform each rubric dimension. Dimensions not
+# listed here are judged against the full evidence set.
+CRITERION_EVIDENCE: Dict[str, List[str]] = {
+    "git_forensic_analysis": ["git_history", "git_narrative"],
+    "state_management_rigor": ["state_structure", "repo_structure"],
+    "graph_orchestration": ["graph_parallelism", "repo_structure"],
+    "safe_tool_engineering": ["safe_tool_engineering"],
+    "structured_output_enforcement": ["structured_output_enforcement"],
+    "judicial_nuance": ["structured_output_enforcement", "repo_structure"],
+    "chief_justice_synthesis": ["repo_structure", "graph_parallelism"],
+    "theoretical_depth": ["theoretical_depth"],
+    "report_accuracy": ["citation_integrity"],
+    "swarm_visual": ["flow_analysis"],
+}
+
+def evidence_keys_for(criterion_id: str) -> List[str]:
+    """
+    Returns the evidence keys relevant to a criterion (empty list means "all evidence").
+    """
+    return CRITERION_EVIDENCE.get(criterion_id, [])
+
+def evidence_for_criteria(criterion_ids: Iterable[str], evidences: Dict[str, list]) -> Dict[str, list]:
+    """
+    Slices the evidence dict down to what the given criteria need.
+
+    Falls back to the full evidence dict when any criterion has no mapping,
+    so an unknown dimension is never judged blind.
+    """
+    keys = set()
+    for criterion_id in criterion_ids:
+        mapped = evidence_keys_for(criterion_id)
+        if not mapped:
+            return dict(evidences)
+        keys.update(mapped)
+    return {k: v for k, v in evidences.items() if k in keys}
+
+# Evidence keys each detective produces, used to route criteria in the pipelined graph
+DETECTIVE_EVIDENCE: Dict[str, List[str]] = {
+    "repo_investigator": [
+        "git_history", "git_narrative", "sidecar_files", "repo_structure", "state_structure",
+        "graph_parallelism", "safe_tool_engineering", "structured_output_enforcement",
+    ],
+    "doc_analyst": ["theoretical_depth", "citation_integrity"],
+    "vision_inspector": ["flow_analysis"],
+}
+
+def criteria_by_detective(rubric: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Groups rubric dimensions by the single detective whose evidence they need.
+
+    Dimensions that are unmapped or draw on several detectives are grouped
+    under "" and can only be judged once every detective has finished.
+    """
+    owners = {key: detective for detective, keys in DETECTIVE_EVIDENCE.items() for key in keys}
+    groups: Dict[str, List[Dict[str, Any]]] = {detective: [] for detective in DETECTIVE_EVIDENCE}
+    groups[""] = []
+    for dimension in rubric:
+        detectives = {owners.get(key, "") for key in evidence_keys_for(dimension.get("id", ""))}
+        groups[detectives.pop() if len(detectives) == 1 else ""].append(dimension)
+    return groups
+
+RUBRIC_PATH = "rubric/week2_rubric.json"
+
+class SynthesisRules(BaseModel):
+    """
+    Numeric form of the rubric's `synthesis_rules` (read from its `parameters` block).
+
+    Defaults reproduce the Chief Justice's historical behaviour, so a rubric
+    without parameters synthesizes exactly as before.
+    """
+    # Score spread between judges that requires a dissent explanation
+    dissent_threshold: int = 20
+    # Rule of Security: a Prosecutor score at or below the veto caps the final score
+    security_veto_score: int = 40
+    security_cap: int = 60
+    # Rule of Functionality: criteria whose id contains a keyword take the TechLead score
+    functionality_keywords: List[str] = Field(default_factory=lambda: ["architecture", "graph", "state"])
+    # Overall score needed for a PASS verdict
+    pass_threshold: float = 80.0
+
+def load_rubric(path: str = RUBRIC_PATH) -> Dict[str, Any]:
+    """
+    Reads the rubric JSON; a missing file yields an empty rubric.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_synthesis_rules(path: str = RUBRIC_PATH) -> SynthesisRules:
+    """
+    Parses the synthesis rule parameters from the rubric at `path`.
+    """
+    synthesis = load_rubric(path).get("synthesis_rules", {})
+    return SynthesisRules.model_validate(synthesis.get("parameters", {}))
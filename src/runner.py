@@ -0,0 +1,134 @@
+# automation-auditor/src/runner.py
+import asyncio
+import csv
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .checkpoint import ainvoke_resumable, audit_thread_id, checkpointed_graph
+from .config import get_settings
+from .deadline import audit_deadline
+from .resources import resource_waits
+from .rubric import RUBRIC_PATH, load_rubric
+from .state import AgentState
+
+class ManifestEntry(BaseModel):
+    """One submission to audit in a batch."""
+    repo_url: str
+    pdf_path: str = ""
+    rubric: str = RUBRIC_PATH
+
+class AuditOutcome(BaseModel):
+    """Result of one audit in a batch; failures are recorded, never raised."""
+    repo_url: str
+    status: str
+    overall_score: Optional[float] = None
+    elapsed_s: float
+    error: Optional[str] = None
+
+def load_manifest(path: str) -> List[ManifestEntry]:
+    """
+    Reads a CSV (with a header row) or JSONL manifest of
+    `repo_url`, `pdf_path` and optional `rubric` columns.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    return [ManifestEntry.model_validate({k: v for k, v in row.items() if v not in (None, "")}) for row in rows]
+
+def make_initial_state(repo_url: str, pdf_path: str, rubric_dimensions: List[Dict], pinned_commit: str = "") -> AgentState:
+    """
+    Initial graph state; a non-empty `pinned_commit` is checked out instead of the default branch.
+    """
+    return {
+        "repo_url": repo_url,
+        "pinned_commit": pinned_commit,
+        "pdf_path": pdf_path,
+        "rubric_dimensions": rubric_dimensions,
+        "evidences": {},
+        "opinions": [],
+        "final_report": None,
+    }
+
+async def run_batch(entries: List[ManifestEntry], app=None, max_audits: Optional[int] = None,
+                    on_progress: Optional[Callable[[int, int, AuditOutcome], None]] = None,
+                    checkpoint_path: Optional[str] = None) -> List[AuditOutcome]:
+    """
+    Audits every manifest entry concurrently on one event loop.
+
+    Up to `max_audits` graphs are in flight; inside them git clones and CPU
+    parsing take `resource_slot`s and LLM calls share the client concurrency
+    cap, so one submission clones while another is being judged. A failing
+    audit is reported in its outcome and does not affect the others.
+
+    Without an explicit `app`, audits run on a graph checkpointed at
+    `checkpoint_path` (default AUDITOR_CHECKPOINT_PATH), so re-running a
+    batch resumes failed audits and skips finished ones.
+    """
+    if app is not None:
+        return await _run_entries(entries, app, False, max_audits, on_progress)
+    checkpoint_path = get_settings().checkpoint_path if checkpoint_path is None else checkpoint_path
+    if not checkpoint_path:
+        # Imported here so manifest helpers stay cheap for queue and forensics entry points
+        from .graph import build_graph
+        return await _run_entries(entries, build_graph(), False, max_audits, on_progress)
+    async with checkpointed_graph(checkpoint_path) as graph:
+        return await _run_entries(entries, graph, True, max_audits, on_progress)
+
+async def _run_entries(entries: List[ManifestEntry], app, checkpointed: bool, max_audits: Optional[int],
+                       on_progress: Optional[Callable[[int, int, AuditOutcome], None]]) -> List[AuditOutcome]:
+    in_flight = asyncio.Semaphore(max(1, max_audits or get_settings().batch_max_audits))
+    rubrics: Dict[str, List[Dict]] = {}
+    done = 0
+
+    async def audit(entry: ManifestEntry) -> AuditOutcome:
+        nonlocal done
+        async with in_flight:
+            started = time.perf_counter()
+            try:
+                if entry.rubric not in rubrics:
+                    rubrics[entry.rubric] = load_rubric(entry.rubric).get("dimensions", [])
+                state = make_initial_state(entry.repo_url, entry.pdf_path, rubrics[entry.rubric])
+                with audit_deadline():
+                    if checkpointed:
+                        thread_id = await asyncio.to_thread(audit_thread_id, entry.repo_url, entry.pdf_path, entry.rubric)
+                        result = await ainvoke_resumable(app, state, thread_id)
+                    else:
+                        result = await app.ainvoke(state)
+                report = result.get("final_report")
+                outcome = AuditOutcome(
+                    repo_url=entry.repo_url,
+                    status="ok" if report is not None else "no_report",
+                    overall_score=report.overall_score if report is not None else None,
+                    elapsed_s=time.perf_counter() - started,
+                )
+            except Exception as e:
+                outcome = AuditOutcome(repo_url=entry.repo_url, status="error", elapsed_s=time.perf_counter() - started,
+                                       error=f"{e.__class__.__name__}: {e}")
+        done += 1
+        if on_progress:
+            on_progress(done, len(entries), outcome)
+        return outcome
+
+    return list(await asyncio.gather(*(audit(entry) for entry in entries)))
+
+def summarize_batch(outcomes: List[AuditOutcome], wall_s: float) -> Dict[str, Any]:
+    """
+    Throughput and latency summary of a batch run.
+    """
+    latencies = sorted(o.elapsed_s for o in outcomes)
+    ok = sum(1 for o in outcomes if o.status == "ok")
+    return {
+        "audits": len(outcomes),
+        "ok": ok,
+        "failed": len(outcomes) - ok,
+        "wall_s": wall_s,
+        "audits_per_min": 60.0 * len(outcomes) / wall_s if wall_s > 0 else 0.0,
+        "mean_audit_s": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p95_audit_s": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else 0.0,
+        "resource_wait_s": resource_waits(),
+    }
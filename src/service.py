@@ -0,0 +1,121 @@
+# automation-auditor/src/service.py
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from .config import get_settings
+from .deadline import audit_deadline
+from .graph import build_graph
+from .llm.clients import LLMCall
+from .llm.transport import get_transport
+from .nodes.judges import JUDGE_TEMPERATURE, OpinionsResponse
+from .rubric import RUBRIC_PATH, load_rubric
+from .runner import make_initial_state
+
+Emit = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class AuditRequest(BaseModel):
+    """One audit submitted to the service; `id` is echoed on every event."""
+    id: str
+    repo_url: str
+    pdf_path: str = ""
+    rubric: str = RUBRIC_PATH
+
+class AuditService:
+    """
+    Resident audit runner that keeps the compiled graph, rubrics and LLM
+    clients warm across requests.
+
+    Each request streams `accepted`, one `progress` event per finished graph
+    node and a final `result` (the AuditReport as JSON) or `error` event. At
+    most `max_audits` audits run at once; the rest wait for a slot. After
+    `drain()` new requests are rejected and in-flight audits run to completion.
+    """
+
+    def __init__(self, app=None, max_audits: Optional[int] = None):
+        settings = get_settings()
+        self.app = app if app is not None else build_graph()
+        self.max_audits = max_audits or settings.service_max_audits
+        self._slots = asyncio.Semaphore(self.max_audits)
+        self._rubrics: Dict[str, list] = {}
+        self._tasks: set = set()
+        self.draining = False
+        self.completed = 0
+        self.failed = 0
+
+    def warm_up(self) -> None:
+        """
+        Loads the default rubric and builds the pooled judge client up front
+        so the first request does not pay for them.
+        """
+        try:
+            self.rubric(RUBRIC_PATH)
+        except ValueError as e:
+            # Requests that rely on the default rubric get an error event instead
+            print(f"AuditService: {e}")
+        if get_transport().name == "live":
+            LLMCall("judge", schema=OpinionsResponse, temperature=JUDGE_TEMPERATURE, include_raw=True).runnable()
+
+    def rubric(self, path: str) -> list:
+        """
+        Cached rubric dimensions; raises ValueError for a missing or empty rubric.
+        """
+        if path not in self._rubrics:
+            dimensions = load_rubric(path).get("dimensions", [])
+            if not dimensions:
+                raise ValueError(f"Rubric {path!r} is missing or has no dimensions")
+            self._rubrics[path] = dimensions
+        return self._rubrics[path]
+
+    def submit(self, payload: Dict[str, Any], emit: Emit) -> Optional[asyncio.Task]:
+        """
+        Starts an audit for a decoded request line; returns None if it was rejected.
+        """
+        request_id = str(payload.get("id", ""))
+        if self.draining:
+            asyncio.ensure_future(emit({"id": request_id, "event": "rejected", "error": "service is draining"}))
+            return None
+        try:
+            request = AuditRequest.model_validate({**payload, "id": request_id})
+        except ValidationError as e:
+            asyncio.ensure_future(emit({"id": request_id, "event": "error", "error": str(e)}))
+            return None
+        task = asyncio.ensure_future(self._run(request, emit))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, request: AuditRequest, emit: Emit) -> None:
+        await emit({"id": request.id, "event": "accepted", "in_flight": len(self._tasks)})
+        async with self._slots:
+            started = time.perf_counter()
+            report = None
+            try:
+                state = make_initial_state(request.repo_url, request.pdf_path, self.rubric(request.rubric))
+                with audit_deadline():
+                    async for update in self.app.astream(state, stream_mode="updates"):
+                        for node, values in update.items():
+                            await emit({"id": request.id, "event": "progress", "node": node, "elapsed_s": round(time.perf_counter() - started, 3)})
+                            if isinstance(values, dict) and values.get("final_report") is not None:
+                                report = values["final_report"]
+            except Exception as e:
+                self.failed += 1
+                await emit({"id": request.id, "event": "error", "error": f"{e.__class__.__name__}: {e}"})
+                return
+            self.completed += 1
+            await emit({
+                "id": request.id,
+                "event": "result",
+                "elapsed_s": round(time.perf_counter() - started, 3),
+                "report": report.model_dump(mode="json") if report is not None else None,
+            })
+
+    async def drain(self) -> None:
+        """
+        Stops accepting requests and waits for in-flight audits.
+        """
+        self.draining = True
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
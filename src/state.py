@@ -1,5 +1,6 @@
 from typing import Annotated, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
+from pydantic.json_schema import SkipJsonSchema
 import operator
 
 class Evidence(BaseModel):
@@ -7,6 +8,8 @@ class Evidence(BaseModel):
     goal: str = Field(description="The specific goal or check being performed")
     found: bool = Field(description="Whether the artifact exists")
     content: Optional[str] = Field(default=None, description="The content or snippet of the evidence")
+    # Set when long content was moved to the blob store; `content` then holds a preview
+    content_ref: Optional[str] = Field(default=None, description="Blob store key of the full content")
     location: str = Field(description="File path or commit hash where evidence was found")
     rationale: str = Field(description="Your rationale for your confidence on the evidence you find for this particular goal")
     confidence: float = Field(ge=0.0, le=1.0, description="Confidence score between 0 and 1")
@@ -19,6 +22,8 @@ class JudicialOpinion(BaseModel):
     score: int = Field(ge=1, le=100, description="Score assigned by the judge")
     argument: str = Field(description="The reasoning behind the score")
     cited_evidence: List[str] = Field(default_factory=list, description="List of evidence locations or IDs cited")
+    # Filled by self-consistency sampling; hidden from the LLM output schema
+    sample_scores: SkipJsonSchema[List[int]] = Field(default_factory=list, description="Scores of every sample when the judge sampled more than once")
 
 class CriterionResult(BaseModel):
     """Result of judicial synthesis for a single criterion."""
@@ -36,6 +41,7 @@ class AuditReport(BaseModel):
     overall_score: float
     criteria: List[CriterionResult]
     remediation_plan: str
+    degraded_stages: List[str] = Field(default_factory=list, description="Stages that ran out of time and fell back to safe defaults")
 
 from typing_extensions import TypedDict
 
@@ -43,10 +49,23 @@ class AgentState(TypedDict):
     """The central state for the Automaton Auditor LangGraph."""
     repo_url: str
     pdf_path: str
+    # Commit the RepoInvestigator checks out; empty means the default branch
+    pinned_commit: str
+    # HEAD of the audited clone, set by the RepoInvestigator
+    commit_sha: str
     rubric_dimensions: List[Dict]
     
     # Use Annotated with reducers to aggregate evidence and opinions from parallel agents
     evidences: Annotated[Dict[str, List[Evidence]], operator.ior]
     opinions: Annotated[List[JudicialOpinion], operator.add]
+    # Per-criterion synthesis results, filled early by the pipelined graph
+    criterion_results: Annotated[List[CriterionResult], operator.add]
+    
+    # Per-call LLM instrumentation records (tokens, latency, retries, cost)
+    llm_usage: Annotated[List[Dict], operator.add]
+    # Wall-clock time per pipeline step, e.g. {"stage": "repo_investigator.clone", "seconds": 1.2, "ok": True}
+    timings: Annotated[List[Dict], operator.add]
+    # Stages that hit their time budget and fell back, e.g. {"stage": "judge.Prosecutor", "reason": "DeadlineExceeded: ..."}
+    degraded_stages: Annotated[List[Dict], operator.add]
     
     final_report: Optional[AuditReport]
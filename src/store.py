@@ -0,0 +1,268 @@
+# automation-auditor/src/store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .blobs import resolve_content
+from .state import AuditReport, CriterionResult, Evidence, JudicialOpinion
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audits (
+    audit_id TEXT PRIMARY KEY,
+    repo_url TEXT NOT NULL,
+    commit_sha TEXT,
+    pdf_path TEXT,
+    overall_score REAL NOT NULL,
+    executive_summary TEXT,
+    remediation_plan TEXT,
+    created_at REAL NOT NULL,
+    llm_usage TEXT,
+    degraded_stages TEXT
+);
+CREATE TABLE IF NOT EXISTS criteria (
+    audit_id TEXT NOT NULL REFERENCES audits(audit_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    criterion_id TEXT NOT NULL,
+    name TEXT,
+    final_score INTEGER NOT NULL,
+    dissent_summary TEXT,
+    remediation TEXT,
+    PRIMARY KEY (audit_id, criterion_id)
+);
+CREATE TABLE IF NOT EXISTS opinions (
+    audit_id TEXT NOT NULL REFERENCES audits(audit_id) ON DELETE CASCADE,
+    criterion_id TEXT NOT NULL,
+    judge TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    argument TEXT,
+    cited_evidence TEXT,
+    sample_scores TEXT
+);
+CREATE TABLE IF NOT EXISTS evidences (
+    audit_id TEXT NOT NULL REFERENCES audits(audit_id) ON DELETE CASCADE,
+    evidence_key TEXT NOT NULL,
+    goal TEXT,
+    found INTEGER,
+    content TEXT,
+    location TEXT,
+    rationale TEXT,
+    confidence REAL
+);
+CREATE INDEX IF NOT EXISTS idx_audits_repo ON audits(repo_url, created_at);
+CREATE INDEX IF NOT EXISTS idx_audits_commit ON audits(commit_sha);
+CREATE INDEX IF NOT EXISTS idx_audits_created ON audits(created_at);
+CREATE INDEX IF NOT EXISTS idx_criteria_score ON criteria(criterion_id, final_score);
+CREATE INDEX IF NOT EXISTS idx_opinions_audit ON opinions(audit_id, criterion_id);
+CREATE INDEX IF NOT EXISTS idx_evidences_audit ON evidences(audit_id, evidence_key);
+"""
+
+class AuditStore:
+    """
+    Embedded SQLite store of audit reports, criteria, opinions and evidence.
+
+    One connection is shared per store and guarded by a lock, so the store
+    can be used from graph nodes running in worker threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        # Stores created before degraded stages were recorded lack the column
+        if "degraded_stages" not in {row["name"] for row in self._conn.execute("PRAGMA table_info(audits)")}:
+            self._conn.execute("ALTER TABLE audits ADD COLUMN degraded_stages TEXT")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def save_audit(self, audit_id: str, report: AuditReport, evidences: Optional[Dict[str, List[Evidence]]] = None,
+                   commit_sha: str = "", pdf_path: Optional[str] = None, llm_usage: Optional[List[Dict]] = None,
+                   created_at: Optional[float] = None) -> None:
+        """
+        Writes (or replaces) one audit with its criteria, opinions and evidence.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM audits WHERE audit_id = ?", (audit_id,))
+            self._conn.execute(
+                "INSERT INTO audits (audit_id, repo_url, commit_sha, pdf_path, overall_score, executive_summary, remediation_plan, "
+                "created_at, llm_usage, degraded_stages) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (audit_id, report.repo_url, commit_sha or None, pdf_path, report.overall_score, report.executive_summary,
+                 report.remediation_plan, created_at if created_at is not None else time.time(), json.dumps(llm_usage or [], default=str),
+                 json.dumps(report.degraded_stages)),
+            )
+            self._conn.executemany(
+                "INSERT INTO criteria VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(audit_id, i, cr.dimension_id, cr.dimension_name, cr.final_score, cr.dissent_summary, cr.remediation)
+                 for i, cr in enumerate(report.criteria)],
+            )
+            self._conn.executemany(
+                "INSERT INTO opinions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(audit_id, op.criterion_id, op.judge, op.score, op.argument, json.dumps(op.cited_evidence), json.dumps(op.sample_scores))
+                 for cr in report.criteria for op in cr.judge_opinions],
+            )
+            self._conn.executemany(
+                "INSERT INTO evidences VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(audit_id, key, ev.goal, int(ev.found), resolve_content(ev), ev.location, ev.rationale, ev.confidence)
+                 for key, items in (evidences or {}).items() for ev in items if isinstance(ev, Evidence)],
+            )
+
+    def list_audits(self, repo_url: Optional[str] = None, commit_sha: Optional[str] = None,
+                    since: Optional[float] = None, until: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Audit summaries, newest first.
+        """
+        clauses, params = self._audit_filters(repo_url, commit_sha, since, until)
+        sql = ("SELECT audit_id, repo_url, commit_sha, overall_score, created_at FROM audits a"
+               f"{self._where(clauses)} ORDER BY created_at DESC LIMIT ?")
+        return self._fetch(sql, params + [limit])
+
+    def query_criteria(self, criterion_id: Optional[str] = None, min_score: Optional[int] = None, max_score: Optional[int] = None,
+                       repo_url: Optional[str] = None, commit_sha: Optional[str] = None,
+                       since: Optional[float] = None, until: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Criterion results joined with their audit, newest first. Scores bounds are inclusive.
+        """
+        clauses, params = self._audit_filters(repo_url, commit_sha, since, until)
+        if criterion_id is not None:
+            clauses.append("c.criterion_id = ?")
+            params.append(criterion_id)
+        if min_score is not None:
+            clauses.append("c.final_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("c.final_score <= ?")
+            params.append(max_score)
+        sql = ("SELECT a.audit_id, a.repo_url, a.commit_sha, a.created_at, c.criterion_id, c.name, c.final_score, c.dissent_summary "
+               f"FROM criteria c JOIN audits a ON a.audit_id = c.audit_id{self._where(clauses)} "
+               "ORDER BY a.created_at DESC, c.position LIMIT ?")
+        return self._fetch(sql, params + [limit])
+
+    def load_report(self, audit_id: str) -> Optional[AuditReport]:
+        """
+        Rebuilds the AuditReport for `audit_id`, or None if it is not stored.
+        """
+        audit = self._fetch("SELECT * FROM audits WHERE audit_id = ?", [audit_id])
+        if not audit:
+            return None
+        opinions: Dict[str, List[JudicialOpinion]] = {}
+        for row in self._fetch("SELECT * FROM opinions WHERE audit_id = ? ORDER BY rowid", [audit_id]):
+            opinions.setdefault(row["criterion_id"], []).append(JudicialOpinion(
+                criterion_id=row["criterion_id"], judge=row["judge"], score=row["score"], argument=row["argument"],
+                cited_evidence=json.loads(row["cited_evidence"] or "[]"), sample_scores=json.loads(row["sample_scores"] or "[]"),
+            ))
+        criteria = [
+            CriterionResult(
+                dimension_id=row["criterion_id"], dimension_name=row["name"], final_score=row["final_score"],
+                judge_opinions=opinions.get(row["criterion_id"], []), dissent_summary=row["dissent_summary"], remediation=row["remediation"],
+            )
+            for row in self._fetch("SELECT * FROM criteria WHERE audit_id = ? ORDER BY position", [audit_id])
+        ]
+        a = audit[0]
+        return AuditReport(repo_url=a["repo_url"], executive_summary=a["executive_summary"], overall_score=a["overall_score"],
+                           criteria=criteria, remediation_plan=a["remediation_plan"],
+                           degraded_stages=json.loads(a["degraded_stages"] or "[]"))
+
+    def load_llm_usage(self, audit_id: str) -> List[Dict]:
+        rows = self._fetch("SELECT llm_usage FROM audits WHERE audit_id = ?", [audit_id])
+        return json.loads(rows[0]["llm_usage"] or "[]") if rows else []
+
+    def load_evidences(self, audit_id: str) -> Dict[str, List[Evidence]]:
+        evidences: Dict[str, List[Evidence]] = {}
+        for row in self._fetch("SELECT * FROM evidences WHERE audit_id = ? ORDER BY rowid", [audit_id]):
+            evidences.setdefault(row["evidence_key"], []).append(Evidence(
+                goal=row["goal"], found=bool(row["found"]), content=row["content"], location=row["location"],
+                rationale=row["rationale"], confidence=row["confidence"],
+            ))
+        return evidences
+
+    def load_record(self, audit_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The audit in the shape of `archive.load_audit`, so resynthesize.py and
+        cohort_stats.py read the store and the gzip archive alike.
+        """
+        audit = self._fetch("SELECT * FROM audits WHERE audit_id = ?", [audit_id])
+        report = self.load_report(audit_id)
+        if not audit or report is None:
+            return None
+        a = audit[0]
+        return {
+            "audit_id": audit_id,
+            "created_at": a["created_at"],
+            "repo_url": a["repo_url"],
+            "pdf_path": a["pdf_path"],
+            "overall_score": a["overall_score"],
+            "rubric": [{"id": cr.dimension_id, "name": cr.dimension_name} for cr in report.criteria],
+            "evidences": self.load_evidences(audit_id),
+            "opinions": [op for cr in report.criteria for op in cr.judge_opinions],
+            "llm_usage": json.loads(a["llm_usage"] or "[]"),
+            "degraded_stages": report.degraded_stages,
+        }
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yields every stored audit via `load_record`, oldest first.
+        """
+        for row in self._fetch("SELECT audit_id FROM audits ORDER BY created_at", []):
+            record = self.load_record(row["audit_id"])
+            if record is not None:
+                yield record
+
+    def score_rows(self) -> List[tuple]:
+        """
+        (audit_id, repo_url, criterion_id, judge, score) for every stored
+        opinion from one query, audits in `iter_records` order. An audit
+        without opinions appears once with None opinion columns. Enough for
+        cohort statistics without rebuilding whole records.
+        """
+        sql = ("SELECT a.audit_id, a.repo_url, o.criterion_id, o.judge, o.score "
+               "FROM audits a LEFT JOIN opinions o ON o.audit_id = a.audit_id ORDER BY a.created_at, a.audit_id, o.rowid")
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(sql).fetchall()]
+
+    @staticmethod
+    def _audit_filters(repo_url, commit_sha, since, until):
+        clauses, params = [], []
+        for clause, value in (("a.repo_url = ?", repo_url), ("a.commit_sha LIKE ?", f"{commit_sha}%" if commit_sha else None),
+                              ("a.created_at >= ?", since), ("a.created_at < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return clauses, params
+
+    @staticmethod
+    def _where(clauses: List[str]) -> str:
+        return f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    def _fetch(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params).fetchall()]
+
+_stores: Dict[str, AuditStore] = {}
+_stores_lock = threading.Lock()
+
+def get_store(path: str) -> AuditStore:
+    """
+    Returns the process-wide store for `path`, opening it on first use.
+    """
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = AuditStore(key)
+        return _stores[key]
+
+def close_stores() -> None:
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
@@ -4,10 +4,13 @@ import re
 from typing import List, Dict, Optional
 from pypdf import PdfReader
 
+from ..profiling import profiled
+
 class PdfLoadError(Exception):
     """Raised when PDF ingestion fails."""
     pass
 
+@profiled(cat="tool")
 def load_pdf_text(pdf_path: str) -> str:
     """
     Extracts all text from a PDF file.
@@ -26,6 +29,7 @@ def load_pdf_text(pdf_path: str) -> str:
     except Exception as e:
         raise PdfLoadError(f"Failed to load PDF {pdf_path}: {str(e)}")
 
+@profiled(cat="tool")
 def chunk_text(text: str, max_chars: int = 1000) -> List[str]:
     """
     Splits text into chunks, respecting paragraph boundaries where possible.
@@ -61,6 +65,7 @@ def chunk_text(text: str, max_chars: int = 1000) -> List[str]:
         
     return chunks
 
+@profiled(cat="tool")
 def ingest_pdf(pdf_path: str, max_chars: int = 1000) -> List[str]:
     """
     Convenience wrapper to load and chunk a PDF.
@@ -68,6 +73,7 @@ def ingest_pdf(pdf_path: str, max_chars: int = 1000) -> List[str]:
     text = load_pdf_text(pdf_path)
     return chunk_text(text, max_chars)
 
+@profiled(cat="tool")
 def simple_keyword_search(chunks: List[str], query: str, top_k: int = 5) -> List[str]:
     """
     Scores and returns top_k chunks based on simple keyword frequency.
@@ -83,6 +89,7 @@ def simple_keyword_search(chunks: List[str], query: str, top_k: int = 5) -> List
     scored_chunks.sort(key=lambda x: x[0], reverse=True)
     return [chunk for score, chunk in scored_chunks[:top_k]]
 
+@profiled(cat="tool")
 def verify_citations(text: str, known_files: List[str]) -> List[Dict[str, any]]:
     """
     Extracts potential file paths and cross-checks them against known repo files.
@@ -130,6 +137,7 @@ def verify_citations(text: str, known_files: List[str]) -> List[Dict[str, any]]:
         
     return results
 
+@profiled(cat="tool")
 def analyze_concept_depth(text: str, concept: str) -> Dict[str, any]:
     """
     Classifies if a concept is just name-dropped or deeply explained.
@@ -1,11 +1,14 @@
 # automation-auditor/src/tools/repo_tools.py
 import os
+import shutil
 import subprocess
 import tempfile
 import ast
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from ..profiling import profiled
+
 class RepoCloneError(Exception):
     """Raised when repository cloning fails."""
     pass
@@ -14,16 +17,22 @@ class GitHistoryError(Exception):
     """Raised when extracting git history fails."""
     pass
 
-def clone_repo(github_url: str) -> str:
+SANDBOX_PREFIX = "auditor_sandbox_"
+
+@profiled(cat="tool")
+def clone_repo(github_url: str, timeout: Optional[float] = None, commit_sha: str = "") -> str:
     """
-    Clones a GitHub repository into a temporary sandbox directory.
+    Clones a GitHub repository into a temporary sandbox directory and, when
+    `commit_sha` is given, checks that commit out instead of the default branch.
+    Each `git` call is killed if it runs longer than `timeout` seconds.
     
     Returns:
         The absolute path to the cloned repository root.
     """
+    temp_dir = None
     try:
         # Create a unique temporary directory
-        temp_dir = tempfile.mkdtemp(prefix="auditor_sandbox_")
+        temp_dir = tempfile.mkdtemp(prefix=SANDBOX_PREFIX)
         
         # Extract repo name for final path construction
         repo_name = github_url.rstrip("/").split("/")[-1]
@@ -37,17 +46,45 @@ def clone_repo(github_url: str) -> str:
             ["git", "clone", github_url, dest_dir],
             capture_output=True,
             text=True,
-            check=True
+            check=True,
+            timeout=timeout
         )
+        if commit_sha:
+            subprocess.run(
+                ["git", "checkout", "-q", "--detach", commit_sha],
+                cwd=dest_dir,
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=timeout
+            )
         
         return os.path.abspath(dest_dir)
         
+    except subprocess.TimeoutExpired as e:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        raise RepoCloneError(f"Cloning {github_url} timed out after {e.timeout:.1f}s") from e
     except subprocess.CalledProcessError as e:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
         raise RepoCloneError(f"Failed to clone repository {github_url}: {e.stderr}")
     except Exception as e:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
         raise RepoCloneError(f"Unexpected error during clone: {str(e)}")
 
-def extract_git_history(repo_path: str) -> List[Dict[str, str]]:
+def remove_clone(repo_path: str) -> None:
+    """
+    Deletes the sandbox directory `clone_repo` created for `repo_path`.
+    Paths outside a clone sandbox are left alone.
+    """
+    sandbox = os.path.dirname(os.path.abspath(repo_path))
+    if os.path.basename(sandbox).startswith(SANDBOX_PREFIX):
+        shutil.rmtree(sandbox, ignore_errors=True)
+
+@profiled(cat="tool")
+def extract_git_history(repo_path: str, timeout: Optional[float] = None) -> List[Dict[str, str]]:
     """
     Extracts the git commit history in a simple format.
     
@@ -60,7 +97,8 @@ def extract_git_history(repo_path: str) -> List[Dict[str, str]]:
             cwd=repo_path,
             capture_output=True,
             text=True,
-            check=True
+            check=True,
+            timeout=timeout
         )
         
         history = []
@@ -76,9 +114,30 @@ def extract_git_history(repo_path: str) -> List[Dict[str, str]]:
                 
         return history
         
+    except subprocess.TimeoutExpired as e:
+        raise GitHistoryError(f"git log in {repo_path} timed out after {e.timeout:.1f}s") from e
     except subprocess.CalledProcessError as e:
         raise GitHistoryError(f"Failed to extract git history from {repo_path}: {e.stderr}")
 
+@profiled(cat="tool")
+def head_commit(repo_path: str, timeout: Optional[float] = None) -> str:
+    """
+    Returns the full SHA of the checked-out commit, or "" if it cannot be read.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=repo_path,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=timeout
+        )
+        return result.stdout.strip()
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+        return ""
+
+@profiled(cat="tool")
 def check_sidecar_files(repo_path: str) -> Dict[str, Dict]:
     """
     Checks for the existence of specific orchestration sidecar files.
@@ -102,6 +161,7 @@ def check_sidecar_files(repo_path: str) -> Dict[str, Dict]:
         
     return results
 
+@profiled(cat="tool")
 def analyze_code_structure(repo_path: str) -> Dict[str, bool]:
     """
     Performs a broad check for a standard LangGraph project structure.
@@ -115,6 +175,7 @@ def analyze_code_structure(repo_path: str) -> Dict[str, bool]:
         "tools_dir": (path_root / "src/tools").is_dir()
     }
 
+@profiled(cat="tool")
 def ast_analyze_source(file_path: str) -> Dict[str, any]:
     """
     Uses AST to inspect Python code for state structure and graph patterns.
@@ -170,6 +231,7 @@ def ast_analyze_source(file_path: str) -> Dict[str, any]:
     except Exception as e:
         return {"error": str(e)}
 
+@profiled(cat="tool")
 def classify_git_narrative(history: List[Dict[str, str]]) -> Dict[str, any]:
     """
     Analyzes commit history to classify the development narrative.
@@ -202,6 +264,7 @@ def classify_git_narrative(history: List[Dict[str, str]]) -> Dict[str, any]:
         "has_meaningful_messages": has_meaningful_messages
     }
 
+@profiled(cat="tool")
 def analyze_graph_structure(path: str) -> Dict[str, bool]:
     """
     High-level AST check for StateGraph usage and parallel fan-out.
@@ -213,6 +276,7 @@ def analyze_graph_structure(path: str) -> Dict[str, bool]:
         "has_parallel_edges": info.get("has_parallel_edges", False),
     }
 
+@profiled(cat="tool")
 def analyze_tool_security(repo_path: str) -> Dict[str, bool]:
     """
     Scans src/tools/ for usage of tempfile and subprocess, and lack of os.system.
@@ -237,6 +301,7 @@ def analyze_tool_security(repo_path: str) -> Dict[str, bool]:
                         
     return findings
 
+@profiled(cat="tool")
 def analyze_structured_output(repo_path: str) -> Dict[str, bool]:
     """
     Scans src/nodes/judges.py for structured output enforcement and retry logic.
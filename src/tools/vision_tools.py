@@ -3,6 +3,9 @@ from typing import List
 
 from pypdf import PdfReader
 
+from ..profiling import profiled
+
+@profiled(cat="tool")
 def extract_images_from_pdf(path: str) -> List[bytes]:
     """
     Extract raw image bytes from a PDF.
@@ -0,0 +1,119 @@
+# automation-auditor/src/worker.py
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import AsyncExitStack
+from typing import Optional
+
+from .checkpoint import ainvoke_resumable, checkpointed_graph, thread_id_for
+from .config import get_settings
+from .deadline import audit_deadline
+from .graph import build_graph
+from .job_queue import Job, JobQueue
+from .rubric import load_rubric
+from .runner import make_initial_state
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def write_result(results_dir: str, job: Job, result: dict) -> str:
+    """
+    Atomically writes a job's final report to `<results_dir>/<fingerprint>.json`.
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    report = result.get("final_report")
+    payload = {
+        "job_id": job.job_id,
+        "repo_url": job.repo_url,
+        "commit_sha": result.get("commit_sha") or job.commit_sha,
+        "fingerprint": job.fingerprint,
+        "final_report": report.model_dump(mode="json") if report is not None else None,
+    }
+    path = os.path.join(results_dir, f"{job.fingerprint}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+    return path
+
+class _Heartbeat(threading.Thread):
+    """Renews a job lease every `lease_s / 3` seconds until stopped."""
+
+    def __init__(self, queue: JobQueue, job: Job, worker_id: str, lease_s: float):
+        super().__init__(daemon=True)
+        self.queue, self.job, self.worker_id, self.lease_s = queue, job, worker_id, lease_s
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.lease_s / 3):
+            if not self.queue.heartbeat(self.job.job_id, self.worker_id, self.lease_s):
+                self.lost = True
+                print(f"Worker {self.worker_id}: lost lease on job {self.job.job_id}")
+                return
+
+async def _run_job(job: Job, app) -> dict:
+    # The clone checks out the enqueued commit, so the result matches the job fingerprint
+    state = make_initial_state(job.repo_url, job.pdf_path, load_rubric(job.rubric).get("dimensions", []), pinned_commit=job.commit_sha)
+    with audit_deadline():
+        if getattr(app, "checkpointer", None) is None:
+            return await app.ainvoke(state)
+        # The job fingerprint names the checkpoint thread, so a retried job resumes where the failed attempt stopped
+        return await ainvoke_resumable(app, state, thread_id_for(job.fingerprint))
+
+def process_job(queue: JobQueue, job: Job, worker_id: str, app, results_dir: str, lease_s: float,
+                runner: Optional[asyncio.Runner] = None) -> bool:
+    """
+    Runs one leased job through `app` on `runner` (a fresh event loop when
+    None); returns True if it completed.
+    """
+    heartbeat = _Heartbeat(queue, job, worker_id, lease_s)
+    heartbeat.start()
+    try:
+        result = (runner.run if runner is not None else asyncio.run)(_run_job(job, app))
+        result_path = write_result(results_dir, job, result)
+        report = result.get("final_report")
+    except Exception as e:
+        print(f"Worker {worker_id}: job {job.job_id} ({job.repo_url}) failed on attempt {job.attempts}: {e}")
+        queue.fail(job.job_id, worker_id, f"{e.__class__.__name__}: {e}")
+        return False
+    finally:
+        heartbeat.stopped.set()
+        heartbeat.join()
+    return queue.complete(job.job_id, worker_id, result_path, report.overall_score if report is not None else None)
+
+def run_worker(queue_path: Optional[str] = None, worker_id: Optional[str] = None, app=None,
+               exit_when_empty: bool = False, max_jobs: Optional[int] = None) -> int:
+    """
+    Leases and runs jobs until the queue is drained (with `exit_when_empty`)
+    or `max_jobs` have been processed. Returns the number of jobs completed.
+    """
+    settings = get_settings()
+    queue = JobQueue(queue_path or settings.queue_path, settings.queue_max_attempts)
+    worker_id = worker_id or default_worker_id()
+    completed = processed = 0
+    resources = AsyncExitStack()
+    # Every job runs on this one loop, which the pooled LLM clients and the checkpointer connection are bound to
+    with asyncio.Runner() as runner:
+        try:
+            if app is None:
+                app = (runner.run(resources.enter_async_context(checkpointed_graph(settings.checkpoint_path)))
+                       if settings.checkpoint_path else build_graph())
+            while max_jobs is None or processed < max_jobs:
+                job = queue.lease(worker_id, settings.queue_lease_s)
+                if job is None:
+                    if exit_when_empty:
+                        break
+                    time.sleep(settings.queue_poll_s)
+                    continue
+                print(f"Worker {worker_id}: job {job.job_id} {job.repo_url} (attempt {job.attempts})")
+                processed += 1
+                if process_job(queue, job, worker_id, app, settings.queue_results_dir, settings.queue_lease_s, runner):
+                    completed += 1
+        finally:
+            runner.run(resources.aclose())
+            queue.close()
+    return completed
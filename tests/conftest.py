@@ -0,0 +1,34 @@
+import subprocess
+import pytest
+
+
+def make_git_repo(path, commits=("feat: init",)):
+    """Creates a small local git repository that clone_repo can clone offline."""
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q"], cwd=path, check=True)
+    for i, message in enumerate(commits):
+        (path / f"file_{i}.txt").write_text(message)
+        subprocess.run(["git", "add", "."], cwd=path, check=True)
+        subprocess.run(["git", "-c", "user.email=auditor@example.com", "-c", "user.name=auditor", "commit", "-qm", message],
+                       cwd=path, check=True)
+    return path
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """A local submission repository with a single commit."""
+    return make_git_repo(tmp_path / "submission")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_settings():
+    """Re-read AUDITOR_* settings and drop rate-limit buckets, resource slots and profiling spans after each test so nothing leaks."""
+    from src.config import reset_settings
+    from src.llm.rate_limit import reset_rate_limiter
+    from src.profiling import reset_profile
+    from src.resources import reset_resources
+    yield
+    reset_settings()
+    reset_rate_limiter()
+    reset_resources()
+    reset_profile()
@@ -0,0 +1,36 @@
+from benchmarks.suite import compare
+from benchmarks.synthetic import make_synthetic_pdf, make_synthetic_repo
+from src.tools.doc_tools import load_pdf_text, verify_citations
+from src.tools.repo_tools import analyze_graph_structure, extract_git_history
+from src.tools.vision_tools import extract_images_from_pdf
+
+
+def test_synthetic_inputs_are_readable_by_the_tools(tmp_path):
+    """Generated repos and PDFs have the requested shape as the forensic tools see it."""
+    repo = make_synthetic_repo(str(tmp_path / "repo"), commits=30, files=5, file_kb=1, graph_nodes=6)
+    assert len(extract_git_history(repo)) == 30
+    assert analyze_graph_structure(f"{repo}/src/graph.py") == {"parsed_ok": True, "has_typed_state": True, "has_parallel_edges": True}
+
+    pdf = make_synthetic_pdf(str(tmp_path / "report.pdf"), pages=3, images=2, citation_density=0.5)
+    assert len(extract_images_from_pdf(pdf)) == 2
+    text = load_pdf_text(pdf)
+    assert "Dialectical Synthesis" in text
+    assert verify_citations(text, ["src/graph.py"])
+
+
+def test_compare_flags_slowdowns_memory_growth_and_missing_cases():
+    """Only changes past both the relative tolerance and the noise floor count as regressions."""
+    baseline = {
+        "fast": {"min_s": 0.001, "peak_mb": 0.1},
+        "slow": {"min_s": 0.100, "peak_mb": 1.0},
+        "big": {"min_s": 0.100, "peak_mb": 10.0},
+        "gone": {"min_s": 0.100, "peak_mb": 1.0},
+    }
+    results = {
+        "fast": {"min_s": 0.0025, "peak_mb": 0.2},
+        "slow": {"min_s": 0.160, "peak_mb": 1.0},
+        "big": {"min_s": 0.120, "peak_mb": 14.0},
+    }
+    regressions = compare(results, baseline, tolerance=0.5, mem_tolerance=0.25)
+    assert [line.split(":")[0] for line in regressions] == ["slow", "big", "gone"]
+    assert compare(results, baseline, tolerance=1.0, mem_tolerance=0.5) == ["gone: missing from this run"]
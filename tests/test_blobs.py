@@ -0,0 +1,53 @@
+from src.blobs import BlobStore, compact_evidence, resolve_content, resolve_evidence
+from src.nodes.judges import _build_judge_messages
+from src.state import Evidence
+
+
+def _evidence(content):
+    return Evidence(goal="g", found=True, content=content, location="src/graph.py", rationale="r", confidence=0.9)
+
+
+def test_blob_store_deduplicates_by_content(tmp_path):
+    """Identical text is stored once and addressed by its sha256."""
+    store = BlobStore(str(tmp_path))
+    ref = store.put("same text")
+    assert store.put("same text") == ref
+    assert store.get(ref) == "same text"
+    assert len(list(tmp_path.rglob("*"))) == 2  # one shard directory, one blob
+
+
+def test_large_content_is_offloaded_and_resolved(tmp_path, monkeypatch):
+    """Long content leaves a preview and a ref in the state; resolving restores the full text."""
+    monkeypatch.setenv("AUDITOR_EVIDENCE_BLOB_DIR", str(tmp_path))
+    monkeypatch.setenv("AUDITOR_EVIDENCE_INLINE_MAX", "100")
+    full = "x" * 1000
+
+    compact = compact_evidence(_evidence(full))
+
+    assert compact.content_ref and len(compact.content) < 250
+    assert compact.content.startswith("x" * 160) and "1000 chars" in compact.content
+    assert resolve_content(compact) == full
+    resolved = resolve_evidence(compact)
+    assert resolved.content == full and resolved.content_ref is None
+    assert compact_evidence(_evidence("short")).content_ref is None
+
+
+def test_disabled_store_keeps_content_inline(monkeypatch):
+    """With AUDITOR_EVIDENCE_BLOB_DIR empty, evidence is left untouched."""
+    monkeypatch.setenv("AUDITOR_EVIDENCE_BLOB_DIR", "")
+    monkeypatch.setenv("AUDITOR_EVIDENCE_INLINE_MAX", "10")
+    evidence = _evidence("y" * 100)
+    assert compact_evidence(evidence) is evidence
+
+
+def test_judge_prompt_sees_full_content(tmp_path, monkeypatch):
+    """Judges get the dereferenced text, not the preview kept in the state."""
+    monkeypatch.setenv("AUDITOR_EVIDENCE_BLOB_DIR", str(tmp_path))
+    monkeypatch.setenv("AUDITOR_EVIDENCE_INLINE_MAX", "100")
+    full = "def node(state): " * 40
+    compact = compact_evidence(_evidence(full))
+
+    messages = _build_judge_messages("Prosecutor", "p", [{"id": "c", "name": "C"}], {"graph_orchestration": [compact]})
+
+    assert full in messages[0][1]
+    assert compact.content_ref not in messages[0][1]
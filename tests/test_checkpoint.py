@@ -0,0 +1,69 @@
+import asyncio
+from unittest.mock import patch
+from src.config import reset_settings
+from src.checkpoint import ainvoke_resumable, audit_thread_id, checkpointed_graph
+from src.llm.transport import FakeTransport, set_transport
+import src.nodes.detectives as detectives
+
+
+class _CountingTransport(FakeTransport):
+    def __init__(self):
+        super().__init__(seed=2)
+        self.calls = 0
+
+    async def ainvoke(self, call, messages):
+        self.calls += 1
+        return await super().ainvoke(call, messages)
+
+
+def test_failed_audit_resumes_without_redoing_detectives_or_judges(git_repo, tmp_path, monkeypatch):
+    """A crash in the Chief Justice resumes from the checkpoint (no re-clone, no repeated LLM calls); a finished run starts over."""
+    monkeypatch.chdir(tmp_path)
+    state = {
+        "repo_url": str(git_repo),
+        "pdf_path": "missing.pdf",
+        "rubric_dimensions": [{"id": "git_forensic_analysis", "name": "Git"}],
+        "evidences": {},
+        "opinions": [],
+        "final_report": None,
+    }
+    thread_id = audit_thread_id(str(git_repo), "missing.pdf", "rubric.json")
+    assert thread_id == audit_thread_id(str(git_repo), "missing.pdf", "rubric.json")
+    transport = _CountingTransport()
+    clone_calls = []
+    real_clone = detectives.clone_repo
+    monkeypatch.setattr(detectives, "clone_repo", lambda url, timeout=None: clone_calls.append(url) or real_clone(url, timeout))
+
+    async def run():
+        async with checkpointed_graph(str(tmp_path / "checkpoints.db")) as app:
+            with patch("src.graph.chief_justice_node", side_effect=RuntimeError("process died")):
+                try:
+                    await ainvoke_resumable(app, state, thread_id)
+                except RuntimeError:
+                    pass
+            judge_calls = transport.calls
+            resumed = await ainvoke_resumable(app, state, thread_id)
+            clones, resumed_calls = len(clone_calls), transport.calls
+            return judge_calls, clones, resumed_calls, resumed, await ainvoke_resumable(app, state, thread_id)
+
+    set_transport(transport)
+    try:
+        judge_calls, clones, resumed_calls, resumed, repeated = asyncio.run(run())
+    finally:
+        set_transport(None)
+
+    assert judge_calls == 3 and resumed_calls == 3
+    assert clones == 1
+    assert len(resumed["opinions"]) == 3
+    assert resumed["final_report"].criteria[0].dimension_id == "git_forensic_analysis"
+    # The finished thread is not replayed: the third call judged again from a new run
+    assert transport.calls == 6
+    assert len(repeated["opinions"]) == 3
+
+
+def test_thread_id_changes_with_judge_settings(git_repo, monkeypatch):
+    """Checkpoints written under other judge settings are not resumed."""
+    before = audit_thread_id(str(git_repo), "missing.pdf", "rubric.json")
+    monkeypatch.setenv("AUDITOR_JUDGE_SAMPLES_MAX", "3")
+    reset_settings()
+    assert audit_thread_id(str(git_repo), "missing.pdf", "rubric.json") != before
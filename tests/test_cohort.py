@@ -0,0 +1,85 @@
+import random
+import numpy as np
+from src.archive import iter_audit_paths, save_audit
+from src.cohort import Cohort, cohort_from_records, cohort_from_score_rows, flag_outliers, judge_bias, load_cohort, synthesize_cohort
+from src.nodes.justice import synthesize_report
+from src.rubric import SynthesisRules
+from src.state import JudicialOpinion
+from src.store import AuditStore
+
+CRITERIA = ["git_forensic_analysis", "graph_orchestration", "safe_tool_engineering", "state_management_rigor"]
+RUBRIC = [{"id": c, "name": c} for c in CRITERIA]
+
+
+def _random_opinions(rng):
+    opinions = []
+    for criterion in CRITERIA:
+        for judge in ("Prosecutor", "Defense", "TechLead"):
+            if rng.random() < 0.9:
+                opinions.append(JudicialOpinion(criterion_id=criterion, judge=judge, score=rng.randint(1, 100), argument="x"))
+    return opinions
+
+
+def _archive_cohort(tmp_path, n=60):
+    rng = random.Random(7)
+    audits = []
+    for i in range(n):
+        opinions = _random_opinions(rng)
+        state = {"repo_url": f"https://github.com/u/r{i}", "rubric_dimensions": RUBRIC, "opinions": opinions}
+        save_audit(state, str(tmp_path), f"u_r{i:03d}")
+        audits.append(opinions)
+    return audits
+
+
+def test_vectorized_synthesis_matches_chief_justice(tmp_path):
+    """Array synthesis reproduces synthesize_report's scores for every submission and rule set."""
+    audits = _archive_cohort(tmp_path)
+    cohort = load_cohort(iter_audit_paths(str(tmp_path)))
+    assert cohort.scores.shape == (60, 4, 3)
+
+    for rules in (SynthesisRules(), SynthesisRules(security_cap=30, security_veto_score=55, functionality_keywords=["git"])):
+        synthesis = synthesize_cohort(cohort, rules)
+        for s, opinions in enumerate(audits):
+            report = synthesize_report("u", RUBRIC, opinions, rules)
+            assert synthesis["overall"][s] == report.overall_score
+            for result in report.criteria:
+                c = cohort.criteria.index(result.dimension_id)
+                assert synthesis["final"][s, c] == result.final_score
+                assert bool(synthesis["dissent"][s, c]) == (result.dissent_summary is not None and "High variance" in result.dissent_summary)
+
+
+def test_cohort_cache_round_trip_and_bias(tmp_path):
+    """The .npz snapshot reloads identically; a uniformly harsh judge shows negative bias."""
+    scores = np.full((3, 1, 3), 80.0)
+    scores[:, 0, 0] = 50.0
+    cohort = Cohort(["a", "b", "c"], ["ua", "ub", "uc"], ["graph_orchestration"], scores)
+    cohort.save(str(tmp_path / "cohort.npz"))
+    reloaded = Cohort.load(str(tmp_path / "cohort.npz"))
+    assert reloaded.audit_ids == ["a", "b", "c"]
+    assert np.array_equal(reloaded.scores, scores)
+    assert judge_bias(cohort)["Prosecutor"]["overall"] == -20.0
+
+
+def test_flag_outliers_uses_robust_z():
+    """Only the submission far from the cohort median is flagged."""
+    overall = np.array([70.0, 72.0, 68.0, 71.0, 69.0, 5.0])
+    cohort = Cohort([str(i) for i in range(6)], [""] * 6, [], np.empty((6, 0, 3)))
+    assert [o["audit_id"] for o in flag_outliers(cohort, overall)] == ["5"]
+
+
+def test_store_score_rows_build_the_same_cohort_as_full_records(tmp_path):
+    """One opinions query yields the cohort that rebuilding every stored record does."""
+    rng = random.Random(11)
+    store = AuditStore(str(tmp_path / "audits.db"))
+    for i in range(20):
+        opinions = _random_opinions(rng) if i != 5 else []
+        store.save_audit(f"u_r{i:03d}", synthesize_report(f"https://github.com/u/r{i}", RUBRIC, opinions), created_at=1000.0 + i)
+
+    fast = cohort_from_score_rows(store.score_rows())
+    full = cohort_from_records(store.iter_records())
+    store.close()
+
+    assert fast.audit_ids == full.audit_ids and fast.repo_urls == full.repo_urls
+    assert fast.criteria == full.criteria
+    np.testing.assert_array_equal(fast.scores, full.scores)
+    assert np.isnan(fast.scores[5]).all()
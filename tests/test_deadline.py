@@ -0,0 +1,67 @@
+import asyncio
+import time
+import pytest
+from src.deadline import DeadlineExceeded, audit_deadline, is_timeout, stage_budget
+from src.fingerprint import remote_head
+from src.graph import build_graph
+from src.llm.transport import FakeTransport, set_transport
+from src.nodes.judges import SAFE_DEFAULT_ARGUMENT
+from src.tools.repo_tools import RepoCloneError, clone_repo
+
+
+def test_stage_budget_is_bounded_by_the_audit_deadline():
+    """A stage gets its own cap or what is left of the audit, whichever is shorter."""
+    assert stage_budget(0) is None
+    assert stage_budget(30) == 30
+    with audit_deadline(5):
+        assert 4 < stage_budget(30) <= 5
+        assert stage_budget(2) == 2
+        # An inner scope cannot extend the enclosing deadline
+        with audit_deadline(60):
+            assert stage_budget(0) <= 5
+    with audit_deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            stage_budget(30, "clone")
+
+
+def test_clone_is_killed_when_its_budget_expires(git_repo):
+    """A clone past its timeout raises RepoCloneError with the timeout in its chain."""
+    with pytest.raises(RepoCloneError) as excinfo:
+        clone_repo(str(git_repo), timeout=0.001)
+    assert "timed out" in str(excinfo.value)
+    assert is_timeout(excinfo.value)
+
+
+def test_remote_head_respects_the_audit_deadline(git_repo):
+    """ls-remote runs within the git budget and is not started once the audit is out of time."""
+    assert len(remote_head(str(git_repo))) == 40
+    with audit_deadline(0.01):
+        time.sleep(0.02)
+        assert remote_head(str(git_repo)) == ""
+
+
+def test_audit_with_stalled_clone_and_llm_degrades_instead_of_hanging(git_repo, tmp_path, monkeypatch):
+    """Expired budgets yield safe-default opinions and list the degraded stages in the report."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    monkeypatch.setenv("AUDITOR_CLONE_TIMEOUT_S", "0.001")
+    monkeypatch.setenv("AUDITOR_LLM_CALL_TIMEOUT_S", "0.2")
+    monkeypatch.setenv("AUDITOR_JUDGE_SKIP_MISSING_EVIDENCE", "false")
+    monkeypatch.setenv("AUDITOR_JUDGE_FAST_PATH", "false")
+    state = {"repo_url": str(git_repo), "pdf_path": "missing.pdf", "rubric_dimensions": [{"id": "git_forensic_analysis", "name": "Git"}],
+             "evidences": {}, "opinions": [], "final_report": None}
+    set_transport(FakeTransport(latency=lambda: 30.0))
+    started = time.perf_counter()
+    try:
+        with audit_deadline(20):
+            result = asyncio.run(build_graph().ainvoke(state))
+    finally:
+        set_transport(None)
+
+    assert time.perf_counter() - started < 5
+    report = result["final_report"]
+    assert report.degraded_stages[0] == "repo_investigator.clone"
+    assert sorted(report.degraded_stages[1:]) == ["judge.Defense", "judge.Prosecutor", "judge.TechLead"]
+    assert all(op.argument == SAFE_DEFAULT_ARGUMENT for op in result["opinions"])
+    assert all(u["timed_out"] for u in result["llm_usage"])
@@ -66,3 +66,46 @@ def test_repo_investigator_no_urls():
     }
     result = repo_investigator_node(state)
     assert result["error"] == "No GitHub URLs provided for investigation."
+
+
+def test_repo_protocols_run_in_parallel_with_timings(git_repo, monkeypatch):
+    """After the clone every protocol runs concurrently and reports its own timing."""
+    import threading
+    import src.nodes.detectives as detectives
+    monkeypatch.setenv("AUDITOR_BATCH_CPU_CONCURRENCY", "8")
+    barrier = threading.Barrier(2, timeout=5)
+
+    def rendezvous(scan):
+        # Each scan waits for the other: sequential execution would break the barrier
+        def wrapped(path):
+            barrier.wait()
+            return scan(path)
+        return wrapped
+
+    monkeypatch.setattr(detectives, "analyze_tool_security", rendezvous(detectives.analyze_tool_security))
+    monkeypatch.setattr(detectives, "analyze_structured_output", rendezvous(detectives.analyze_structured_output))
+
+    result = repo_investigator_node({"repo_url": str(git_repo)})
+
+    assert list(result["evidences"])[:2] == ["git_history", "git_narrative"]
+    assert all(e.confidence > 0 for items in result["evidences"].values() for e in items)
+    stages = [t["stage"] for t in result["timings"]]
+    assert stages[0] == "repo_investigator.clone" and len(stages) == 1 + len(detectives.REPO_PROTOCOLS)
+    assert all(t["ok"] for t in result["timings"])
+    assert len(result["commit_sha"]) == 40
+
+
+def test_failing_repo_protocol_is_isolated(git_repo, monkeypatch):
+    """One protocol raising yields zero-confidence evidence for it alone."""
+    import src.nodes.detectives as detectives
+
+    def broken(path):
+        raise SyntaxError("unparseable graph.py")
+
+    monkeypatch.setattr(detectives, "analyze_graph_structure", broken)
+    result = repo_investigator_node({"repo_url": str(git_repo)})
+
+    assert result["evidences"]["graph_parallelism"][0].confidence == 0.0
+    assert "SyntaxError" in result["evidences"]["graph_parallelism"][0].content
+    assert result["evidences"]["git_history"][0].found is True
+    assert [t["stage"] for t in result["timings"] if not t["ok"]] == ["repo_investigator.graph_parallelism"]
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+from src.forensics import collect_evidence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_python(code, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True, check=True).stdout
+
+
+def test_forensics_entry_point_skips_llm_and_judge_imports(tmp_path):
+    """Importing the forensics graph loads neither the Gemini client nor the judges."""
+    out = _run_python(
+        "import sys, json, src.forensics; "
+        "print(json.dumps([m for m in ('langchain_google_genai', 'src.nodes.judges', 'src.graph') if m in sys.modules]))",
+        tmp_path,
+    )
+    assert json.loads(out) == []
+
+
+def test_dotenv_is_loaded_on_first_settings_read_not_on_import(tmp_path):
+    """Importing src.config leaves the environment alone; get_settings() still honours .env."""
+    (tmp_path / ".env").write_text("AUDITOR_LLM_RPM=7\n")
+    out = _run_python(
+        "import os, src.config as c; before = 'AUDITOR_LLM_RPM' in os.environ; "
+        "print(before, c.get_settings().llm_rpm)",
+        tmp_path,
+    )
+    assert out.split() == ["False", "7"]
+
+
+def test_collect_evidence_reports_each_submission(git_repo, tmp_path, monkeypatch):
+    """Evidence records come back in order; a broken URL yields zero-confidence evidence, not an exception."""
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    records = collect_evidence([{"repo_url": str(git_repo)}, {"repo_url": str(tmp_path / "missing")}], workers=2)
+
+    assert records[0]["repo_url"] == str(git_repo) and len(records[0]["commit_sha"]) == 40
+    assert records[0]["evidences"]["git_history"][0]["found"] is True
+    assert records[1]["evidences"]["git_history"][0]["confidence"] == 0.0
+    json.dumps(records)
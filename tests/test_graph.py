@@ -0,0 +1,123 @@
+import asyncio
+from benchmarks.synthetic import make_synthetic_pdf
+from src.graph import build_graph
+from src.llm.transport import FakeTransport, set_transport
+from src.nodes.detectives import REPO_PROTOCOLS
+from src.rubric import criteria_by_detective
+import src.graph as graph
+
+RUBRIC = [
+    {"id": "git_forensic_analysis", "name": "Git"},
+    {"id": "report_accuracy", "name": "Report"},
+    {"id": "swarm_visual", "name": "Diagram"},
+    {"id": "custom_check", "name": "Custom"},
+]
+
+
+def _state(repo):
+    return {"repo_url": str(repo), "pdf_path": "missing.pdf", "rubric_dimensions": RUBRIC,
+            "evidences": {}, "opinions": [], "final_report": None}
+
+
+def test_criteria_by_detective_routes_single_source_criteria():
+    """Criteria fed by one detective go to its lane; unmapped criteria wait for all evidence."""
+    groups = criteria_by_detective(RUBRIC)
+    assert [d["id"] for d in groups["repo_investigator"]] == ["git_forensic_analysis"]
+    assert [d["id"] for d in groups["doc_analyst"]] == ["report_accuracy"]
+    assert [d["id"] for d in groups["vision_inspector"]] == ["swarm_visual"]
+    assert [d["id"] for d in groups[""]] == ["custom_check"]
+
+
+def test_pipelined_graph_matches_barrier_graph(git_repo, tmp_path, monkeypatch):
+    """Both topologies produce the same report, in rubric order."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    set_transport(FakeTransport(seed=4))
+    try:
+        barrier = asyncio.run(build_graph(pipelined=False).ainvoke(_state(git_repo)))
+        pipelined = asyncio.run(build_graph(pipelined=True).ainvoke(_state(git_repo)))
+    finally:
+        set_transport(None)
+
+    assert [c.dimension_id for c in pipelined["final_report"].criteria] == [d["id"] for d in RUBRIC]
+    assert pipelined["final_report"].overall_score == barrier["final_report"].overall_score
+    assert len(pipelined["opinions"]) == len(barrier["opinions"]) == 12
+    assert pipelined["commit_sha"] == barrier["commit_sha"]
+
+
+class _CountingTransport(FakeTransport):
+    def __init__(self):
+        super().__init__(seed=4)
+        self.calls = 0
+
+    def invoke(self, call, messages, timeout=None):
+        self.calls += 1
+        return super().invoke(call, messages, timeout)
+
+    async def ainvoke(self, call, messages):
+        self.calls += 1
+        return await super().ainvoke(call, messages)
+
+
+def test_barrier_graph_records_each_call_and_step_once(git_repo, tmp_path, monkeypatch):
+    """Usage and timings are reduced once per model call and detective step, via invoke and ainvoke."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    state = {**_state(git_repo), "pdf_path": make_synthetic_pdf(str(tmp_path / "report.pdf"), pages=1, images=1, citation_density=0.0)}
+    for run in (lambda app: app.invoke(state), lambda app: asyncio.run(app.ainvoke(state))):
+        transport = _CountingTransport()
+        set_transport(transport)
+        try:
+            result = run(build_graph(pipelined=False))
+        finally:
+            set_transport(None)
+
+        assert [u["node"] for u in result["llm_usage"]].count("vision_inspector") == 1
+        assert len(result["llm_usage"]) == transport.calls
+        assert len(result["timings"]) == 1 + len(REPO_PROTOCOLS)
+
+
+def test_repo_criteria_are_judged_before_slow_vision_finishes(git_repo, tmp_path, monkeypatch):
+    """The repo lane's judges do not wait for the vision detective."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    events = []
+    real_judge = graph.ajudge_node
+
+    async def slow_vision(state):
+        await asyncio.sleep(0.5)
+        events.append("vision_done")
+        return {"evidences": {}}
+
+    async def recording_judge(state, persona, prompt):
+        events.append(tuple(d["id"] for d in state["rubric_dimensions"]))
+        return await real_judge(state, persona, prompt)
+
+    monkeypatch.setattr(graph, "avision_inspector_node", slow_vision)
+    monkeypatch.setattr(graph, "ajudge_node", recording_judge)
+    set_transport(FakeTransport(seed=4))
+    try:
+        result = asyncio.run(build_graph(pipelined=True).ainvoke(_state(git_repo)))
+    finally:
+        set_transport(None)
+
+    assert events.index(("git_forensic_analysis",)) < events.index("vision_done")
+    assert events[-1] == ("custom_check",)
+    assert len(result["final_report"].criteria) == 4
+
+
+def test_failed_inputs_skip_judges_entirely(tmp_path, monkeypatch):
+    """A broken repo URL and missing report go straight to default opinions: no LLM call at all."""
+    from unittest.mock import AsyncMock
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    transport = AsyncMock()
+    set_transport(transport)
+    try:
+        result = asyncio.run(build_graph().ainvoke(_state(tmp_path / "no_such_repo")))
+    finally:
+        set_transport(None)
+
+    transport.ainvoke.assert_not_awaited()
+    assert len(result["opinions"]) == 12
+    assert {c.final_score for c in result["final_report"].criteria} == {1}
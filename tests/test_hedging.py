@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+from src.config import reset_settings
+from src.llm import clients
+from src.llm.hedging import LatencyTracker, HedgeBudget, get_hedge_budget, hedged_call, hedged_call_sync, get_latency_tracker, reset_hedging
+from src.llm.transport import FakeTransport, set_transport
+
+
+def test_latency_tracker_quantile():
+    """Quantiles come from the per-call-type window."""
+    tracker = LatencyTracker(window=10)
+    for latency in [0.1, 0.2, 0.3, 0.4, 1.0]:
+        tracker.observe("judge", latency)
+    assert tracker.quantile("judge", 0.5) == 0.3
+    assert tracker.quantile("judge", 0.99) == 1.0
+    assert tracker.quantile("vision", 0.5) is None
+
+
+def test_hedge_budget_caps_duplicates():
+    """At most `ratio` duplicates per primary call are allowed."""
+    budget = HedgeBudget(0.5)
+    budget.record_call()
+    assert budget.try_spend() is False
+    budget.record_call()
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+
+def test_slow_call_is_hedged_and_fast_duplicate_wins(monkeypatch):
+    """A call exceeding the observed percentile is duplicated; first answer wins."""
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_ENABLED", "true")
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_MIN_SAMPLES", "3")
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_BUDGET", "1.0")
+    reset_settings()
+    reset_hedging()
+    for _ in range(3):
+        get_latency_tracker().observe("judge", 0.02)
+    delays = [2.0, 0.0]
+
+    async def make_call():
+        delay = delays.pop(0)
+        await asyncio.sleep(delay)
+        return delay
+
+    stats = {}
+    started = time.perf_counter()
+    try:
+        result = asyncio.run(hedged_call("judge", make_call, stats=stats))
+    finally:
+        monkeypatch.delenv("AUDITOR_LLM_HEDGE_ENABLED")
+        reset_settings()
+        reset_hedging()
+
+    assert result == 0.0
+    assert stats["hedged"] is True
+    assert time.perf_counter() - started < 1.0
+
+
+def test_hedge_refused_by_rate_limiter_does_not_spend_budget(monkeypatch):
+    """Only hedges actually sent count against the budget."""
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_ENABLED", "true")
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_MIN_SAMPLES", "3")
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_BUDGET", "1.0")
+    reset_settings()
+    reset_hedging()
+    for _ in range(3):
+        get_latency_tracker().observe("judge", 0.01)
+
+    async def make_call():
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    stats = {}
+    try:
+        result = asyncio.run(hedged_call("judge", make_call, may_send=lambda: False, stats=stats))
+        budget = get_hedge_budget()
+        assert (result, budget.hedges) == ("primary", 0)
+        assert "hedged" not in stats
+    finally:
+        reset_hedging()
+
+
+def _warm_hedging(monkeypatch, call_type):
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_ENABLED", "true")
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_MIN_SAMPLES", "3")
+    monkeypatch.setenv("AUDITOR_LLM_HEDGE_BUDGET", "1.0")
+    reset_settings()
+    reset_hedging()
+    for _ in range(3):
+        get_latency_tracker().observe(call_type, 0.02)
+
+
+def test_slow_blocking_call_is_hedged_on_a_worker_thread(monkeypatch):
+    """The blocking variant duplicates a slow call too; the first answer wins without waiting for the loser."""
+    _warm_hedging(monkeypatch, "judge")
+    delays = [1.0, 0.0]
+    lock = threading.Lock()
+
+    def make_call():
+        with lock:
+            delay = delays.pop(0)
+        time.sleep(delay)
+        return delay
+
+    stats = {}
+    started = time.perf_counter()
+    try:
+        result = hedged_call_sync("judge", make_call, stats=stats)
+    finally:
+        reset_hedging()
+
+    assert result == 0.0
+    assert stats["hedged"] is True
+    assert time.perf_counter() - started < 0.5
+
+
+def test_unwarmed_blocking_call_runs_in_the_callers_thread():
+    """Without enough latency samples there is no threshold, so no worker thread is involved."""
+    reset_hedging()
+    try:
+        assert hedged_call_sync("judge", threading.get_ident) == threading.get_ident()
+        assert get_latency_tracker().count("judge") == 1
+    finally:
+        reset_hedging()
+
+
+class _SlowFirstTransport(FakeTransport):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, call, messages, timeout=None):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            time.sleep(1.0)
+        return super().invoke(call, messages, timeout)
+
+
+def test_invoke_llm_hedges_blocking_calls(monkeypatch):
+    """`invoke_llm`, used by `app.invoke` and the pipelined judge tasks, hedges like `ainvoke_llm`."""
+    _warm_hedging(monkeypatch, "vision")
+    transport = _SlowFirstTransport()
+    call = clients.LLMCall("vision")
+    set_transport(transport)
+    started = time.perf_counter()
+    try:
+        clients.invoke_llm(call, [("human", "diagrams")])
+    finally:
+        set_transport(None)
+        reset_hedging()
+
+    assert time.perf_counter() - started < 0.5
+    assert transport.calls == 2
+    assert call.usage["hedged"]
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import multiprocessing
+import subprocess
+import time
+from src.job_queue import JobQueue
+from src.llm.transport import FakeTransport, set_transport
+from src.runner import ManifestEntry
+from src.state import AuditReport
+from src.worker import run_worker
+import src.worker
+from tests.conftest import make_git_repo
+
+
+def test_enqueue_deduplicates_identical_inputs(tmp_path, git_repo):
+    """Same repo, commit, report and rubric enqueue once; a new commit is a new job."""
+    queue = JobQueue(str(tmp_path / "q.db"))
+    entry = ManifestEntry(repo_url=str(git_repo), pdf_path=str(tmp_path / "missing.pdf"))
+    job_id, created = queue.enqueue(entry)
+    assert created
+    assert len(queue.get(job_id)["commit_sha"]) == 40
+    assert queue.enqueue(entry) == (job_id, False)
+    assert queue.enqueue(entry, commit_sha="f" * 40)[1] is True
+
+
+def test_expired_lease_is_retried_by_another_worker(tmp_path):
+    """A worker that stops heartbeating loses the job; the stale worker cannot complete it."""
+    queue = JobQueue(str(tmp_path / "q.db"))
+    job_id, _ = queue.enqueue(ManifestEntry(repo_url="https://github.com/a/b"), commit_sha="abc")
+    first = queue.lease("w1", lease_s=0.05)
+    assert first.job_id == job_id and queue.lease("w2", lease_s=60) is None
+
+    time.sleep(0.1)
+    second = queue.lease("w2", lease_s=60)
+    assert second.job_id == job_id and second.attempts == 2
+    assert queue.heartbeat(job_id, "w1", 60) is False
+    assert queue.complete(job_id, "w1", "x.json", 50.0) is False
+    assert queue.complete(job_id, "w2", "y.json", 75.0) is True
+    assert queue.get(job_id)["status"] == "done"
+
+
+def test_failed_attempts_retry_until_max(tmp_path):
+    """Failures return the job to pending until max_attempts, then mark it failed."""
+    queue = JobQueue(str(tmp_path / "q.db"), max_attempts=2)
+    job_id, _ = queue.enqueue(ManifestEntry(repo_url="https://github.com/a/b"), commit_sha="abc")
+    queue.fail(queue.lease("w", 60).job_id, "w", "boom")
+    assert queue.get(job_id)["status"] == "pending"
+    queue.fail(queue.lease("w", 60).job_id, "w", "boom again")
+    assert queue.get(job_id)["status"] == "failed"
+    assert queue.lease("w", 60) is None
+
+
+def _drain(path, worker_id, out):
+    queue = JobQueue(path)
+    leased = []
+    while (job := queue.lease(worker_id, 60)) is not None:
+        leased.append(job.job_id)
+        queue.complete(job.job_id, worker_id, "", None)
+    out.put(leased)
+
+
+def test_concurrent_processes_lease_each_job_once(tmp_path):
+    """Worker processes sharing the queue file never lease the same job twice."""
+    path = str(tmp_path / "q.db")
+    queue = JobQueue(path)
+    for i in range(40):
+        queue.enqueue(ManifestEntry(repo_url=f"https://github.com/u/r{i}"), commit_sha="c")
+    out = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_drain, args=(path, f"w{i}", out)) for i in range(3)]
+    for w in workers:
+        w.start()
+    leased = [job_id for _ in workers for job_id in out.get(timeout=30)]
+    for w in workers:
+        w.join()
+    assert sorted(leased) == list(range(1, 41))
+    assert queue.counts() == {"done": 40}
+
+
+class _StubApp:
+    async def ainvoke(self, state):
+        if "broken" in state["repo_url"]:
+            raise RuntimeError("boom")
+        report = AuditReport(repo_url=state["repo_url"], executive_summary="", overall_score=64.0, criteria=[], remediation_plan="")
+        return {"final_report": report, "commit_sha": "abc"}
+
+
+def test_worker_writes_results_and_records_failures(tmp_path, monkeypatch):
+    """run_worker drains the queue, writes results by fingerprint and retries failures."""
+    monkeypatch.setenv("AUDITOR_QUEUE_RESULTS_DIR", str(tmp_path / "results"))
+    monkeypatch.setenv("AUDITOR_QUEUE_MAX_ATTEMPTS", "2")
+    path = str(tmp_path / "q.db")
+    queue = JobQueue(path, max_attempts=2)
+    ok_id, _ = queue.enqueue(ManifestEntry(repo_url="https://github.com/u/ok"), commit_sha="abc")
+    bad_id, _ = queue.enqueue(ManifestEntry(repo_url="https://github.com/u/broken"), commit_sha="abc")
+
+    assert run_worker(path, "w", app=_StubApp(), exit_when_empty=True) == 1
+    done = queue.get(ok_id)
+    assert done["overall_score"] == 64.0
+    assert json.load(open(done["result_path"]))["final_report"]["repo_url"] == "https://github.com/u/ok"
+    failed = queue.get(bad_id)
+    assert (failed["status"], failed["attempts"], failed["error"]) == ("failed", 2, "RuntimeError: boom")
+
+
+def test_worker_audits_the_enqueued_commit_on_one_loop(tmp_path, monkeypatch):
+    """Checkpointed jobs share one graph and event loop, and each audits the commit it was enqueued for."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUDITOR_QUEUE_RESULTS_DIR", str(tmp_path / "results"))
+    monkeypatch.setenv("AUDITOR_CHECKPOINT_PATH", str(tmp_path / "checkpoints.db"))
+    repo = make_git_repo(tmp_path / "submission", ("feat: init", "feat: more"))
+    shas = subprocess.run(["git", "rev-list", "--reverse", "HEAD"], cwd=repo, capture_output=True, text=True, check=True).stdout.split()
+    queue = JobQueue(str(tmp_path / "q.db"))
+    job_ids = [queue.enqueue(ManifestEntry(repo_url=str(repo)), commit_sha=sha)[0] for sha in shas]
+
+    loops, run_job = set(), src.worker._run_job
+    async def recording_run_job(job, app):
+        loops.add(id(asyncio.get_running_loop()))
+        return await run_job(job, app)
+    monkeypatch.setattr(src.worker, "_run_job", recording_run_job)
+    set_transport(FakeTransport())
+    try:
+        assert run_worker(str(tmp_path / "q.db"), "w", exit_when_empty=True) == 2
+    finally:
+        set_transport(None)
+
+    assert len(loops) == 1
+    audited = [json.load(open(queue.get(job_id)["result_path"]))["commit_sha"] for job_id in job_ids]
+    assert audited == shas
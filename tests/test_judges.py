@@ -0,0 +1,247 @@
+import asyncio
+from unittest.mock import AsyncMock
+from langchain_core.messages import AIMessage
+from src.state import Evidence, JudicialOpinion
+from src.llm.transport import set_transport
+from src.nodes.judges import OpinionsResponse, aggregate_samples, ajudge_node, salvage_opinions, SAFE_DEFAULT_ARGUMENT
+
+RUBRIC = [
+    {"id": "git_forensic_analysis", "name": "Git Forensic Analysis"},
+    {"id": "theoretical_depth", "name": "Theoretical Depth"},
+]
+EVIDENCES = {
+    "git_history": [Evidence(goal="g", found=True, content="3 commits", location="git:log", rationale="r", confidence=1.0)],
+    "theoretical_depth": [Evidence(goal="t", found=True, content="deep", location="pdf", rationale="r", confidence=0.8)],
+}
+
+
+def _raw_response(opinions):
+    """Mimics include_raw output where whole-response validation failed."""
+    raw = AIMessage(content="", tool_calls=[{"name": "OpinionsResponse", "args": {"opinions": opinions}, "id": "1"}])
+    return {"raw": raw, "parsed": None, "parsing_error": ValueError("bad entry")}
+
+
+def _run_with(transport, coro):
+    """Runs a judge coroutine against a stub transport."""
+    set_transport(transport)
+    try:
+        return asyncio.run(coro)
+    finally:
+        set_transport(None)
+
+
+def test_salvage_keeps_valid_entries_and_pins_judge():
+    """A malformed entry does not discard its valid neighbours."""
+    result = _raw_response([
+        {"criterion_id": "git_forensic_analysis", "judge": "Defense", "score": 70, "argument": "ok"},
+        {"criterion_id": "theoretical_depth", "judge": "Prosecutor", "score": 500, "argument": "bad"},
+        {"criterion_id": "invented", "judge": "Prosecutor", "score": 50, "argument": "extra"},
+    ])
+    kept = salvage_opinions(result, "Prosecutor", ["git_forensic_analysis", "theoretical_depth"])
+    assert list(kept) == ["git_forensic_analysis"]
+    assert kept["git_forensic_analysis"].judge == "Prosecutor"
+
+
+def test_follow_up_covers_only_missing_criteria():
+    """The retry asks only for the missing criterion with only its evidence."""
+    first = _raw_response([
+        {"criterion_id": "git_forensic_analysis", "judge": "Prosecutor", "score": 40, "argument": "thin history"},
+    ])
+    second = {"raw": None, "parsing_error": None, "parsed": OpinionsResponse(opinions=[
+        JudicialOpinion(criterion_id="theoretical_depth", judge="Prosecutor", score=60, argument="fine"),
+    ])}
+    transport = AsyncMock()
+    transport.ainvoke = AsyncMock(side_effect=[first, second])
+    state = {"rubric_dimensions": RUBRIC, "evidences": EVIDENCES}
+
+    result = _run_with(transport, ajudge_node(state, "Prosecutor", "be strict"))
+
+    assert [o.criterion_id for o in result["opinions"]] == ["git_forensic_analysis", "theoretical_depth"]
+    follow_up_call, follow_up_messages = transport.ainvoke.await_args_list[1].args
+    assert follow_up_call.tags["criteria"] == ["theoretical_depth"]
+    follow_up_system = follow_up_messages[0][1]
+    assert '"id": "git_forensic_analysis"' not in follow_up_system
+    assert "3 commits" not in follow_up_system
+    assert "deep" in follow_up_system
+
+
+def test_unresolved_criteria_fall_back_to_safe_default():
+    """Criteria never returned still receive an opinion."""
+    transport = AsyncMock()
+    transport.ainvoke = AsyncMock(return_value=_raw_response([]))
+    state = {"rubric_dimensions": RUBRIC, "evidences": EVIDENCES}
+
+    result = _run_with(transport, ajudge_node(state, "Defense", "be kind"))
+
+    assert len(result["opinions"]) == 2
+    assert all(o.score == 1 and o.argument == SAFE_DEFAULT_ARGUMENT for o in result["opinions"])
+    assert transport.ainvoke.await_count == 3
+
+
+def test_sharded_judging_runs_under_concurrency_cap(monkeypatch):
+    """Each shard gets only its own criteria and in-flight calls respect the cap."""
+    from src.config import reset_settings
+    monkeypatch.setenv("AUDITOR_JUDGE_SHARD_SIZE", "1")
+    monkeypatch.setenv("AUDITOR_LLM_MAX_CONCURRENCY", "1")
+    reset_settings()
+    in_flight = {"now": 0, "max": 0}
+
+    async def fake_ainvoke(call, messages):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        criterion = "git_forensic_analysis" if "git_forensic_analysis" in messages[0][1] else "theoretical_depth"
+        return OpinionsResponse(opinions=[
+            JudicialOpinion(criterion_id=criterion, judge="TechLead", score=55, argument="shard"),
+        ])
+
+    transport = AsyncMock()
+    transport.ainvoke = fake_ainvoke
+    state = {"rubric_dimensions": RUBRIC, "evidences": EVIDENCES}
+    try:
+        result = _run_with(transport, ajudge_node(state, "TechLead", "be pragmatic"))
+    finally:
+        monkeypatch.delenv("AUDITOR_JUDGE_SHARD_SIZE")
+        monkeypatch.delenv("AUDITOR_LLM_MAX_CONCURRENCY")
+        reset_settings()
+
+    assert [o.criterion_id for o in result["opinions"]] == ["git_forensic_analysis", "theoretical_depth"]
+    assert in_flight["max"] == 1
+
+
+def test_blocking_shards_overlap_under_a_process_wide_cap(monkeypatch):
+    """Sync judge shards run concurrently, and the cap holds across separate event loops."""
+    import threading
+    import time
+    from unittest.mock import MagicMock
+    from src.config import reset_settings
+    from src.nodes.judges import judge_node
+    monkeypatch.setenv("AUDITOR_JUDGE_SHARD_SIZE", "1")
+    reset_settings()
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_invoke(call, messages, timeout=None):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.05)
+        with lock:
+            in_flight["now"] -= 1
+        criterion = "git_forensic_analysis" if "git_forensic_analysis" in messages[0][1] else "theoretical_depth"
+        return OpinionsResponse(opinions=[
+            JudicialOpinion(criterion_id=criterion, judge=call.tags["persona"], score=55, argument="shard"),
+        ])
+
+    transport = MagicMock()
+    transport.invoke = fake_invoke
+    state = {"rubric_dimensions": RUBRIC, "evidences": EVIDENCES}
+    set_transport(transport)
+    try:
+        result = judge_node(state, "Defense", "be kind")
+        assert [o.score for o in result["opinions"]] == [55, 55]
+        assert in_flight["max"] == 2
+
+        monkeypatch.setenv("AUDITOR_LLM_MAX_CONCURRENCY", "1")
+        reset_settings()
+        in_flight["max"] = 0
+        judges = [threading.Thread(target=judge_node, args=(state, persona, "x")) for persona in ("Prosecutor", "TechLead")]
+        for judge in judges:
+            judge.start()
+        for judge in judges:
+            judge.join()
+        assert in_flight["max"] == 1
+    finally:
+        set_transport(None)
+
+
+def test_fast_path_scores_conclusive_evidence_without_llm():
+    """Conclusive flags decide the criterion; ambiguous ones still reach the LLM."""
+    from src.nodes.fast_path import FAST_PATH_MARKER, split_fast_path
+    evidences = {
+        "safe_tool_engineering": [Evidence(goal="s", found=False, location="src/tools/", rationale="r", confidence=1.0,
+                                           content="Tools secure: tempfile=True, subprocess=True, no_os_system=False.")],
+        "structured_output_enforcement": [Evidence(goal="o", found=False, location="src/nodes/judges.py", rationale="r", confidence=1.0,
+                                                   content="Structured Output: used=True, retry_logic=False.")],
+    }
+    rubric = [{"id": "safe_tool_engineering", "name": "Safe"}, {"id": "structured_output_enforcement", "name": "Structured"}]
+
+    decided, ambiguous = split_fast_path(rubric, evidences, "Defense")
+
+    assert [o.criterion_id for o in decided] == ["safe_tool_engineering"]
+    assert decided[0].score == 20 and decided[0].argument.startswith(FAST_PATH_MARKER)
+    assert [d["id"] for d in ambiguous] == ["structured_output_enforcement"]
+
+
+def test_judge_skips_llm_when_every_criterion_is_fast_pathed():
+    """No model call is made when the rule table covers the whole rubric."""
+    evidences = {"safe_tool_engineering": [Evidence(goal="s", found=True, location="src/tools/", rationale="r", confidence=1.0,
+                                                    content="Tools secure: tempfile=True, subprocess=True, no_os_system=True.")]}
+    transport = AsyncMock()
+    state = {"rubric_dimensions": [{"id": "safe_tool_engineering", "name": "Safe"}], "evidences": evidences}
+
+    result = _run_with(transport, ajudge_node(state, "Prosecutor", "be strict"))
+
+    assert result["opinions"][0].score == 90
+    assert result["llm_usage"] == []
+    transport.ainvoke.assert_not_awaited()
+
+
+def test_criteria_without_usable_evidence_get_safe_default_without_llm():
+    """Failed (zero-confidence) or missing evidence yields the safe default; the rest still reaches the LLM."""
+    from src.nodes.fast_path import split_unsupported
+    evidences = {
+        "git_history": [Evidence(goal="g", found=False, content="clone failed", location="repo_root", rationale="r", confidence=0.0)],
+        "theoretical_depth": [Evidence(goal="t", found=True, content="deep", location="pdf", rationale="r", confidence=0.8)],
+    }
+    unsupported, supported = split_unsupported(RUBRIC, evidences)
+    assert [d["id"] for d in unsupported] == ["git_forensic_analysis"]
+    assert [d["id"] for d in supported] == ["theoretical_depth"]
+
+    transport = AsyncMock()
+    state = {"rubric_dimensions": RUBRIC[:1], "evidences": evidences}
+    result = _run_with(transport, ajudge_node(state, "Defense", "be kind"))
+
+    assert result["opinions"][0].score == 1 and result["opinions"][0].argument == SAFE_DEFAULT_ARGUMENT
+    transport.ainvoke.assert_not_awaited()
+
+
+def test_self_consistency_stops_early_and_escalates_high_variance(monkeypatch):
+    """Agreeing criteria stop at two samples; noisy ones escalate up to the cap."""
+    monkeypatch.setenv("AUDITOR_JUDGE_SAMPLES_MAX", "4")
+    monkeypatch.setenv("AUDITOR_JUDGE_SAMPLE_TOLERANCE", "10")
+    monkeypatch.setenv("AUDITOR_JUDGE_FAST_PATH", "false")
+    scripted = {"git_forensic_analysis": [50, 52], "theoretical_depth": [20, 80, 60, 62]}
+    requested = []
+
+    async def fake_ainvoke(call, messages):
+        requested.append(list(call.tags["criteria"]))
+        return OpinionsResponse(opinions=[
+            JudicialOpinion(criterion_id=c, judge="TechLead", score=scripted[c].pop(0), argument=f"sample for {c}")
+            for c in call.tags["criteria"]
+        ])
+
+    transport = AsyncMock()
+    transport.ainvoke = fake_ainvoke
+    result = _run_with(transport, ajudge_node({"rubric_dimensions": RUBRIC, "evidences": EVIDENCES}, "TechLead", "be pragmatic"))
+
+    by_id = {o.criterion_id: o for o in result["opinions"]}
+    assert requested[2:] == [["theoretical_depth"], ["theoretical_depth"]]
+    assert by_id["git_forensic_analysis"].sample_scores == [50, 52]
+    assert by_id["theoretical_depth"].sample_scores == [20, 80, 60, 62]
+    assert by_id["theoretical_depth"].score == 61
+
+
+def test_aggregate_samples_uses_median_and_ignores_safe_defaults():
+    """The median comes from real samples; safe-default fallbacks do not drag it down."""
+    samples = [
+        JudicialOpinion(criterion_id="c", judge="Defense", score=70, argument="a"),
+        JudicialOpinion(criterion_id="c", judge="Defense", score=1, argument=SAFE_DEFAULT_ARGUMENT),
+        JudicialOpinion(criterion_id="c", judge="Defense", score=90, argument="b"),
+        JudicialOpinion(criterion_id="c", judge="Defense", score=76, argument="c"),
+    ]
+    merged = aggregate_samples(samples)
+    assert merged.score == 76
+    assert merged.argument == "c"
+    assert merged.sample_scores == [70, 90, 76]
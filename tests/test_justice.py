@@ -0,0 +1,69 @@
+import json
+from src.archive import iter_audit_paths, load_audit, save_audit
+from src.rubric import SynthesisRules, load_synthesis_rules
+from src.state import Evidence, JudicialOpinion
+from src.nodes.justice import audit_id_for, synthesize_report
+import resynthesize
+
+RUBRIC = [{"id": "safe_tool_engineering", "name": "Safe Tool Engineering"}, {"id": "graph_orchestration", "name": "Graph Orchestration"}]
+OPINIONS = [
+    JudicialOpinion(criterion_id="safe_tool_engineering", judge="Prosecutor", score=30, argument="os.system found"),
+    JudicialOpinion(criterion_id="safe_tool_engineering", judge="Defense", score=90, argument="mostly sandboxed"),
+    JudicialOpinion(criterion_id="safe_tool_engineering", judge="TechLead", score=90, argument="works"),
+    JudicialOpinion(criterion_id="graph_orchestration", judge="Prosecutor", score=60, argument="ok"),
+    JudicialOpinion(criterion_id="graph_orchestration", judge="TechLead", score=80, argument="modular"),
+]
+
+
+def test_default_rules_match_rubric_parameters():
+    """The rubric's parameters block reproduces the historical hard-coded rules."""
+    assert load_synthesis_rules() == SynthesisRules()
+
+
+def test_audit_ids_are_unique_within_the_same_second():
+    """Two audits of one repo started in the same second get distinct ids."""
+    first = audit_id_for("https://github.com/alice/auditor.git", "20250101_120000")
+    second = audit_id_for("https://github.com/alice/auditor.git", "20250101_120000")
+    assert first.startswith("alice_auditor_20250101_120000_")
+    assert first != second
+
+
+def test_synthesis_applies_configured_rules():
+    """Security cap, functionality weight and dissent threshold come from the rules."""
+    report = synthesize_report("https://github.com/a/b", RUBRIC, OPINIONS)
+    by_id = {c.dimension_id: c for c in report.criteria}
+    assert by_id["safe_tool_engineering"].final_score == 60
+    assert by_id["graph_orchestration"].final_score == 80
+
+    strict = SynthesisRules(security_cap=25, functionality_keywords=[], dissent_threshold=50)
+    report = synthesize_report("https://github.com/a/b", RUBRIC, OPINIONS, strict)
+    by_id = {c.dimension_id: c for c in report.criteria}
+    assert by_id["safe_tool_engineering"].final_score == 25
+    assert by_id["graph_orchestration"].final_score == 70
+    assert by_id["graph_orchestration"].dissent_summary is None
+
+
+def test_resynthesize_rescores_archived_audits(tmp_path, capsys):
+    """Archived audits round-trip and are re-scored with a new rubric without the graph."""
+    state = {
+        "repo_url": "https://github.com/a/b",
+        "rubric_dimensions": RUBRIC,
+        "evidences": {"safe_tool_engineering": [Evidence(goal="g", found=True, content="no_os_system=False", location="src/tools", rationale="r", confidence=1.0)]},
+        "opinions": OPINIONS,
+        "llm_usage": [],
+        "degraded_stages": [{"stage": "repo_investigator.clone", "reason": "DeadlineExceeded: clone"}],
+    }
+    archive = tmp_path / "audits"
+    path = save_audit(state, str(archive), "a_b_1", overall_score=70.0)
+    loaded = load_audit(path)
+    assert loaded["opinions"] == OPINIONS
+    assert loaded["evidences"]["safe_tool_engineering"][0].content == "no_os_system=False"
+    assert list(iter_audit_paths(str(archive))) == [path]
+
+    rubric_path = tmp_path / "rubric.json"
+    rubric_path.write_text(json.dumps({"synthesis_rules": {"parameters": {"security_cap": 40}}}))
+    out = tmp_path / "out"
+    assert resynthesize.main(["--archive", str(archive), "--rubric", str(rubric_path), "--out", str(out)]) == 1
+    assert "a_b_1: 70.00 -> 60.00" in capsys.readouterr().out
+    assert "Final Score: 40/100" in (out / "audit_a_b_1.md").read_text()
+    assert "`repo_investigator.clone`" in (out / "audit_a_b_1.md").read_text()
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from unittest.mock import patch, MagicMock, AsyncMock
+import pytest
+from src.deadline import DeadlineExceeded
+from src.state import JudicialOpinion
+from src.llm import clients
+from src.llm.rate_limit import TokenBucket, get_concurrency_cap, get_rate_limiter
+from src.llm.transport import FakeTransport, set_transport
+from src.nodes.judges import OpinionsResponse, judge_node, ajudge_node
+
+
+@patch("src.llm.clients.ChatGoogleGenerativeAI")
+def test_get_llm_reuses_pooled_client(mock_chat):
+    """Same model and settings return the same client instance."""
+    mock_chat.side_effect = lambda **kwargs: MagicMock()
+    clients.clear_pool()
+    first = clients.get_llm(temperature=0.2)
+    second = clients.get_llm(temperature=0.2)
+    other = clients.get_llm(temperature=0.1)
+
+    assert first is second
+    assert mock_chat.call_count == 2
+    assert other is not first
+    clients.clear_pool()
+
+
+@patch("src.llm.clients.ChatGoogleGenerativeAI")
+def test_get_structured_llm_shares_chat_client(mock_chat):
+    """Structured runnables are pooled per schema and built on the pooled chat client."""
+    clients.clear_pool()
+    first = clients.get_structured_llm(OpinionsResponse)
+    second = clients.get_structured_llm(OpinionsResponse)
+
+    assert first is second
+    assert mock_chat.call_count == 1
+    mock_chat.return_value.with_structured_output.assert_called_once_with(OpinionsResponse, include_raw=False)
+    clients.clear_pool()
+
+
+@patch("src.llm.clients.ChatGoogleGenerativeAI")
+def test_call_timeout_becomes_the_request_timeout(mock_chat):
+    """A budgeted call runs on a copy of the pooled client carrying the budget as its request timeout."""
+    clients.clear_pool()
+    call = clients.LLMCall("judge", schema=OpinionsResponse, include_raw=True)
+    call.runnable(1.5)
+    pooled = mock_chat.return_value
+    pooled.model_copy.assert_called_once_with(update={"timeout": 1.5})
+    pooled.model_copy.return_value.with_structured_output.assert_called_once_with(OpinionsResponse, include_raw=True)
+    clients.clear_pool()
+
+
+def test_blocking_call_ends_at_its_budget(monkeypatch):
+    """An overrunning blocking call fails at its budget and frees its concurrency slot instead of running on."""
+    monkeypatch.setenv("AUDITOR_LLM_CALL_TIMEOUT_S", "0.2")
+    call = clients.LLMCall("vision")
+    set_transport(FakeTransport(latency=lambda: 30.0))
+    started = time.perf_counter()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            clients.invoke_llm(call, [("human", "diagrams")])
+    finally:
+        set_transport(None)
+    assert time.perf_counter() - started < 1
+    assert get_concurrency_cap()._in_flight == 0
+    assert call.usage["timed_out"]
+
+
+def test_blocking_call_does_not_queue_past_its_budget(monkeypatch):
+    """A rate-limiter wait longer than the call's budget fails at once instead of sleeping it out."""
+    monkeypatch.setenv("AUDITOR_LLM_CALL_TIMEOUT_S", "0.2")
+    get_rate_limiter().requests = TokenBucket(capacity=1, refill_per_second=0.01)
+    get_rate_limiter().acquire()
+    transport = MagicMock()
+    set_transport(transport)
+    started = time.perf_counter()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            clients.invoke_llm(clients.LLMCall("vision"), [("human", "diagrams")])
+    finally:
+        set_transport(None)
+    assert time.perf_counter() - started < 1
+    transport.invoke.assert_not_called()
+    assert get_concurrency_cap()._in_flight == 0
+
+
+def test_judge_node_sync_and_async_paths(monkeypatch):
+    """The sync node uses the transport's invoke, the async node awaits ainvoke."""
+    monkeypatch.setenv("AUDITOR_JUDGE_SKIP_MISSING_EVIDENCE", "false")
+    response = OpinionsResponse(opinions=[
+        JudicialOpinion(criterion_id="git_forensic_analysis", judge="Defense", score=70, argument="ok")
+    ])
+    transport = MagicMock()
+    transport.invoke.return_value = response
+    transport.ainvoke = AsyncMock(return_value=response)
+    state = {"rubric_dimensions": [{"id": "git_forensic_analysis", "name": "Git"}], "evidences": {}}
+
+    set_transport(transport)
+    try:
+        sync_result = judge_node(state, "Defense", "be kind")
+        async_result = asyncio.run(ajudge_node(state, "Defense", "be kind"))
+    finally:
+        set_transport(None)
+
+    assert sync_result["opinions"] == response.opinions
+    assert async_result["opinions"] == response.opinions
+    transport.invoke.assert_called_once()
+    transport.ainvoke.assert_awaited_once()
+    assert transport.ainvoke.await_args.args[0].tags["persona"] == "Defense"
@@ -0,0 +1,105 @@
+import asyncio
+import subprocess
+from benchmarks.synthetic import make_synthetic_pdf
+from src.config import reset_settings
+from src.graph import build_graph
+from src.memo import amemoized, detective_memo_key, memoized
+from src.nodes.fast_path import has_usable_evidence
+from src.llm.transport import FakeTransport, set_transport
+from src.state import Evidence
+import src.nodes.detectives as detectives
+
+
+def _state(repo):
+    return {
+        "repo_url": str(repo),
+        "pdf_path": "missing.pdf",
+        "rubric_dimensions": [{"id": "git_forensic_analysis", "name": "Git"}],
+        "evidences": {},
+        "opinions": [],
+        "final_report": None,
+    }
+
+
+def test_repeat_audit_reuses_detective_evidence_until_head_moves(git_repo, tmp_path, monkeypatch):
+    """A second run on the same HEAD skips the clone; a new commit invalidates the memo."""
+    monkeypatch.chdir(tmp_path)
+    clones = []
+    real_clone = detectives.clone_repo
+    monkeypatch.setattr(detectives, "clone_repo", lambda url, timeout=None: clones.append(url) or real_clone(url, timeout))
+    app = build_graph()
+    set_transport(FakeTransport())
+    try:
+        first = app.invoke(_state(git_repo))
+        second = app.invoke(_state(git_repo))
+        assert len(clones) == 1
+        assert second["evidences"] == first["evidences"]
+        assert second["commit_sha"] == first["commit_sha"]
+
+        (git_repo / "new.txt").write_text("x")
+        subprocess.run(["git", "add", "."], cwd=git_repo, check=True)
+        subprocess.run(["git", "-c", "user.email=a@b", "-c", "user.name=a", "commit", "-qm", "feat: more"], cwd=git_repo, check=True)
+        third = app.invoke(_state(git_repo))
+    finally:
+        set_transport(None)
+    assert len(clones) == 2
+    assert third["commit_sha"] != first["commit_sha"]
+
+
+def test_failed_collection_is_not_memoized(git_repo, tmp_path, monkeypatch):
+    """Zero-confidence (failed) evidence is recomputed on the next run."""
+    monkeypatch.chdir(tmp_path)
+    failure = {"evidences": {"git_history": [Evidence(goal="g", found=False, content="clone failed", location="repo_root", rationale="r", confidence=0.0)]}}
+    runs = []
+    for _ in range(2):
+        memoized("repo_investigator", _state(git_repo), lambda: runs.append(1) or failure)
+    assert len(runs) == 2
+
+
+def test_memo_disabled_or_unkeyable(git_repo, tmp_path, monkeypatch):
+    """No key without a reachable remote or report; an empty memo dir turns memoization off."""
+    monkeypatch.chdir(tmp_path)
+    assert detective_memo_key("repo_investigator", _state(tmp_path / "nowhere")) is None
+    assert detective_memo_key("doc_analyst", _state(git_repo)) is None
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    reset_settings()
+    ok = {"evidences": {"git_history": [Evidence(goal="g", found=True, location="git:log", rationale="r", confidence=1.0)]}}
+    runs = []
+    for _ in range(2):
+        memoized("repo_investigator", _state(git_repo), lambda: runs.append(1) or ok)
+    assert len(runs) == 2
+
+
+def test_vision_memo_key_covers_model_and_transport(tmp_path, monkeypatch):
+    """Switching the vision model or the LLM transport does not reuse earlier diagram verdicts."""
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF-1.4")
+    state = {"pdf_path": str(report)}
+    key = detective_memo_key("vision_inspector", state)
+    monkeypatch.setattr("src.memo.VISION_MODEL", "gemini-other")
+    assert detective_memo_key("vision_inspector", state) != key
+    monkeypatch.undo()
+    monkeypatch.setenv("AUDITOR_LLM_TRANSPORT", "fake")
+    reset_settings()
+    assert detective_memo_key("vision_inspector", state) != key
+
+
+class _VisionDown(FakeTransport):
+    async def ainvoke(self, call, messages):
+        self.calls = getattr(self, "calls", 0) + 1
+        raise ValueError("model overloaded")
+
+
+def test_transient_vision_failure_is_judged_but_not_memoized(tmp_path, monkeypatch):
+    """A failed VLM call keeps usable evidence for the judges and is retried on the next run instead of memoized."""
+    monkeypatch.chdir(tmp_path)
+    state = {"pdf_path": make_synthetic_pdf(str(tmp_path / "report.pdf"), pages=1, images=1, citation_density=0.0)}
+    transport = _VisionDown()
+    set_transport(transport)
+    try:
+        updates = [asyncio.run(amemoized("vision_inspector", state, lambda: detectives.avision_inspector_node(state))) for _ in range(2)]
+    finally:
+        set_transport(None)
+    assert transport.calls == 2
+    assert all(detectives.NO_MEMO not in update for update in updates)
+    assert has_usable_evidence("swarm_visual", updates[0]["evidences"])
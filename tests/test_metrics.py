@@ -0,0 +1,82 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+from langchain_core.messages import AIMessage
+from src.llm.metrics import estimate_cost, render_usage_markdown, summarize_usage
+from src.llm.transport import FakeTransport, set_transport
+from src.nodes.judges import ajudge_node
+from src.graph import build_graph
+
+RUBRIC = [{"id": "git_forensic_analysis", "name": "Git"}, {"id": "theoretical_depth", "name": "Depth"}]
+
+
+def test_judge_usage_records_tokens_and_validation_failures(monkeypatch):
+    """Provider usage metadata and salvage failures land in the usage record."""
+    monkeypatch.setenv("AUDITOR_JUDGE_SKIP_MISSING_EVIDENCE", "false")
+    raw = AIMessage(
+        content="",
+        tool_calls=[{"name": "OpinionsResponse", "id": "1", "args": {"opinions": [
+            {"criterion_id": "git_forensic_analysis", "judge": "Defense", "score": 80, "argument": "good"},
+        ]}}],
+        usage_metadata={"input_tokens": 1000, "output_tokens": 200, "total_tokens": 1200},
+    )
+    transport = AsyncMock()
+    transport.name = "stub"
+    transport.ainvoke = AsyncMock(return_value={"raw": raw, "parsed": None, "parsing_error": None})
+    set_transport(transport)
+    try:
+        result = asyncio.run(ajudge_node({"rubric_dimensions": RUBRIC, "evidences": {}}, "Defense", "be kind"))
+    finally:
+        set_transport(None)
+
+    first = result["llm_usage"][0]
+    assert first["persona"] == "Defense"
+    assert first["prompt_tokens"] == 1000 and first["completion_tokens"] == 200
+    assert first["tokens_estimated"] is False
+    assert first["validation_failures"] == 1
+    assert first["cost_usd"] == estimate_cost("gemini-2.5-flash", 1000, 200)
+    assert len(result["llm_usage"]) == 3
+
+
+def test_transport_setup_failure_still_yields_usage_records(monkeypatch):
+    """A call that fails before reaching the transport is recorded, not appended as None."""
+    monkeypatch.setenv("AUDITOR_JUDGE_SKIP_MISSING_EVIDENCE", "false")
+    monkeypatch.setenv("AUDITOR_LLM_TRANSPORT", "bogus")
+    set_transport(None)
+    result = asyncio.run(ajudge_node({"rubric_dimensions": RUBRIC, "evidences": {}}, "Defense", "be kind"))
+
+    assert len(result["llm_usage"]) == 3
+    assert all(u["transport"] == "bogus" and "Unknown LLM transport" in u["error"] for u in result["llm_usage"])
+    assert summarize_usage(result["llm_usage"])["Defense"]["calls"] == 3
+    assert render_usage_markdown(result["llm_usage"])
+
+
+def test_usage_summary_and_markdown():
+    """Records aggregate per persona and render as a report section."""
+    records = [
+        {"persona": "Prosecutor", "prompt_tokens": 10, "completion_tokens": 5, "latency_s": 1.0, "cost_usd": 0.01},
+        {"persona": "Prosecutor", "prompt_tokens": 20, "completion_tokens": 5, "latency_s": 3.0, "cost_usd": 0.02, "retries": 1},
+    ]
+    summary = summarize_usage(records)
+    assert summary["Prosecutor"]["calls"] == 2
+    assert summary["Prosecutor"]["max_latency_s"] == 3.0
+    lines = render_usage_markdown(records)
+    assert lines[0].strip() == "## LLM Usage"
+    assert any(line.startswith("| Prosecutor | 2 | 30 | 10 |") for line in lines)
+
+
+def test_graph_exports_usage_jsonl_and_report_section(git_repo, tmp_path, monkeypatch):
+    """An offline audit writes one JSONL record per call and a usage section."""
+    monkeypatch.chdir(tmp_path)
+    state = {"repo_url": str(git_repo), "pdf_path": "missing.pdf", "rubric_dimensions": RUBRIC,
+             "evidences": {}, "opinions": [], "final_report": None}
+    set_transport(FakeTransport())
+    try:
+        asyncio.run(build_graph().ainvoke(state))
+    finally:
+        set_transport(None)
+
+    records = [json.loads(line) for line in (tmp_path / "reports" / "llm_metrics.jsonl").read_text().splitlines()]
+    assert sorted(r["persona"] for r in records) == ["Defense", "Prosecutor", "TechLead"]
+    assert all(r["repo_url"] == str(git_repo) for r in records)
+    assert "## LLM Usage" in (tmp_path / "reports" / "audit_report_latest.md").read_text()
@@ -0,0 +1,61 @@
+import asyncio
+import json
+import subprocess
+import sys
+from src.graph import build_graph
+from src.llm.transport import FakeTransport, set_transport
+from src.profiling import chrome_trace, export_chrome_trace, render_summary, span, spans, summarize_spans
+
+
+def test_spans_are_not_recorded_by_default():
+    """Without AUDITOR_PROFILE_TRACE_PATH the layer records nothing."""
+    with span("idle"):
+        pass
+    assert spans() == []
+
+
+def test_span_records_time_subprocess_and_memory_peaks(monkeypatch, tmp_path):
+    """Nested spans each keep their own memory high-water mark; child process CPU is attributed."""
+    monkeypatch.setenv("AUDITOR_PROFILE_TRACE_PATH", str(tmp_path / "trace.json"))
+    with span("outer"):
+        with span("inner"):
+            block = bytearray(4_000_000)
+            del block
+        subprocess.run([sys.executable, "-c", "sum(range(3_000_000))"], check=True)
+
+    inner, outer = spans()
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert inner["mem_peak_bytes"] >= 3_900_000
+    assert outer["mem_peak_bytes"] >= inner["mem_peak_bytes"]
+    assert outer["subprocess_s"] > 0 and inner["subprocess_s"] == 0
+    assert outer["wall_s"] >= inner["wall_s"]
+
+    events = chrome_trace()["traceEvents"]
+    assert [e["name"] for e in events] == ["outer", "inner"]
+    assert all(e["ph"] == "X" and e["dur"] > 0 for e in events)
+    assert events[1]["args"]["mem_peak_kb"] >= 3900
+
+
+def test_audit_profile_covers_nodes_protocols_and_tools(git_repo, tmp_path, monkeypatch):
+    """A profiled audit yields node, protocol and tool spans in a loadable Chrome trace."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    monkeypatch.setenv("AUDITOR_PROFILE_TRACE_PATH", str(tmp_path / "profile" / "trace.json"))
+    state = {"repo_url": str(git_repo), "pdf_path": "missing.pdf", "rubric_dimensions": [{"id": "git_forensic_analysis", "name": "Git"}],
+             "evidences": {}, "opinions": [], "final_report": None}
+    set_transport(FakeTransport(seed=1))
+    try:
+        asyncio.run(build_graph().ainvoke(state))
+    finally:
+        set_transport(None)
+
+    names = {row["name"]: row for row in summarize_spans()}
+    for expected in ("repo_investigator", "doc_analyst", "prosecutor", "chief_justice", "protocol.git_history",
+                     "clone_repo", "extract_git_history"):
+        assert expected in names, expected
+    assert names["clone_repo"]["cat"] == "tool" and names["clone_repo"]["subprocess_s"] > 0
+
+    with open(export_chrome_trace(), encoding="utf-8") as f:
+        trace = json.load(f)
+    assert len(trace["traceEvents"]) == len(spans())
+    assert "repo_investigator" in render_summary()
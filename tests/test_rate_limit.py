@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from src.deadline import DeadlineExceeded
+from src.llm.rate_limit import TokenBucket, RateLimiter, is_retryable, call_with_backoff, acall_with_backoff
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+def test_token_bucket_queues_when_empty():
+    """Reservations beyond capacity are told to wait in arrival order."""
+    bucket = TokenBucket(capacity=2, refill_per_second=1.0)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    first_wait = bucket.reserve()
+    second_wait = bucket.reserve()
+    assert 0.9 < first_wait <= 1.0
+    assert second_wait > first_wait
+
+
+def test_rate_limiter_metrics_track_queue_wait():
+    """Queue-wait metrics count calls that had to wait."""
+    limiter = RateLimiter(rpm=60, tpm=1_000_000)
+    limiter.requests = TokenBucket(capacity=1, refill_per_second=1000.0)
+    limiter.acquire(10)
+    limiter.acquire(10)
+    metrics = limiter.metrics()
+    assert metrics["requests"] == 2
+    assert metrics["queued"] == 1
+    assert metrics["max_wait_s"] > 0
+
+
+class ProviderError(Exception):
+    """Shaped like google.genai's APIError: HTTP code plus gRPC status name."""
+
+    def __init__(self, code, status):
+        super().__init__(f"{code} {status}")
+        self.code, self.status = code, status
+
+
+def test_is_retryable_classification():
+    """429 and 5xx are retryable by status code; message text is ignored."""
+    assert is_retryable(QuotaError("slow down"))
+    assert is_retryable(ProviderError(503, "UNAVAILABLE"))
+    assert is_retryable(ProviderError(None, "RESOURCE_EXHAUSTED"))
+    try:
+        raise RuntimeError("Error calling model") from ProviderError(500, "INTERNAL")
+    except RuntimeError as wrapped:
+        assert is_retryable(wrapped)
+    assert not is_retryable(ProviderError(400, "INVALID_ARGUMENT"))
+    assert not is_retryable(ValueError("field required"))
+    assert not is_retryable(ValueError("input_value=429 invalid"))
+    assert not is_retryable(RuntimeError("503 UNAVAILABLE"))
+
+
+def test_try_acquire_refunds_the_request_slot_when_tokens_are_short():
+    """A hedge refused by the token bucket does not keep its request slot."""
+    limiter = RateLimiter(rpm=60, tpm=600)
+    assert limiter.tokens.try_reserve(600)
+    assert not limiter.try_acquire(tokens=100)
+    assert limiter.requests.try_reserve(60)
+
+
+def test_acquire_refunds_a_reservation_that_outlives_max_wait():
+    """A queue wait past `max_wait` raises at once and does not push back later callers."""
+    limiter = RateLimiter(rpm=60, tpm=1_000_000)
+    limiter.requests = TokenBucket(capacity=1, refill_per_second=0.01)
+    limiter.acquire(10)
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire(10, max_wait=0.5)
+    assert limiter.requests.reserve() < 101
+    assert limiter.metrics()["requests"] == 1
+
+
+@patch("src.llm.rate_limit.backoff_delay", return_value=0.0)
+def test_call_with_backoff_retries_transient_errors(mock_delay):
+    """Transient errors are retried; the eventual result is returned."""
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise QuotaError("quota")
+        return "ok"
+
+    limiter = RateLimiter(rpm=6000, tpm=10_000_000)
+    assert call_with_backoff(flaky, tokens=1, limiter=limiter) == "ok"
+    assert len(calls) == 3
+    assert limiter.metrics()["requests"] == 3
+
+
+def test_acall_with_backoff_does_not_retry_validation_errors():
+    """Non-transient errors surface immediately."""
+    calls = []
+
+    async def broken():
+        calls.append(1)
+        raise ValueError("bad schema")
+
+    with pytest.raises(ValueError):
+        asyncio.run(acall_with_backoff(broken, limiter=RateLimiter(rpm=6000, tpm=10_000_000)))
+    assert len(calls) == 1
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+from src.llm.transport import FakeTransport, set_transport
+from src.resources import resource_slot
+from src.runner import ManifestEntry, load_manifest, run_batch, summarize_batch
+from src.state import AuditReport
+from tests.conftest import make_git_repo
+
+
+def test_load_manifest_csv_and_jsonl(tmp_path):
+    """Both manifest formats yield entries; blank optional columns take defaults."""
+    csv_path = tmp_path / "m.csv"
+    csv_path.write_text("repo_url,pdf_path,rubric\nhttps://github.com/a/b,reports/a.pdf,\n")
+    jsonl_path = tmp_path / "m.jsonl"
+    jsonl_path.write_text('{"repo_url": "https://github.com/c/d", "rubric": "custom.json"}\n\n')
+    assert load_manifest(str(csv_path)) == [ManifestEntry(repo_url="https://github.com/a/b", pdf_path="reports/a.pdf")]
+    assert load_manifest(str(jsonl_path)) == [ManifestEntry(repo_url="https://github.com/c/d", rubric="custom.json")]
+
+
+class _StubApp:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def ainvoke(self, state):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if "broken" in state["repo_url"]:
+            raise RuntimeError("clone exploded")
+        report = AuditReport(repo_url=state["repo_url"], executive_summary="", overall_score=70.0, criteria=[], remediation_plan="")
+        return {"final_report": report}
+
+
+def test_run_batch_bounds_in_flight_audits_and_isolates_failures():
+    """A failing audit is recorded without stopping the rest; in-flight audits stay within the cap."""
+    entries = [ManifestEntry(repo_url=f"https://github.com/u/r{i}") for i in range(7)]
+    entries.append(ManifestEntry(repo_url="https://github.com/u/broken"))
+    app = _StubApp()
+    progress = []
+    outcomes = asyncio.run(run_batch(entries, app=app, max_audits=3, on_progress=lambda d, t, o: progress.append((d, t))))
+
+    assert app.peak == 3
+    assert [o.status for o in outcomes] == ["ok"] * 7 + ["error"]
+    assert outcomes[-1].error == "RuntimeError: clone exploded"
+    assert progress[-1] == (8, 8)
+    summary = summarize_batch(outcomes, wall_s=2.0)
+    assert (summary["ok"], summary["failed"], summary["audits_per_min"]) == (7, 1, 240.0)
+
+
+def test_resource_slot_caps_concurrent_clones(monkeypatch):
+    """Clone slots are shared across threads and honour AUDITOR_BATCH_CLONE_CONCURRENCY."""
+    monkeypatch.setenv("AUDITOR_BATCH_CLONE_CONCURRENCY", "2")
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def clone():
+        with resource_slot("clone"):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=clone) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+
+
+def test_run_batch_offline_end_to_end(tmp_path, monkeypatch):
+    """Several real graph runs share one loop; an unreachable repo still yields a report."""
+    monkeypatch.chdir(tmp_path)
+    repos = [make_git_repo(tmp_path / f"sub{i}", ("feat: a", "feat: b")) for i in range(2)]
+    rubric = tmp_path / "rubric.json"
+    rubric.write_text('{"dimensions": [{"id": "git_forensic_analysis", "name": "Git"}]}')
+    entries = [ManifestEntry(repo_url=str(r), rubric=str(rubric)) for r in repos]
+    entries.append(ManifestEntry(repo_url=str(tmp_path / "missing"), rubric=str(rubric)))
+
+    set_transport(FakeTransport(seed=3))
+    try:
+        outcomes = asyncio.run(run_batch(entries, max_audits=2))
+    finally:
+        set_transport(None)
+    assert [o.status for o in outcomes] == ["ok", "ok", "ok"]
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import tempfile
+from src.llm.transport import FakeTransport, set_transport
+from src.service import AuditService
+from src.state import AuditReport
+
+RUBRIC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rubric", "week2_rubric.json")
+
+
+class _StubApp:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def astream(self, state, stream_mode):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        yield {"start": {}}
+        self.active -= 1
+        report = AuditReport(repo_url=state["repo_url"], executive_summary="", overall_score=50.0, criteria=[], remediation_plan="")
+        yield {"chief_justice": {"final_report": report}}
+
+
+def _collect():
+    events = []
+
+    async def emit(event):
+        events.append(event)
+    return events, emit
+
+
+def test_service_caps_concurrency_and_drains():
+    """Audits beyond the cap wait for a slot; after drain new requests are rejected."""
+    app = _StubApp()
+    events, emit = _collect()
+
+    async def run():
+        service = AuditService(app=app, max_audits=2)
+        for i in range(5):
+            service.submit({"id": f"r{i}", "repo_url": f"https://github.com/u/r{i}"}, emit)
+        await service.drain()
+        service.submit({"id": "late", "repo_url": "https://github.com/u/late"}, emit)
+        await asyncio.sleep(0)
+        return service
+
+    service = asyncio.run(run())
+
+    assert app.peak == 2
+    assert service.completed == 5
+    results = [e for e in events if e["event"] == "result"]
+    assert sorted(e["id"] for e in results) == [f"r{i}" for i in range(5)]
+    assert results[0]["report"]["overall_score"] == 50.0
+    assert events[-1] == {"id": "late", "event": "rejected", "error": "service is draining"}
+
+
+def test_service_streams_progress_and_report(git_repo, tmp_path, monkeypatch):
+    """A real audit streams one progress event per node, then the report JSON."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AUDITOR_DETECTIVE_MEMO_DIR", "")
+    sandboxes = tmp_path / "sandboxes"
+    sandboxes.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(sandboxes))
+    events, emit = _collect()
+    set_transport(FakeTransport(seed=3))
+
+    async def run():
+        service = AuditService()
+        service.warm_up()
+        service.submit({"id": "a", "repo_url": str(git_repo), "rubric": RUBRIC}, emit)
+        service.submit({"id": "bad"}, emit)
+        service.submit({"id": "no-rubric", "repo_url": str(git_repo), "rubric": str(tmp_path / "missing.json")}, emit)
+        await service.drain()
+        return service
+
+    try:
+        service = asyncio.run(run())
+    finally:
+        set_transport(None)
+
+    nodes = [e["node"] for e in events if e["event"] == "progress"]
+    assert nodes[0] == "start" and nodes[-1] == "chief_justice"
+    result = next(e for e in events if e["event"] == "result")
+    assert result["id"] == "a" and len(result["report"]["criteria"]) == 10
+    assert any(e["id"] == "bad" and e["event"] == "error" for e in events)
+    assert any(e["id"] == "no-rubric" and e["event"] == "error" and "missing.json" in e["error"] for e in events)
+    assert (service.completed, service.failed) == (1, 1)
+    # The clone sandbox is removed once the RepoInvestigator is done with it
+    assert not list(sandboxes.iterdir())
@@ -0,0 +1,83 @@
+import time
+from src.state import Evidence, JudicialOpinion
+from src.nodes.justice import synthesize_report
+from src.store import AuditStore, close_stores
+import query_audits
+import resynthesize
+
+RUBRIC = [{"id": "state_management_rigor", "name": "State Management Rigor"}, {"id": "git_forensic_analysis", "name": "Git Forensic Analysis"}]
+EVIDENCES = {"git_history": [Evidence(goal="g", found=True, content="3 commits", location="git:log", rationale="r", confidence=1.0)]}
+
+
+def _report(repo, state_score):
+    opinions = [
+        JudicialOpinion(criterion_id="state_management_rigor", judge="TechLead", score=state_score, argument="state", cited_evidence=["src/state.py"]),
+        JudicialOpinion(criterion_id="git_forensic_analysis", judge="Defense", score=85, argument="git", sample_scores=[80, 85, 90]),
+    ]
+    return synthesize_report(repo, RUBRIC, opinions)
+
+
+def _populated_store(path):
+    store = AuditStore(str(path))
+    now = time.time()
+    store.save_audit("old", _report("https://github.com/a/one", 40), EVIDENCES, commit_sha="aaa111", created_at=now - 30 * 86400)
+    store.save_audit("fail", _report("https://github.com/a/two", 50), EVIDENCES, commit_sha="bbb222", created_at=now - 86400)
+    store.save_audit("pass", _report("https://github.com/a/three", 95), EVIDENCES, commit_sha="ccc333", created_at=now - 3600)
+    return store
+
+
+def test_query_failing_criterion_in_time_window(tmp_path):
+    """Indexed filters answer 'who failed state_management_rigor last week' without reading reports."""
+    store = _populated_store(tmp_path / "audits.db")
+    rows = store.query_criteria("state_management_rigor", max_score=79, since=time.time() - 7 * 86400)
+    assert [r["audit_id"] for r in rows] == ["fail"]
+    assert [a["audit_id"] for a in store.list_audits(commit_sha="ccc")] == ["pass"]
+    assert [a["audit_id"] for a in store.list_audits()] == ["pass", "fail", "old"]
+
+
+def test_report_round_trip_and_resave(tmp_path):
+    """Stored reports rebuild exactly; re-saving an audit id replaces it."""
+    store = _populated_store(tmp_path / "audits.db")
+    report = _report("https://github.com/a/two", 50)
+    assert store.load_report("fail") == report
+    degraded = _report("https://github.com/a/four", 50)
+    degraded.degraded_stages = ["judges"]
+    store.save_audit("degraded", degraded)
+    assert store.load_report("degraded").degraded_stages == ["judges"]
+    assert store.load_evidences("fail") == EVIDENCES
+    store.save_audit("fail", _report("https://github.com/a/two", 90))
+    assert store.load_report("fail").criteria[0].final_score == 90
+    assert len(store.query_criteria(repo_url="https://github.com/a/two")) == 2
+    assert store.load_report("missing") is None
+
+
+def test_cli_failing_and_render(tmp_path, capsys):
+    """The CLI applies the rubric pass mark and renders Markdown from the store on demand."""
+    db = tmp_path / "audits.db"
+    _populated_store(db).close()
+    rows = query_audits.main(["--db", str(db), "criteria", "--criterion", "state_management_rigor", "--failing", "--since", "7d"])
+    assert [r["audit_id"] for r in rows] == ["fail"]
+    md_content = query_audits.main(["--db", str(db), "render", "pass"])
+    assert "**Repository URL:** https://github.com/a/three" in md_content
+    assert "median of [80, 85, 90]" in md_content
+
+
+def test_resynthesize_reads_the_store(tmp_path, capsys):
+    """Without --archive, past audits are re-scored straight from the store."""
+    db = tmp_path / "audits.db"
+    _populated_store(db).close()
+    record = AuditStore(str(db)).load_record("fail")
+    assert [d["id"] for d in record["rubric"]] == ["state_management_rigor", "git_forensic_analysis"]
+    assert record["evidences"] == EVIDENCES
+    degraded = _report("https://github.com/a/four", 60)
+    degraded.degraded_stages = ["judge.Prosecutor"]
+    AuditStore(str(db)).save_audit("degraded", degraded, created_at=time.time())
+    out = tmp_path / "resynthesized"
+    try:
+        assert resynthesize.main(["--store", str(db), "--no-markdown"]) == 4
+        resynthesize.main(["--store", str(db), "--out", str(out)])
+    finally:
+        close_stores()
+    assert "Re-synthesized 4 audits" in capsys.readouterr().out
+    assert "`judge.Prosecutor`" in (out / "audit_degraded.md").read_text()
+    assert "Degraded" not in (out / "audit_pass.md").read_text()
@@ -0,0 +1,69 @@
+import asyncio
+from unittest.mock import MagicMock
+from langchain_core.messages import AIMessage
+from src.llm.clients import LLMCall
+from src.llm.transport import RecordingTransport, ReplayTransport, FakeTransport, CassetteMissError, parse_latency, set_transport
+from src.nodes.judges import OpinionsResponse
+from src.graph import build_graph
+import pytest
+
+
+class StubCall(LLMCall):
+    """LLMCall whose runnable is a stub instead of a pooled Gemini client."""
+
+    def __init__(self, runnable, **kwargs):
+        super().__init__("vision", **kwargs)
+        self._runnable = runnable
+
+    def runnable(self, timeout=None):
+        return self._runnable
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    """A recorded response is replayed without touching the live runnable."""
+    live = MagicMock()
+    live.invoke.return_value = AIMessage(content="linear flow")
+    messages = [("human", "describe the diagram")]
+
+    recorded = RecordingTransport(str(tmp_path)).invoke(StubCall(live), messages)
+    replayed = ReplayTransport(str(tmp_path), parse_latency("fixed:0")).invoke(StubCall(MagicMock()), messages)
+
+    assert replayed.content == recorded.content == "linear flow"
+    with pytest.raises(CassetteMissError):
+        ReplayTransport(str(tmp_path)).invoke(StubCall(MagicMock()), [("human", "other")])
+
+
+def test_fake_transport_emits_schema_valid_opinions():
+    """The synthetic model answers every requested criterion for the persona."""
+    call = LLMCall("judge", schema=OpinionsResponse, include_raw=True,
+                   tags={"persona": "Prosecutor", "criteria": ["a", "b"]})
+    result = asyncio.run(FakeTransport(seed=7).ainvoke(call, []))
+
+    parsed = result["parsed"]
+    assert isinstance(parsed, OpinionsResponse)
+    assert [o.criterion_id for o in parsed.opinions] == ["a", "b"]
+    assert all(o.judge == "Prosecutor" and 1 <= o.score <= 100 for o in parsed.opinions)
+
+
+def test_build_graph_runs_offline_with_fake_transport(git_repo, tmp_path, monkeypatch):
+    """The full pipeline completes against a local repo without network access."""
+    monkeypatch.chdir(tmp_path)
+
+    state = {
+        "repo_url": str(git_repo),
+        "pdf_path": "missing.pdf",
+        "rubric_dimensions": [{"id": "git_forensic_analysis", "name": "Git"}, {"id": "swarm_visual", "name": "Visual"}],
+        "evidences": {},
+        "opinions": [],
+        "final_report": None,
+    }
+    set_transport(FakeTransport(seed=1))
+    try:
+        result = asyncio.run(build_graph().ainvoke(state))
+    finally:
+        set_transport(None)
+
+    assert len(result["opinions"]) == 6
+    assert len(result["final_report"].criteria) == 2
+    assert "git_history" in result["evidences"]
+    assert len(result["commit_sha"]) == 40